@@ -0,0 +1,200 @@
+"""
+Backfill / replay : re-classement des jours passés avec les règles actuelles
+
+Pour chaque jour d'une plage (et chaque chaîne), les paires candidates sont relues
+depuis les sources locales (SOURCES, dans l'ordre : la 1re qui a des données pour
+ce jour gagne) :
+- "raw" : réponses DexScreener brutes de l'archive du jour (raw_archive), normalisées
+  par normalize.pair_record comme dans main ; les champs Birdeye des gagnants sont
+  re-dérivés des réponses Birdeye archivées (aucun appel réseau) et
+  earlyReturnMultiple est recalculé par l'index des prix first-seen, comme dans main ;
+- "csv" : lignes des CSV de data/ et archive/** (champs Birdeye conservés). Ces CSV ne
+  contiennent que les gagnants du run d'origine : le re-classement n'est fidèle que si
+  la nouvelle règle garde toutes les lignes nécessaires (K plus petit, plancher qui
+  n'écarte aucune d'elles). Sinon le jour est refusé (DayResult.error, code de sortie
+  1) plutôt que d'écrire un top10 dégradé ; seule l'archive brute permet d'assouplir
+  la règle. Le plancher d'origine n'étant pas conservé, un jour « mince » (moins de
+  TOP_K lignes) re-classé avec un plancher plus bas ne peut pas être détecté.
+Puis même code que collector.main : rank_records (mêmes règles que rank_top10,
+plancher de liquidité et K réglables), enrichissement Birdeye réseau optionnel
+(--enrich), et sortie CSV atomique (csv_sink) au nom habituel top10_[<chain>_]<date>.csv.
+
+Les jours sont répartis sur un pool de process ; la sortie est déterministe, donc
+relancer un backfill réécrit des fichiers identiques (idempotent).
+
+Usage :
+    python backfill.py --start 2025-09-01 --end 2025-09-30 [--chains solana,base]
+                       [--min-liquidity 20000] [--k 10] [--enrich] [--out-dir backfill]
+                       [--workers N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import datetime
+import glob
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+import collector
+import raw_archive
+from csv_sink import CsvSink
+from normalize import pair_record
+from records import PairRecord
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUT_DIR = "backfill"
+
+
+class DayResult(NamedTuple):
+    date: str
+    chain: str
+    source: Optional[str]
+    candidates: int
+    ranked: int
+    output: Optional[str]
+    error: Optional[str] = None
+
+
+def _csv_candidates(date_str: str, chain: str) -> Optional[List[PairRecord]]:
+    """Lignes du CSV quotidien archivé (data/ en priorité, sinon archive/**)."""
+    name = os.path.basename(collector.output_path(chain, date_str))
+    paths = [os.path.join("data", name)] + sorted(glob.glob(os.path.join("archive", "**", name), recursive=True))
+    for path in paths:
+        if os.path.exists(path):
+            with open(path, newline="", encoding="utf-8") as f:
+                return [PairRecord.from_mapping(row) for row in csv.DictReader(f)]
+    return None
+
+
+def _raw_candidates(date_str: str, chain: str) -> Optional[List[PairRecord]]:
+    """Paires DexScreener archivées du jour ; une paire vue par plusieurs runs → dernière version."""
+    pairs: Dict[str, Any] = {}
+    for rec in raw_archive.iter_day(date_str, raw_archive.archive_dir(), source="dexscreener",
+                                    kind="pair", chain=chain):
+        data = rec.get("data") or {}
+        pairs[data.get("pairAddress") or str(len(pairs))] = data
+    return [pair_record(p, chain) for p in pairs.values()] or None
+
+
+def _enrich_from_archive(ranked: List[PairRecord], date_str: str, chain: str) -> None:
+    """Champs Birdeye depuis les réponses token_holders / token_security archivées ce jour-là."""
+    import utils  # lazy import (requests)
+    directory = raw_archive.archive_dir()
+    index = raw_archive.read_index(date_str, directory)
+    for rec in ranked:
+        found = {r["kind"]: r["data"] for r in raw_archive.lookup(date_str, rec.tokenAddress, directory, index=index)
+                 if r.get("source") == "birdeye" and r.get("chain") == chain}
+        if found:
+            rec.apply_enrichment(utils.enrichment_from(found.get("token_holders"), found.get("token_security")))
+
+
+# (nom, loader) : loader(date, chain) → paires candidates, ou None si rien pour ce jour
+SOURCES: List[tuple] = [("raw", _raw_candidates), ("csv", _csv_candidates)]
+
+
+def load_candidates(date_str: str, chain: str) -> tuple:
+    for name, loader in SOURCES:
+        pairs = loader(date_str, chain)
+        if pairs:
+            return name, pairs
+    return None, []
+
+
+def replay_day(date_str: str, chain: str = collector.DEFAULT_CHAIN, *, k: int = collector.TOP_K,
+               min_liquidity: float = collector.MIN_LIQUIDITY_USD, enrich: bool = False,
+               out_dir: str = DEFAULT_OUT_DIR) -> DayResult:
+    """Un jour, une chaîne : candidats → rank_records → (enrichissement) → CSV."""
+    source, pairs = load_candidates(date_str, chain)
+    if source is None:
+        return DayResult(date_str, chain, None, 0, 0, None)
+    ranked = collector.rank_records(pairs, k=k, min_liquidity=min_liquidity)
+    if source == "csv":
+        error = _csv_replay_error(len(pairs), len(ranked), k)
+        if error:
+            logger.error("backfill refused date=%s chain=%s: %s", date_str, chain, error)
+            return DayResult(date_str, chain, source, len(pairs), len(ranked), None, error)
+    if source == "raw":
+        collector._fill_early_returns(ranked, date_str)
+        if not enrich:
+            _enrich_from_archive(ranked, date_str, chain)
+    if enrich:
+        for rec, data in zip(ranked, collector.enrich_rows(ranked, collector.BIRDEYE_KEY,
+                                                           **collector._chain_kw(chain))):
+            rec.apply_enrichment(data)
+    out = os.path.join(out_dir, os.path.basename(collector.output_path(chain, date_str)))
+    for rec in ranked:
+        rec.date = date_str
+    with CsvSink(out, collector.HEADERS) as sink:
+        sink.write_all(ranked)
+    return DayResult(date_str, chain, source, len(pairs), len(ranked), out)
+
+
+def _csv_replay_error(candidates: int, ranked: int, k: int) -> Optional[str]:
+    """Raison du refus d'un re-classement depuis un CSV de gagnants, ou None s'il est fidèle."""
+    if ranked < min(k, candidates):
+        return (f"rule drops {min(k, candidates) - ranked} of the {candidates} archived winners; "
+                "the real runners-up are not in the CSV (raw archive needed)")
+    if k > candidates and candidates >= collector.TOP_K:
+        return f"k={k} exceeds the {candidates} archived winners (raw archive needed)"
+    return None
+
+
+def _replay(args: tuple) -> DayResult:
+    date_str, chain, kwargs = args
+    return replay_day(date_str, chain, **kwargs)
+
+
+def date_range(start: str, end: str) -> Iterator[str]:
+    day = datetime.date.fromisoformat(start)
+    last = datetime.date.fromisoformat(end)
+    while day <= last:
+        yield day.isoformat()
+        day += datetime.timedelta(days=1)
+
+
+def backfill(start: str, end: str, chains: Sequence[str] = (collector.DEFAULT_CHAIN,), *,
+             workers: Optional[int] = None, **kwargs) -> List[DayResult]:
+    """Rejoue [start, end] × chains ; jours répartis sur `workers` process."""
+    jobs = [(day, chain, kwargs) for day in date_range(start, end) for chain in chains]
+    if workers == 1 or len(jobs) <= 1:
+        return [_replay(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_replay, jobs, chunksize=max(1, len(jobs) // (4 * (workers or os.cpu_count() or 1)))))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Backfill / replay des top10 passés")
+    ap.add_argument("--start", required=True, help="YYYY-MM-DD")
+    ap.add_argument("--end", required=True, help="YYYY-MM-DD (inclus)")
+    ap.add_argument("--chains", default=",".join(collector.CHAINS))
+    ap.add_argument("--k", type=int, default=collector.TOP_K)
+    ap.add_argument("--min-liquidity", type=float, default=collector.MIN_LIQUIDITY_USD)
+    ap.add_argument("--enrich", action="store_true", help="ré-interroger Birdeye pour les gagnants")
+    ap.add_argument("--out-dir", default=DEFAULT_OUT_DIR)
+    ap.add_argument("--workers", type=int, default=None)
+    args = ap.parse_args(argv)
+
+    chains = [c.strip().lower() for c in args.chains.split(",") if c.strip()]
+    results = backfill(args.start, args.end, chains, workers=args.workers, k=args.k,
+                       min_liquidity=args.min_liquidity, enrich=args.enrich, out_dir=args.out_dir)
+    written = [r for r in results if r.output]
+    refused = [r for r in results if r.error]
+    for r in results:
+        if r.output is None and r.error is None:
+            logger.info("backfill no data date=%s chain=%s", r.date, r.chain)
+    for r in refused:
+        print(f"refused {r.date} {r.chain}: {r.error}")
+    print(f"backfill days={len(results)} written={len(written)} refused={len(refused)} "
+          f"missing={len(results) - len(written) - len(refused)} out={args.out_dir}")
+    return 1 if refused else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""
+Benchmark de bout en bout contre un serveur local (standin.py) à la place de DexScreener/Birdeye
+
+Mesure collector.main() complet puis chaque étape isolément (fetch, normalise,
+rank, enrich, write), médiane et min sur --repeat runs, et écrit un JSON
+(commit, réglages, compteurs de requêtes, durées) pour suivre les régressions
+d'un commit à l'autre. Caches disque (réponses Birdeye, index de prix) coupés
+par défaut : chaque run est « à froid ».
+
+    python benchmarks/bench_e2e.py [--pairs 300] [--latency-ms 40] [--rate-429 0.05]
+                                   [--tail-rate 0.05 --tail-ms 3000]
+                                   [--repeat 3] [--limits] [--backend birdeye|helius]
+                                   [--out results.json]
+                                   [--compare benchmarks/results/e2e-<commit>.json]
+
+--limits applique les débits réels (rate_limit.RATE_LIMITS) au serveur local :
+DexScreener est servi via 127.0.0.1, Birdeye via localhost (un seau par hôte).
+--backend helius : enrichissement groupé via le JSON-RPC du serveur local.
+"""
+
+import argparse
+import json
+import logging
+import os
+import pathlib
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from standin import StandIn  # noqa: E402
+
+STAGES = ("fetch", "normalise", "rank", "enrich", "write")
+
+
+def _commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+        return out.stdout.strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+
+def _configure(server: StandIn, limits: bool, backend: str = "birdeye") -> None:
+    # avant l'import du collector : les URL de base sont lues à l'import
+    port = server.httpd.server_address[1]
+    os.environ["DEXSCREENER_BASE_URL"] = f"http://127.0.0.1:{port}"
+    os.environ["BIRDEYE_BASE_URL"] = f"http://localhost:{port}"
+    os.environ.setdefault("BIRDEYE_API_KEY", "bench")
+    os.environ["RESPONSE_CACHE"] = "0"
+    os.environ["PRICE_INDEX"] = "0"
+    os.environ["RAW_ARCHIVE"] = "0"
+    os.environ["ENRICH_BACKEND"] = backend
+    if backend == "helius":
+        os.environ["HELIUS_RPC_URL"] = f"http://127.0.0.1:{port}"
+        os.environ.setdefault("HELIUS_API_KEY", "bench")
+    if limits:
+        import rate_limit
+        rate_limit.RATE_LIMITS["127.0.0.1"] = rate_limit.RATE_LIMITS["api.dexscreener.com"]
+        rate_limit.RATE_LIMITS["localhost"] = rate_limit.RATE_LIMITS["public-api.birdeye.so"]
+
+
+def run_stages(collector, dexscreener_client, pair_record, out_dir: str) -> dict:
+    t = {}
+    t0 = time.perf_counter()
+    raw = dexscreener_client.discover_pairs_solana(api_key=collector.DEX_KEY or None)
+    t["fetch"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    pairs = [pair_record(p) for p in raw[:collector.MAX_NEW_PAIRS]]
+    t["normalise"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    ranked = collector.rank_records(pairs)
+    t["rank"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for rec, enrich in zip(ranked, collector.enrich_rows(ranked, collector.BIRDEYE_KEY)):
+        rec.apply_enrichment(enrich)
+    t["enrich"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    collector._write_csv(ranked, os.path.join(out_dir, "top10_stages.csv"))
+    t["write"] = time.perf_counter() - t0
+    return {"timings": t, "pairs": len(pairs), "ranked": len(ranked)}
+
+
+def _summary(samples: list) -> dict:
+    return {"median_s": round(statistics.median(samples), 6), "min_s": round(min(samples), 6)}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--pairs", type=int, default=300, help="paires par réponse /latest/dex/search")
+    ap.add_argument("--payload", help="payload /latest/dex/search enregistré (JSON)")
+    ap.add_argument("--latency-ms", type=float, default=40.0)
+    ap.add_argument("--rate-429", type=float, default=0.0)
+    ap.add_argument("--retry-after", type=float, default=0.05)
+    ap.add_argument("--tail-rate", type=float, default=0.0, help="fraction de réponses lentes")
+    ap.add_argument("--tail-ms", type=float, default=0.0, help="retard des réponses lentes")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--limits", action="store_true", help="appliquer les débits réels par hôte")
+    ap.add_argument("--backend", choices=("birdeye", "helius"), default="birdeye", help="backend d'enrichissement")
+    ap.add_argument("--out", help="fichier JSON (défaut : benchmarks/results/e2e-<commit>.json)")
+    ap.add_argument("--compare", help="JSON d'un run précédent à comparer")
+    args = ap.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    payload = json.loads(pathlib.Path(args.payload).read_bytes()) if args.payload else None
+    server = StandIn(pairs=args.pairs, latency_ms=args.latency_ms, rate_429=args.rate_429,
+                     retry_after_s=args.retry_after, payload=payload,
+                     tail_rate=args.tail_rate, tail_ms=args.tail_ms).start()
+    _configure(server, args.limits, args.backend)
+
+    import collector
+    import dexscreener_client
+    import fastjson
+    from normalize import pair_record
+
+    e2e, stages, counts = [], {s: [] for s in STAGES}, {}
+    sizes = {}
+    cwd = os.getcwd()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            for _ in range(args.repeat):
+                before = dict(server.counts)
+                t0 = time.perf_counter()
+                collector.main()
+                e2e.append(time.perf_counter() - t0)
+                counts = {k: v - before.get(k, 0) for k, v in server.counts.items()}
+
+                res = run_stages(collector, dexscreener_client, pair_record, tmp)
+                sizes = {"pairs": res["pairs"], "ranked": res["ranked"]}
+                for name, secs in res["timings"].items():
+                    stages[name].append(secs)
+    finally:
+        os.chdir(cwd)
+        server.stop()
+
+    result = {
+        "commit": _commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "json_backend": fastjson.BACKEND,
+        "config": {k: getattr(args, k) for k in ("pairs", "latency_ms", "rate_429", "retry_after", "tail_rate",
+                                                      "tail_ms", "repeat", "limits", "backend")},
+        "requests_per_run": counts,
+        "sizes": sizes,
+        "end_to_end": _summary(e2e),
+        "stages": {name: _summary(v) for name, v in stages.items()},
+    }
+    out = pathlib.Path(args.out or ROOT / "benchmarks" / "results" / f"e2e-{result['commit']}.json")
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(result, indent=2) + "\n")
+
+    print(f"end-to-end : {result['end_to_end']['median_s'] * 1000:9.1f} ms (médiane, {args.repeat} runs)")
+    for name in STAGES:
+        print(f"  {name:<10}: {result['stages'][name]['median_s'] * 1000:9.1f} ms")
+    print(f"requêtes/run : {counts}")
+
+    if args.compare:
+        base = json.loads(pathlib.Path(args.compare).read_text())
+        rows = [("end-to-end", base["end_to_end"], result["end_to_end"])]
+        rows += [(n, base["stages"].get(n), result["stages"][n]) for n in STAGES]
+        print(f"comparaison avec {base.get('commit')} :")
+        for name, old, new in rows:
+            if old and old["median_s"]:
+                print(f"  {name:<10}: {new['median_s'] / old['median_s']:6.2f}x du temps précédent")
+    print(f"résultats : {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Temps d'import du point d'entrée (python -X importtime), suivi comme un check
+
+Lance `python -X importtime -c "import collector"` dans un process neuf (médiane de
+--repeat runs), affiche les modules les plus coûteux et échoue (exit 1) si un
+module lourd (pandas, numpy, requests…) est chargé au démarrage ou si le temps
+cumulé dépasse --max-ms.
+
+    python benchmarks/bench_import.py [--module collector] [--max-ms 150] [--json out.json]
+"""
+
+import argparse
+import json
+import pathlib
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+# ne doivent pas être importés par `import collector` (chargés à la demande)
+HEAVY_MODULES = ("pandas", "numpy", "requests", "urllib3", "http_client", "utils", "helius_client")
+
+
+def import_profile(module: str) -> List[Tuple[str, int, int]]:
+    """[(module, self µs, cumulé µs)] dans l'ordre de -X importtime."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def loaded_modules(module: str) -> List[str]:
+    code = f"import sys, {module}; print(' '.join(sorted(sys.modules)))"
+    proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return proc.stdout.split()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--module", default="collector")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--top", type=int, default=10)
+    ap.add_argument("--max-ms", type=float, default=None, help="budget du temps d'import cumulé")
+    ap.add_argument("--json", help="écrire le résultat en JSON")
+    args = ap.parse_args()
+
+    runs = [import_profile(args.module) for _ in range(max(1, args.repeat))]
+    totals = [next(c for name, _, c in run if name == args.module) for run in runs]
+    total_ms = statistics.median(totals) / 1000.0
+    last = runs[-1]
+    heaviest = sorted(last, key=lambda r: r[1], reverse=True)[:args.top]
+    loaded = set(loaded_modules(args.module))
+    heavy = [m for m in HEAVY_MODULES if m in loaded]
+
+    print(f"import {args.module} : {total_ms:.1f} ms (médiane, {len(runs)} runs)")
+    for name, self_us, cum_us in heaviest:
+        print(f"  {name:<40} self {self_us / 1000:7.2f} ms   cumulé {cum_us / 1000:7.2f} ms")
+    print(f"modules lourds chargés : {', '.join(heavy) or 'aucun'}")
+
+    if args.json:
+        result: Dict[str, object] = {
+            "module": args.module, "import_ms": round(total_ms, 3), "heavy_modules": heavy,
+            "heaviest": [{"module": n, "self_ms": s / 1000, "cumulative_ms": c / 1000} for n, s, c in heaviest],
+        }
+        pathlib.Path(args.json).write_text(json.dumps(result, indent=2) + "\n")
+
+    failed = bool(heavy) or (args.max_ms is not None and total_ms > args.max_ms)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
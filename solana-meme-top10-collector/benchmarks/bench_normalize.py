@@ -0,0 +1,100 @@
+"""
+Microbenchmark décodage + normalisation d'un payload /latest/dex/search
+
+Ancien chemin : json.loads + normalisation à base de .get() chaînés / try-float
+(copie de l'ancien utils.fetch_new_pairs_dexscreener). Nouveau chemin :
+normalize.records_from_payload (fastjson + une passe).
+
+    python benchmarks/bench_normalize.py [--pairs 20000] [--payload recorded.json]
+"""
+
+import argparse
+import json
+import pathlib
+import sys
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import fastjson  # noqa: E402
+import fixtures  # noqa: E402
+import normalize  # noqa: E402
+
+
+def _safe_float(x):
+    try:
+        return float(x)
+    except Exception:
+        return None
+
+
+def _safe_int(x):
+    try:
+        return int(x)
+    except Exception:
+        return 0
+
+
+def legacy(raw: bytes) -> list:
+    data = json.loads(raw)
+    pairs = (data.get("pairs") or data.get("result") or [])
+    pairs = [p for p in pairs if str(p.get("chainId") or p.get("chain") or "").lower() == "solana"]
+    out = []
+    for p in pairs:
+        base = (p.get("baseToken") or {})
+        txns_h24 = ((p.get("txns") or {}).get("h24") or {})
+        out.append({
+            "chain": p.get("chainId") or "solana",
+            "pairAddress": p.get("pairAddress") or p.get("pairId") or "",
+            "tokenAddress": base.get("address") or "",
+            "baseSymbol": base.get("symbol") or "",
+            "baseToken": base.get("name") or "",
+            "priceUsd": _safe_float(p.get("priceUsd")),
+            "liquidityUsd": _safe_float((p.get("liquidity") or {}).get("usd")),
+            "volume24hUsd": _safe_float((p.get("volume24hUsd") or (p.get("volume") or {}).get("h24"))),
+            "txns24h": _safe_int(txns_h24.get("buys")) + _safe_int(txns_h24.get("sells")),
+            "priceChange24h": _safe_float((p.get("priceChange") or {}).get("h24")),
+            "createdAt": p.get("pairCreatedAt") or p.get("createdAt"),
+        })
+    return out
+
+
+def fast(raw: bytes) -> list:
+    return list(normalize.records_from_payload(raw))
+
+
+def best_of(fn, raw, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(raw)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--pairs", type=int, default=20_000)
+    ap.add_argument("--payload", help="payload /latest/dex/search enregistré (JSON)")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    if args.payload:
+        raw = pathlib.Path(args.payload).read_bytes()
+    else:
+        raw = fixtures.dump(fixtures.search_payload(args.pairs))
+
+    old, new = legacy(raw), fast(raw)
+    assert [r["pairAddress"] for r in old] == [r.pairAddress for r in new]
+
+    t_old = best_of(legacy, raw, args.repeat)
+    t_new = best_of(fast, raw, args.repeat)
+    print(f"payload: {len(raw) / 1e6:.1f} MB, {len(new)} paires solana, backend={fastjson.BACKEND}")
+    print(f"legacy (json + .get chaînés): {t_old * 1000:8.1f} ms")
+    print(f"fast   (fastjson + 1 passe) : {t_new * 1000:8.1f} ms  ({t_old / t_new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Payloads synthétiques au format des réponses DexScreener / Birdeye / Solana RPC
+
+Même forme que les réponses réelles (/latest/dex/search, /defi/token_holders,
+/defi/token_security, comptes mint de getMultipleAccounts, getTokenLargestAccounts),
+générées de façon déterministe (seed) pour les benchmarks.
+Un vrai payload enregistré peut être passé aux scripts via --payload.
+"""
+
+import base64
+import json
+import random
+from typing import Any, Dict, List
+
+CHAINS = ("solana", "solana", "solana", "ethereum", "base", "bsc")
+
+
+def _addr(rng: random.Random, n: int = 44) -> str:
+    alphabet = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+    return "".join(rng.choice(alphabet) for _ in range(n))
+
+
+def search_pair(rng: random.Random) -> Dict[str, Any]:
+    chain = rng.choice(CHAINS)
+    sym = "".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(rng.randint(3, 6)))
+    return {
+        "chainId": chain,
+        "dexId": rng.choice(["raydium", "orca", "meteora", "pumpswap"]),
+        "url": f"https://dexscreener.com/{chain}/{_addr(rng)}",
+        "pairAddress": _addr(rng),
+        "labels": ["v4"],
+        "baseToken": {"address": _addr(rng), "name": f"{sym} coin", "symbol": sym},
+        "quoteToken": {"address": "So11111111111111111111111111111111111111112", "name": "Wrapped SOL", "symbol": "SOL"},
+        "priceNative": f"{rng.random() / 1000:.9f}",
+        "priceUsd": f"{rng.random() / 10:.8f}",
+        "txns": {w: {"buys": rng.randint(0, 5000), "sells": rng.randint(0, 5000)} for w in ("m5", "h1", "h6", "h24")},
+        "volume": {w: round(rng.random() * 10 ** rng.randint(2, 7), 2) for w in ("h24", "h6", "h1", "m5")},
+        "priceChange": {w: round(rng.uniform(-90, 900), 2) for w in ("m5", "h1", "h6", "h24")},
+        "liquidity": {"usd": round(rng.random() * 10 ** rng.randint(2, 6), 2),
+                      "base": rng.randint(1, 10 ** 9), "quote": round(rng.random() * 1000, 4)},
+        "fdv": rng.randint(10 ** 4, 10 ** 9),
+        "marketCap": rng.randint(10 ** 4, 10 ** 9),
+        "pairCreatedAt": rng.randint(1_700_000_000_000, 1_760_000_000_000),
+        "info": {"imageUrl": "https://example.invalid/x.png", "websites": [], "socials": []},
+    }
+
+
+def search_payload(n: int, seed: int = 0) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    return {"schemaVersion": "1.0.0", "pairs": [search_pair(rng) for _ in range(n)]}
+
+
+def token_holders_payload(address: str, seed: int = 0) -> Dict[str, Any]:
+    rng = random.Random(f"{seed}-{address}")
+    return {"success": True, "data": {"address": address, "holders": rng.randint(10, 100_000)}}
+
+
+def token_security_payload(address: str, seed: int = 0) -> Dict[str, Any]:
+    rng = random.Random(f"{seed}-sec-{address}")
+    return {"success": True, "data": {
+        "address": address,
+        "mint_authority_exists": rng.random() < 0.2,
+        "freeze_authority_exists": rng.random() < 0.1,
+        "exit_liquidity": round(rng.random() * 50_000, 2),
+    }}
+
+
+TOKEN_PROGRAM = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+MINT_SUPPLY = 10 ** 15
+
+
+def mint_data(*, mint_authority: bool, freeze_authority: bool, supply: int = MINT_SUPPLY,
+              decimals: int = 6) -> bytes:
+    """Compte mint SPL (82 octets) : COption autorités, supply u64, décimales."""
+    def option(present: bool) -> bytes:
+        return (1 if present else 0).to_bytes(4, "little") + (b"\x07" * 32 if present else bytes(32))
+    return option(mint_authority) + supply.to_bytes(8, "little") + bytes([decimals, 1]) + option(freeze_authority)
+
+
+def mint_account_payload(address: str, seed: int = 0) -> Dict[str, Any]:
+    rng = random.Random(f"{seed}-sec-{address}")
+    data = mint_data(mint_authority=rng.random() < 0.2, freeze_authority=rng.random() < 0.1)
+    return {"data": [base64.b64encode(data).decode(), "base64"], "executable": False,
+            "lamports": 1461600, "owner": TOKEN_PROGRAM, "rentEpoch": 0, "space": len(data)}
+
+
+def largest_accounts_payload(address: str, seed: int = 0) -> Dict[str, Any]:
+    rng = random.Random(f"{seed}-top-{address}")
+    amounts = sorted((rng.randint(1, MINT_SUPPLY // 50) for _ in range(20)), reverse=True)
+    return {"context": {"slot": 1}, "value": [
+        {"address": _addr(rng), "amount": str(a), "decimals": 6, "uiAmount": a / 1e6, "uiAmountString": str(a / 1e6)}
+        for a in amounts]}
+
+
+def dump(payload: Any) -> bytes:
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def pairs_of(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return payload.get("pairs") or []
@@ -0,0 +1,245 @@
+"""
+Serveur HTTP local qui remplace DexScreener, Birdeye et le RPC Helius pour les benchmarks
+
+Rejoue des payloads enregistrés (--payload) ou synthétiques (fixtures.py) sur :
+  /latest/dex/search?q=…            une tranche de paires différente par requête
+  /latest/dex/pairs/solana[/a,b,c]  endpoint de repli et lookup groupé
+  /tokens/v1/solana/a,b,c           lookup groupé par token
+  /defi/token_holders, /defi/token_security?address=…
+  POST JSON-RPC (simple ou batch) : getMultipleAccounts, getTokenLargestAccounts
+
+Réglages : latence par requête, queue de latence (--tail-rate de réponses retardées
+de --tail-ms), taux de 429 injectés (avec Retry-After), taille des payloads
+(paires par recherche). Compte les requêtes servies par route.
+
+    python benchmarks/standin.py --port 8765 --latency-ms 40 --rate-429 0.05
+    DEXSCREENER_BASE_URL=http://127.0.0.1:8765 BIRDEYE_BASE_URL=http://127.0.0.1:8765 python collector.py
+    (Helius : HELIUS_RPC_URL=http://127.0.0.1:8765 ENRICH_BACKEND=helius HELIUS_API_KEY=x)
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import json
+import pathlib
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent))
+
+import fixtures  # noqa: E402
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        # client parti avant la réponse (timeout, échéance, doublon hedgé annulé) : normal ici
+        if isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            return
+        super().handle_error(request, client_address)
+
+
+class StandIn:
+    """Serveur en thread d'arrière-plan ; `url` une fois démarré."""
+
+    def __init__(self, *, pairs: int = 300, latency_ms: float = 0.0, rate_429: float = 0.0,
+                 retry_after_s: float = 0.05, payload: Optional[Dict[str, Any]] = None,
+                 seed: int = 0, host: str = "127.0.0.1", port: int = 0,
+                 tail_rate: float = 0.0, tail_ms: float = 0.0):
+        self.pairs = pairs
+        self.latency_s = latency_ms / 1000.0
+        self.rate_429 = rate_429
+        self.retry_after_s = retry_after_s
+        self.tail_rate = tail_rate
+        self.tail_s = tail_ms / 1000.0
+        self.recorded = payload
+        self.seed = seed
+        self.counts: Dict[str, int] = collections.Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._search: Dict[str, bytes] = {}
+        self._by_pair: Dict[str, Dict[str, Any]] = {}
+        self.httpd = _Server((host, port), _handler(self))
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StandIn":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="standin", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "StandIn":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    # --- payloads -----------------------------------------------------------------
+    def search(self, query: str) -> bytes:
+        with self._lock:
+            raw = self._search.get(query)
+            if raw is None:
+                if self.recorded is not None:
+                    payload = self.recorded
+                else:
+                    payload = fixtures.search_payload(self.pairs, seed=f"{self.seed}-{query}")
+                for pair in fixtures.pairs_of(payload):
+                    self._by_pair.setdefault(pair.get("pairAddress"), pair)
+                raw = self._search[query] = fixtures.dump(payload)
+        return raw
+
+    def pairs(self, addresses: List[str]) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [self._by_pair[a] for a in addresses if a in self._by_pair]
+
+    def tokens(self, addresses: List[str]) -> List[Dict[str, Any]]:
+        wanted = set(addresses)
+        with self._lock:
+            return [p for p in self._by_pair.values() if (p.get("baseToken") or {}).get("address") in wanted]
+
+    def rpc(self, call: Dict[str, Any]) -> Dict[str, Any]:
+        method, params = call.get("method"), call.get("params") or []
+        reply: Dict[str, Any] = {"jsonrpc": "2.0", "id": call.get("id")}
+        if method == "getMultipleAccounts":
+            reply["result"] = {"context": {"slot": 1},
+                               "value": [fixtures.mint_account_payload(a, self.seed) for a in params[0]]}
+        elif method == "getTokenLargestAccounts":
+            reply["result"] = fixtures.largest_accounts_payload(params[0], self.seed)
+        else:
+            reply["error"] = {"code": -32601, "message": "Method not found"}
+        return reply
+
+    def tail_delay(self) -> float:
+        with self._lock:
+            return self.tail_s if self.tail_rate > 0 and self._rng.random() < self.tail_rate else 0.0
+
+    def throttled(self) -> bool:
+        with self._lock:
+            return self.rate_429 > 0 and self._rng.random() < self.rate_429
+
+
+def _handler(server: StandIn):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args: Any) -> None:  # silencieux
+            pass
+
+        def _send(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            parts = urlsplit(self.path)
+            query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+            path = parts.path.rstrip("/")
+            route = _route(path)
+            delay = server.latency_s + server.tail_delay()
+            if delay:
+                time.sleep(delay)
+            with server._lock:
+                server.counts[route] += 1
+            if route != "unknown" and server.throttled():
+                with server._lock:
+                    server.counts["429"] += 1
+                self._send(429, b'{"error":"rate limited"}', {"Retry-After": f"{server.retry_after_s:g}"})
+                return
+
+            if route == "search":
+                body = server.search(query.get("q", ""))
+            elif route == "pairs":
+                # /latest/dex/pairs/solana/a,b,c → lookup ; sinon endpoint de repli
+                ids = path.split("/")[5].split(",") if path.count("/") >= 5 else []
+                body = fixtures.dump({"pairs": server.pairs(ids)}) if ids else server.search(path)
+            elif route == "tokens":
+                body = fixtures.dump(server.tokens(path.rsplit("/", 1)[-1].split(",")))
+            elif route == "token_holders":
+                body = fixtures.dump(fixtures.token_holders_payload(query.get("address", ""), server.seed))
+            elif route == "token_security":
+                body = fixtures.dump(fixtures.token_security_payload(query.get("address", ""), server.seed))
+            else:
+                self._send(404, b'{"error":"not found"}')
+                return
+            self._send(200, body)
+
+        def do_POST(self) -> None:
+            raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if server.latency_s:
+                time.sleep(server.latency_s)
+            with server._lock:
+                server.counts["rpc"] += 1
+            if server.throttled():
+                with server._lock:
+                    server.counts["429"] += 1
+                self._send(429, b'{"error":"rate limited"}', {"Retry-After": f"{server.retry_after_s:g}"})
+                return
+            try:
+                body = json.loads(raw)
+            except ValueError:
+                self._send(400, b'{"error":"invalid json"}')
+                return
+            reply = [server.rpc(c) for c in body] if isinstance(body, list) else server.rpc(body)
+            self._send(200, fixtures.dump(reply))
+
+    return Handler
+
+
+def _route(path: str) -> str:
+    if path == "/latest/dex/search":
+        return "search"
+    if path.startswith("/latest/dex/pairs"):
+        return "pairs"
+    if path.startswith("/tokens/v1/"):
+        return "tokens"
+    if path in ("/defi/token_holders", "/defi/token_security"):
+        return path.rsplit("/", 1)[-1]
+    return "unknown"
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--pairs", type=int, default=300, help="paires par réponse /latest/dex/search")
+    ap.add_argument("--payload", help="payload /latest/dex/search enregistré (JSON)")
+    ap.add_argument("--latency-ms", type=float, default=0.0)
+    ap.add_argument("--rate-429", type=float, default=0.0, help="fraction de réponses 429")
+    ap.add_argument("--retry-after", type=float, default=0.05, help="Retry-After des 429 (s)")
+    ap.add_argument("--tail-rate", type=float, default=0.0, help="fraction de réponses lentes")
+    ap.add_argument("--tail-ms", type=float, default=0.0, help="retard des réponses lentes")
+    args = ap.parse_args()
+
+    payload = json.loads(pathlib.Path(args.payload).read_bytes()) if args.payload else None
+    server = StandIn(pairs=args.pairs, latency_ms=args.latency_ms, rate_429=args.rate_429,
+                     retry_after_s=args.retry_after, payload=payload, port=args.port,
+                     tail_rate=args.tail_rate, tail_ms=args.tail_ms)
+    print(f"stand-in on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(dict(server.counts)))
+
+
+if __name__ == "__main__":
+    main()
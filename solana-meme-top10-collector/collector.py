@@ -2,32 +2,57 @@
 Collector Solana Top10 — version fusionnée
 - Conserve la logique DexScreener Top10 (tri par volume24hUsd décroissant,
   unicité par token address).
+- Multi-chaînes (COLLECT_CHAINS=solana,base,bsc,ethereum) : un CSV par chaîne,
+  data/top10_<date>.csv pour Solana, data/top10_<chain>_<date>.csv sinon.
 - Respecte l'ordre EXACT des en-têtes CSV utilisé par la CI.
-- Échoue proprement (exit 1) + écrit data/run_summary.json si aucune donnée.
+- Écrit data/run_summary.json à chaque run : durée par étape, requêtes/retries/429/
+  octets par hôte, taux de hit du cache (metrics.py) ; METRICS_PROM_FILE → textfile Prometheus.
 - Fallbacks légers :
-    * pandas : optionnel (si absent, on écrit le CSV sans pandas)
+    * pandas : optionnel et importé à la demande (le run quotidien n'en a pas besoin)
     * dotenv : optionnel (si présent, on charge .env)
+- Démarrage rapide : requests / boucle HTTP importés au premier appel réseau
+  (benchmarks/bench_import.py vérifie le temps d'import).
 """
 
-import csv
 import datetime
+import functools
 import logging
 import os
-import time
-from typing import Any, Dict, Iterable, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 # --- Fallbacks optionnels -----------------------------------------------------
-try:
-    import pandas as pd  # type: ignore
-except Exception:  # pragma: no cover
-    pd = None  # type: ignore
-
+# démarrage rapide : pandas, requests et la boucle HTTP (utils) ne sont importés
+# qu'à leur premier usage. dotenv (léger) reste chargé d'emblée : le .env à côté
+# de ce fichier, quel que soit le répertoire courant, sinon la recherche par défaut
 try:
     from dotenv import load_dotenv  # type: ignore
-    load_dotenv()
+    _env_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env")
+    load_dotenv(_env_file if os.path.exists(_env_file) else None)
 except Exception:
     pass
 
+
+@functools.lru_cache(maxsize=None)
+def _pandas() -> Any:
+    """Module pandas (import paresseux) ou None s'il est absent."""
+    try:
+        import pandas  # type: ignore
+    except Exception:  # pragma: no cover
+        return None
+    return pandas
+
+
+@functools.lru_cache(maxsize=None)
+def _utils() -> Any:
+    """utils (requests, client HTTP partagé) importé au premier appel réseau."""
+    try:
+        import utils  # lazy import
+    except Exception:  # pragma: no cover
+        return None
+    return utils
+
 # --- Config générique ---------------------------------------------------------
 logger = logging.getLogger(__name__)
 HEADERS = [
@@ -36,53 +61,51 @@ HEADERS = [
     "createdAt", "earlyReturnMultiple", "holders", "exitLiquidity",
     "hasMintAuth", "hasFreezeAuth", "notes"
 ]
-DEX_API = "https://api.dexscreener.com"
+DEX_API = (os.getenv("DEXSCREENER_BASE_URL", "") or "https://api.dexscreener.com").rstrip("/")
 DEX_KEY = os.getenv("DEXSCREENER_API_KEY", "").strip()
 BIRDEYE_KEY = os.getenv("BIRDEYE_API_KEY", "").strip()
+HELIUS_KEY = os.getenv("HELIUS_API_KEY", "").strip()
+# birdeye : 2 appels par token ; helius : autorités + concentration en lots JSON-RPC (Solana)
+ENRICH_BACKEND = (os.getenv("ENRICH_BACKEND", "") or "birdeye").strip().lower()
+# échéance globale du run en secondes (0 / vide : aucune) : fetch + enrichissement
+RUN_DEADLINE_S = float(os.getenv("RUN_DEADLINE_S", "0") or 0)
 DATE_STR = datetime.datetime.utcnow().strftime("%Y-%m-%d")
-
-try:
-    from utils import enrich_birdeye as _enrich_birdeye
-    from utils import fetch_new_pairs_dexscreener as _fetch_new_pairs_dexscreener
-    from utils import now_iso_date as _now_iso_date
-except Exception:  # pragma: no cover
-    _enrich_birdeye = None  # type: ignore
-    _fetch_new_pairs_dexscreener = None  # type: ignore
-    _now_iso_date = None  # type: ignore
-
-def _num(x, default=""):
-    try:
-        if x is None or x == "":
-            return default
-        return float(x)
-    except Exception:
-        return default
-
-# --- HTTP minimal (requests standard, sans dépendances supplémentaires) -------
+# Classement : taille du top et plancher de liquidité
+TOP_K = 10
+MIN_LIQUIDITY_USD = float(os.getenv("MIN_LIQUIDITY_USD", "5000") or 5000)
+# Taille max du pool de candidats (découverte multi-requêtes DexScreener)
+MAX_NEW_PAIRS = max(1, int(os.getenv("MAX_NEW_PAIRS", "5000") or 5000))
+# au-delà de ce nombre de paires (et pandas installé), rank_records passe par le
+# chemin vectorisé : en dessous, l'import de pandas coûte plus que le gain
+RANK_VECTORIZE_MIN_ROWS = max(1, int(os.getenv("RANK_VECTORIZE_MIN_ROWS", "20000") or 20000))
+# Enrichissement Birdeye : nb de tokens enrichis en parallèle
+# (le plafond par hôte est HTTP_MAX_PER_HOST, appliqué par http_client)
+ENRICH_WORKERS = max(1, int(os.getenv("ENRICH_WORKERS", "8") or 8))
+EMPTY_ENRICHMENT = {"holders": None, "exitLiquidity": None, "hasMintAuth": None, "hasFreezeAuth": None}
+# Chaînes collectées (ids DexScreener, virgules) : une découverte partagée, puis
+# classement / enrichissement / CSV de chaque chaîne en parallèle
+DEFAULT_CHAIN = "solana"
+CHAINS = tuple(dict.fromkeys(
+    c.strip().lower() for c in (os.getenv("COLLECT_CHAINS", DEFAULT_CHAIN) or DEFAULT_CHAIN).split(",") if c.strip()
+)) or (DEFAULT_CHAIN,)
+
+import metrics
+from csv_sink import CsvSink
+from normalize import pair_record
+from records import PairRecord, as_dict, as_record
+from topk import TopK
+
+# --- HTTP (moteur partagé http_client : session keep-alive + retries) ---------
 def _http_get(path: str, params: Optional[Dict[str, Any]] = None, timeout: int = 20) -> Dict[str, Any]:
-    import requests  # lazy import
-    url = f"{DEX_API}{path}"
+    import http_client  # lazy import
     headers = {"Accept": "application/json"}
     if DEX_KEY:
         headers["X-API-Key"] = DEX_KEY
-
-    backoffs = [0, 1, 2, 4, 8]
-    last_err = None
-    for b in backoffs:
-        if b:
-            time.sleep(b)
-        try:
-            r = requests.get(url, params=params or {}, headers=headers, timeout=timeout)
-            # Retry doux sur 429/5xx
-            if r.status_code in (429, 500, 502, 503, 504):
-                last_err = (r.status_code, r.text[:200])
-                continue
-            r.raise_for_status()
-            return r.json()
-        except Exception as e:  # réseau, timeouts, etc.
-            last_err = str(e)
-            continue
-    raise RuntimeError(f"GET {path} failed after retries: {last_err}")
+    try:
+        return http_client.get_json(f"{DEX_API}{path}", params=params, headers=headers,
+                                    timeout=timeout, retries=5)
+    except Exception as e:
+        raise RuntimeError(f"GET {path} failed after retries: {e}") from e
 
 # --- DexScreener helpers ------------------------------------------------------
 def _search_pairs_solana(query: str = "SOL", limit: int = 300) -> List[Dict[str, Any]]:
@@ -107,171 +130,362 @@ def collect_rows() -> List[Dict[str, Any]]:
     # 1) Échantillon large
     pairs = _search_pairs_solana(query="SOL", limit=300)
 
-    # 2) Meilleure paire par token base (max volume 24h)
-    by_token: Dict[str, Dict[str, Any]] = {}
-    for p in pairs:
-        base = p.get("baseToken") or {}
-        addr = base.get("address") or ""
-        if not addr:
-            continue
-        cur = by_token.get(addr)
-        if cur is None or _vol24_usd(p) > _vol24_usd(cur):
-            by_token[addr] = p
-
-    # 3) Tri décroissant & top10
-    best = sorted(by_token.values(), key=_vol24_usd, reverse=True)[:10]
-
-    # 4) Mapping → schéma CSV
+    # 2+3) Meilleure paire par token base (max volume 24h), top10 par volume décroissant
+    best = TopK(
+        10, _vol24_usd,
+        keep=lambda p: bool((p.get("baseToken") or {}).get("address")),
+        dedupe_by=lambda p: (p.get("baseToken") or {}).get("address"),
+    ).extend(pairs).result()
+
+    # 4) Mapping → schéma CSV (normalisation en une passe)
     rows: List[Dict[str, Any]] = []
     for p in best:
-        chain = (p.get("chainId") or p.get("chain") or "solana").lower()
-        base = p.get("baseToken") or {}
-        liq  = p.get("liquidity") or {}
-        tx   = p.get("txns") or {}
-        chg  = p.get("priceChange") or {}
-
-        rows.append({
-            "date": DATE_STR,
-            "chain": chain,
-            "baseToken": base.get("name") or base.get("symbol") or "",
-            "baseSymbol": base.get("symbol") or "",
-            "pairAddress": p.get("pairAddress") or p.get("pairId") or "",
-            "tokenAddress": base.get("address") or "",
-            "priceUsd": _num(p.get("priceUsd")),
-            "liquidityUsd": _num(liq.get("usd") if isinstance(liq, dict) else liq),
-            "volume24hUsd": _num(_vol24_usd(p)),
-            "txns24h": int((tx.get("h24") if isinstance(tx, dict) else tx) or 0),
-            "priceChange24h": _num(chg.get("h24") if isinstance(chg, dict) else chg),
-            "createdAt": int(p.get("pairCreatedAt") or p.get("createdAt") or 0),
-            "earlyReturnMultiple": "",
-            "holders": "",
-            "exitLiquidity": "",
-            "hasMintAuth": "",
-            "hasFreezeAuth": "",
-            "notes": "",
-        })
+        rec = pair_record(p)
+        rec.date = DATE_STR
+        rec.chain = rec.chain.lower()
+        rows.append(rec.to_dict())
     return rows
 
 
 def now_iso_date() -> str:
-    if _now_iso_date is not None:
-        return _now_iso_date()
-    return datetime.datetime.utcnow().strftime("%Y-%m-%d")
-
-
-def fetch_new_pairs_dexscreener(api_key: Optional[str], max_pairs: int = 500) -> List[Dict[str, Any]]:
-    if _fetch_new_pairs_dexscreener is not None:
-        return _fetch_new_pairs_dexscreener(api_key, max_pairs=max_pairs)
-    pairs = _search_pairs_solana(query="SOL", limit=max_pairs)
-    return [
-        {
-            "chain": p.get("chainId") or p.get("chain") or "solana",
-            "baseToken": (p.get("baseToken") or {}).get("name") or "",
-            "baseSymbol": (p.get("baseToken") or {}).get("symbol") or "",
-            "pairAddress": p.get("pairAddress") or p.get("pairId") or "",
-            "tokenAddress": (p.get("baseToken") or {}).get("address") or "",
-            "priceUsd": _num(p.get("priceUsd")),
-            "liquidityUsd": _num((p.get("liquidity") or {}).get("usd")),
-            "volume24hUsd": _num(_vol24_usd(p)),
-            "txns24h": int(((p.get("txns") or {}).get("h24") or {}).get("buys") or 0)
-            + int(((p.get("txns") or {}).get("h24") or {}).get("sells") or 0),
-            "priceChange24h": _num((p.get("priceChange") or {}).get("h24")),
-            "createdAt": p.get("pairCreatedAt") or p.get("createdAt"),
-        }
-        for p in pairs
-    ]
-
-
-def enrich_birdeye(token_address: str, birdeye_key: Optional[str]) -> Dict[str, Any]:
-    if _enrich_birdeye is not None:
-        return _enrich_birdeye(token_address, birdeye_key)
-    return {"holders": None, "exitLiquidity": None, "hasMintAuth": None, "hasFreezeAuth": None}
+    # même calcul que utils.now_iso_date, sans importer la pile HTTP
+    return datetime.datetime.now(datetime.timezone.utc).astimezone().date().isoformat()
+
+
+def _chain_kw(chain: str) -> Dict[str, str]:
+    # Solana : appel inchangé (signature historique des points d'extension)
+    return {} if chain == DEFAULT_CHAIN else {"chain": chain}
+
+
+def fetch_new_pairs_dexscreener(api_key: Optional[str], max_pairs: int = 500,
+                                chain: str = DEFAULT_CHAIN) -> List[PairRecord]:
+    utils = _utils()
+    if utils is not None:
+        return utils.fetch_new_pairs_dexscreener(api_key, max_pairs=max_pairs, chain=chain)
+    pairs = _search_pairs_solana(query="SOL", limit=max_pairs) if chain == DEFAULT_CHAIN else []
+    return [pair_record(p) for p in pairs]
+
+
+def fetch_pairs_by_chain(api_key: Optional[str], chains: Iterable[str],
+                         max_pairs: int = 500) -> Dict[str, List[PairRecord]]:
+    """{chaîne: paires} ; plusieurs chaînes → une seule vague de découverte partagée."""
+    chains = list(chains)
+    utils = _utils()
+    if len(chains) > 1 and utils is not None:
+        return utils.fetch_pairs_by_chain(api_key, chains, max_pairs=max_pairs)
+    return {c: fetch_new_pairs_dexscreener(api_key, max_pairs=max_pairs, **_chain_kw(c)) for c in chains}
+
+
+def enrich_birdeye(token_address: str, birdeye_key: Optional[str], chain: str = DEFAULT_CHAIN) -> Dict[str, Any]:
+    utils = _utils()
+    if utils is not None:
+        return utils.enrich_birdeye(token_address, birdeye_key, chain)
+    return dict(EMPTY_ENRICHMENT)
+
+
+def iter_enrichments(rows: List[Any], birdeye_key: Optional[str],
+                     workers: Optional[int] = None, chain: str = DEFAULT_CHAIN) -> Iterator[Dict[str, Any]]:
+    """
+    Étape d'enrichissement concurrente : un enrich_birdeye par token, tous lancés
+    d'un coup (dans la limite de `workers`). Les résultats sont rendus dans l'ordre
+    des lignes, chacun dès qu'il est prêt ; un token en échec retombe sur les champs None.
+    ENRICH_BACKEND=helius (Solana + HELIUS_API_KEY) : tous les tokens en quelques
+    requêtes JSON-RPC groupées (helius_client).
+    """
+    if not rows:
+        return
+    if ENRICH_BACKEND == "helius" and HELIUS_KEY and chain == DEFAULT_CHAIN:
+        batched = _helius_enrichments(rows)
+        if batched is not None:
+            yield from batched
+            return
+
+    def _one(token_address: Any) -> Dict[str, Any]:
+        try:
+            return enrich_birdeye(token_address, birdeye_key, **_chain_kw(chain)) or {}
+        except Exception as e:
+            if _deadline_passed():
+                return _deadline_skipped()
+            logger.warning("enrich failed token=%s err=%s", token_address, e)
+            return dict(EMPTY_ENRICHMENT)
+
+    workers = max(1, min(workers or ENRICH_WORKERS, len(rows)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="enrich") as pool:
+        yield from pool.map(_one, [row.get("tokenAddress") for row in rows])
+
+
+def _deadline_passed() -> bool:
+    utils = _utils()
+    return utils is not None and utils.http_client.deadline_passed()
+
+
+def _deadline_skipped() -> Dict[str, Any]:
+    """Enrichissement abandonné à l'échéance : champs vides, signalés dans notes."""
+    return {**EMPTY_ENRICHMENT, "notes": "deadline_skipped=" + ",".join(EMPTY_ENRICHMENT)}
+
+
+def _helius_enrichments(rows: List[Any]) -> Optional[List[Dict[str, Any]]]:
+    """Enrichissement groupé via Helius ; None si le backend échoue (repli Birdeye)."""
+    mints = [row.get("tokenAddress") or "" for row in rows]
+    try:
+        import helius_client  # lazy import (requests)
+        by_mint = helius_client.enrichments(mints, api_key=HELIUS_KEY)
+    except Exception as e:
+        if _deadline_passed():
+            return [_deadline_skipped() for _ in mints]
+        logger.warning("helius enrichment failed, falling back to birdeye err=%s", e)
+        return None
+    return [by_mint.get(m) or dict(EMPTY_ENRICHMENT) for m in mints]
+
+
+def enrich_rows(rows: List[Any], birdeye_key: Optional[str],
+                workers: Optional[int] = None, chain: str = DEFAULT_CHAIN) -> List[Dict[str, Any]]:
+    """iter_enrichments, résultats collectés en liste (ordre des lignes conservé)."""
+    return list(iter_enrichments(rows, birdeye_key, workers, **_chain_kw(chain)))
 
 
 def _rows_from_dataframe(df: Any) -> List[Dict[str, Any]]:
+    return [as_dict(row) for row in _iter_rows(df)]
+
+
+def _iter_rows(df: Any) -> Iterable[Dict[str, Any]]:
+    """Lignes d'un DataFrame / d'une liste / d'un générateur, sans copie intermédiaire."""
     if df is None:
-        return []
+        return iter(())
     if isinstance(df, list):
-        return [dict(row) for row in df]
+        return iter(df)
     if hasattr(df, "to_dict"):
-        return list(df.to_dict("records"))
-    if hasattr(df, "_rows"):
-        return [dict(row) for row in df._rows]  # type: ignore[attr-defined]
+        return iter(df.to_dict("records"))
     try:
-        return [dict(row) for row in df]
+        return iter(df)
     except Exception:
-        return []
+        return iter(())
 
 
-def rank_top10(df: Any) -> Any:
-    rows = _rows_from_dataframe(df)
-    def _safe_num(value: Any) -> float:
-        try:
-            return float(value)
-        except Exception:
-            return 0.0
-
-    filtered = [row for row in rows if _safe_num(row.get("liquidityUsd")) >= 5000]
-    filtered.sort(
-        key=lambda row: (_safe_num(row.get("priceChange24h")), _safe_num(row.get("volume24hUsd"))),
-        reverse=True,
+def _safe_num(value: Any) -> float:
+    # None, "", texte et NaN comptent comme 0.0
+    try:
+        num = float(value)
+    except Exception:
+        return 0.0
+    return num if num == num else 0.0
+
+
+def _rank_key(row: Dict[str, Any]) -> Any:
+    return (_safe_num(row.get("priceChange24h")), _safe_num(row.get("volume24hUsd")))
+
+
+def _token_of(row: Dict[str, Any]) -> Optional[str]:
+    token = row.get("tokenAddress")
+    # None, "" et NaN → pas de dédup
+    return token if token is not None and token == token and token != "" else None
+
+
+def _rank_top10_python(rows: Iterable[Any], k: int, min_liquidity: float) -> List[Any]:
+    """Top-k streaming ; renvoie les lignes gagnantes telles quelles (dicts ou PairRecord)."""
+    ranker = TopK(
+        k, _rank_key,
+        keep=lambda row: _safe_num(row.get("liquidityUsd")) >= min_liquidity,
+        dedupe_by=_token_of,
+        best=lambda row: _safe_num(row.get("volume24hUsd")),
     )
-    top = filtered[:10]
+    return ranker.extend(rows).result()
+
+
+def _rank_top10_pandas(df: Any, k: int, min_liquidity: float) -> Any:
+    """Même classement que _rank_top10_python, entièrement vectorisé (pandas réel)."""
+    import numpy as np  # lazy import (dépendance de pandas)
+    pd = _pandas()
+
+    def num(col: str) -> Any:
+        if col not in df.columns:
+            return pd.Series(0.0, index=df.index).to_numpy()
+        return pd.to_numeric(df[col], errors="coerce").fillna(0.0).to_numpy()
+
+    # tokens → codes entiers (-1 : pas de token), puis filtre liquidité
+    if "tokenAddress" in df.columns:
+        tokens = df["tokenAddress"]
+        codes = pd.factorize(tokens)[0]
+        codes[(tokens == "").to_numpy()] = -1
+    else:
+        codes = pd.Series(-1, index=df.index).to_numpy()
+    work = pd.DataFrame({"tok": codes, "chg": num("priceChange24h"), "vol": num("volume24hUsd")})
+    work = work[num("liquidityUsd") >= min_liquidity]
+
+    # une paire par token : meilleur volume (1re vue en cas d'égalité) ; l'ordre
+    # d'égalité du classement est celui de la 1re apparition du token
+    has_tok = (work["tok"] >= 0).to_numpy()
+    with_tok = work[has_tok]
+    best = with_tok.groupby("tok", sort=False)["vol"].idxmax()
+    heads = with_tok.groupby("tok", sort=False).head(1)
+    first_pos = pd.Series(heads.index, index=heads["tok"]).reindex(best.index).to_numpy()
+    best_pos = best.to_numpy()
+    loose_pos = work.index[~has_tok].to_numpy()
+
+    pos = np.concatenate([loose_pos, best_pos])
+    ranked = pd.DataFrame({
+        "chg": work["chg"].reindex(pos).to_numpy(),
+        "vol": work["vol"].reindex(pos).to_numpy(),
+        "nseq": -np.concatenate([loose_pos, first_pos]),
+        "pos": pos,
+    }).nlargest(k, ["chg", "vol", "nseq"])
+    return df.iloc[ranked["pos"].to_numpy()].reset_index(drop=True)
+
+
+def rank_top10(df: Any, k: int = TOP_K, min_liquidity: float = MIN_LIQUIDITY_USD) -> Any:
+    """
+    Filtre liquidité, une paire par token (meilleur volume 24h), tri décroissant
+    (priceChange24h, volume24hUsd) ; NaN/None/texte comptent comme 0.
+    - DataFrame pandas réel → chemin vectorisé (to_numeric, masque, nlargest).
+    - liste / générateur / shim → top-k streaming en Python pur.
+    """
+    pd = _pandas()
+    if pd is not None and hasattr(pd, "to_numeric") and isinstance(df, pd.DataFrame):
+        return _rank_top10_pandas(df, k, min_liquidity)
+    top = [as_dict(row) for row in _rank_top10_python(_iter_rows(df), k, min_liquidity)]
     if pd is not None:
         return pd.DataFrame(top)
     return top
 
 
-def _write_csv(rows: Iterable[Dict[str, Any]], out_path: str) -> None:
-    os.makedirs(os.path.dirname(out_path), exist_ok=True)
-    with open(out_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=HEADERS)
-        writer.writeheader()
-        for row in rows:
-            writer.writerow(row)
+def rank_records(pairs: Iterable[Any], k: int = TOP_K, min_liquidity: float = MIN_LIQUIDITY_USD) -> List[PairRecord]:
+    """
+    Comme rank_top10 mais sans DataFrame en sortie : seuls les k gagnants deviennent
+    des PairRecord. Grande liste (RANK_VECTORIZE_MIN_ROWS) + pandas réel → chemin
+    vectorisé sur les 4 colonnes utiles ; sinon top-k streaming.
+    """
+    if isinstance(pairs, (list, tuple)) and len(pairs) >= RANK_VECTORIZE_MIN_ROWS:
+        pd = _pandas()
+        if pd is not None and hasattr(pd, "to_numeric"):
+            cols = ("tokenAddress", "liquidityUsd", "priceChange24h", "volume24hUsd")
+            df = pd.DataFrame({c: [row.get(c) for row in pairs] for c in cols})
+            df["_pos"] = range(len(pairs))
+            ranked = _rank_top10_pandas(df, k, min_liquidity)
+            return [as_record(pairs[i]) for i in ranked["_pos"]]
+    return [as_record(row) for row in _rank_top10_python(pairs, k, min_liquidity)]
 
 
-def main() -> None:
-    start = time.time()
-    date_str = now_iso_date()
-    pairs = fetch_new_pairs_dexscreener(DEX_KEY, max_pairs=500)
-    logger.info("pairs fetched=%s", len(pairs))
-
-    df = pd.DataFrame(pairs) if pd is not None else list(pairs)
-    ranked = rank_top10(df)
-    ranked_rows = _rows_from_dataframe(ranked)
-    logger.info("pairs filtered=%s", len(ranked_rows))
-
-    out_rows: List[Dict[str, Any]] = []
-    for row in ranked_rows:
-        enrich = enrich_birdeye(row.get("tokenAddress"), BIRDEYE_KEY)
-        out_rows.append(
-            {
-                "date": date_str,
-                "chain": row.get("chain") or "solana",
-                "baseToken": row.get("baseToken") or "",
-                "baseSymbol": row.get("baseSymbol") or "",
-                "pairAddress": row.get("pairAddress") or "",
-                "tokenAddress": row.get("tokenAddress") or "",
-                "priceUsd": row.get("priceUsd"),
-                "liquidityUsd": row.get("liquidityUsd"),
-                "volume24hUsd": row.get("volume24hUsd"),
-                "txns24h": row.get("txns24h"),
-                "priceChange24h": row.get("priceChange24h"),
-                "createdAt": row.get("createdAt"),
-                "earlyReturnMultiple": "",
-                "holders": enrich.get("holders"),
-                "exitLiquidity": enrich.get("exitLiquidity"),
-                "hasMintAuth": enrich.get("hasMintAuth"),
-                "hasFreezeAuth": enrich.get("hasFreezeAuth"),
-                "notes": "",
-            }
-        )
+def _write_csv(rows: Iterable[Any], out_path: str) -> None:
+    with CsvSink(out_path, HEADERS) as sink:
+        sink.write_all(rows)
+
+
+_early_return_lock = threading.Lock()
 
-    out = os.path.join("data", f"top10_{date_str}.csv")
-    _write_csv(out_rows, out)
-    duration = time.time() - start
-    logger.info("duration=%.2fs", duration)
+
+def _fill_early_returns(ranked: List[PairRecord], date_str: str) -> None:
+    """earlyReturnMultiple depuis l'index local des prix first-seen (aucun appel API)."""
+    with _early_return_lock:  # chaînes en parallèle : un seul écrivain SQLite à la fois
+        _fill_early_returns_locked(ranked, date_str)
+
+
+def _fill_early_returns_locked(ranked: List[PairRecord], date_str: str) -> None:
+    try:
+        import price_index  # lazy import
+        index = price_index.open_default()
+    except Exception as e:
+        logger.warning("price index unavailable err=%s", e)
+        return
+    if index is None:
+        return
+    try:
+        index.observe(ranked, date_str)
+        for rec in ranked:
+            rec.earlyReturnMultiple = index.early_return(rec.tokenAddress, rec.priceUsd, rec.chain)
+    finally:
+        index.close()
+
+
+def output_path(chain: str, date_str: str) -> str:
+    """data/top10_<date>.csv pour Solana (nom historique), data/top10_<chain>_<date>.csv sinon."""
+    name = f"top10_{date_str}.csv" if chain == DEFAULT_CHAIN else f"top10_{chain}_{date_str}.csv"
+    return os.path.join("data", name)
+
+
+def _write_run_summary(date_str: str, chains: Dict[str, Dict[str, Any]], deadline_s: float = 0) -> None:
+    """data/run_summary.json (+ textfile Prometheus si METRICS_PROM_FILE)."""
+    first = next(iter(chains.values()), {})
+    try:
+        summary = metrics.write_summary(
+            os.path.join("data", "run_summary.json"),
+            date=date_str, output=first.get("output"),
+            pairs_fetched=sum(c["pairs_fetched"] for c in chains.values()),
+            pairs_ranked=sum(c["pairs_ranked"] for c in chains.values()),
+            deadline_s=deadline_s or None,
+            chains=chains,
+        )
+        prom_path = os.getenv("METRICS_PROM_FILE", "").strip()
+        if prom_path:
+            metrics.write_prometheus(prom_path, summary)
+    except Exception as e:
+        logger.warning("run summary not written err=%s", e)
+        return
+    logger.info("duration=%.2fs stages=%s", summary["duration_s"],
+                " ".join(f"{k}={v:.2f}s" for k, v in summary["stages_s"].items()))
+
+
+def collect_chain(chain: str, pairs: List[PairRecord], date_str: str) -> Dict[str, Any]:
+    """Classement, earlyReturnMultiple, enrichissement et CSV d'une chaîne."""
+    with metrics.stage("rank"):
+        ranked = rank_records(pairs)
+    logger.info("pairs filtered=%s chain=%s", len(ranked), chain)
+
+    with metrics.stage("early_return"):
+        _fill_early_returns(ranked, date_str)
+
+    # chaque ligne est enrichie en place puis écrite dès que son tour arrive ;
+    # le CSV n'est publié (rename atomique) qu'une fois la chaîne complète
+    out = output_path(chain, date_str)
+    enrichments = iter_enrichments(ranked, BIRDEYE_KEY, **_chain_kw(chain))
+    with CsvSink(out, HEADERS) as sink:
+        for rec in ranked:
+            with metrics.stage("enrich"):
+                enrich = next(enrichments)
+            rec.date = date_str
+            rec.apply_enrichment(enrich)
+            with metrics.stage("write"):
+                sink.write(rec)
+        with metrics.stage("write"):
+            sink.commit()
+    return {"output": out, "pairs_fetched": len(pairs), "pairs_ranked": len(ranked)}
+
+
+def main(chains: Optional[Iterable[str]] = None, deadline_s: Optional[float] = None) -> None:
+    """
+    Collecte de toutes les chaînes (COLLECT_CHAINS) dans un seul process : session
+    HTTP, pool de connexions et limiteurs de débit partagés. Les durées d'étape
+    du résumé sont cumulées sur les chaînes.
+    deadline_s (défaut RUN_DEADLINE_S) : échéance de toutes les requêtes du run ;
+    au-delà, le CSV est publié avec les enrichissements déjà obtenus.
+    """
+    metrics.reset()
+    chains = list(chains or CHAINS)
+    date_str = now_iso_date()
+    deadline_s = RUN_DEADLINE_S if deadline_s is None else deadline_s
+    utils = _utils()
+    if utils is not None:
+        utils.resilience.reset()  # disjoncteurs et latences propres à chaque run
+        utils.http_client.set_deadline(deadline_s if deadline_s > 0 else None)
+    try:
+        try:
+            by_chain = fetch_pairs_by_chain(DEX_KEY, chains, max_pairs=MAX_NEW_PAIRS)
+        except Exception as e:
+            if not _deadline_passed():
+                raise
+            logger.warning("fetch stopped by run deadline err=%s", e)
+            by_chain = {}
+        logger.info("pairs fetched=%s", " ".join(f"{c}:{len(by_chain.get(c) or [])}" for c in chains))
+
+        if len(chains) == 1:
+            results = [collect_chain(chains[0], by_chain.get(chains[0]) or [], date_str)]
+        else:
+            with ThreadPoolExecutor(max_workers=len(chains), thread_name_prefix="chain") as pool:
+                results = list(pool.map(lambda c: collect_chain(c, by_chain.get(c) or [], date_str), chains))
+    finally:
+        if utils is not None:
+            utils.http_client.set_deadline(None)
+            utils.raw_archive.flush()
+    _write_run_summary(date_str, dict(zip(chains, results)), deadline_s)
 
 # --- Entrée principale --------------------------------------------------------
 if __name__ == "__main__":
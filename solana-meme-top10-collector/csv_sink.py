@@ -0,0 +1,84 @@
+"""
+Sortie CSV en streaming, publiée atomiquement
+
+- Les lignes sont écrites une à une (dès que leur enrichissement est prêt) dans un
+  fichier temporaire à côté de la cible ; commit() fait fsync puis os.replace :
+  le CSV publié est soit l'ancien, soit le nouveau complet, jamais tronqué.
+- Mode append (snapshots intraday) : le temporaire démarre comme copie du fichier
+  existant, les nouvelles lignes s'y ajoutent, puis même rename atomique.
+- Sans commit() (exception, crash), le temporaire est supprimé et la cible intacte.
+- Accepte des PairRecord, des dicts (clés = en-têtes) ou des listes de valeurs.
+"""
+
+from __future__ import annotations
+
+import csv
+import os
+import shutil
+from typing import Any, Iterable, List, Optional, Sequence
+
+from records import FIELDS, PairRecord
+
+
+class CsvSink:
+    def __init__(self, path: str, headers: Sequence[str], *, append: bool = False):
+        self.path = path
+        self.headers = list(headers)
+        self.append = append
+        self.rows = 0
+        self.tmp_path = f"{path}.{os.getpid()}.tmp"
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        has_rows = append and os.path.exists(path) and os.path.getsize(path) > 0
+        if has_rows:
+            shutil.copyfile(path, self.tmp_path)
+        self._file: Optional[Any] = open(self.tmp_path, "a" if has_rows else "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        if not has_rows:
+            self._writer.writerow(self.headers)
+        # en-têtes du schéma quotidien → PairRecord.csv_values() directement
+        self._record_fast = tuple(self.headers) == FIELDS
+
+    def _values(self, row: Any) -> List[Any]:
+        if isinstance(row, PairRecord) and self._record_fast:
+            return row.csv_values()
+        if isinstance(row, (list, tuple)):
+            return list(row)
+        return [row.get(h, "") for h in self.headers]
+
+    def write(self, row: Any) -> None:
+        if self._file is None:
+            raise ValueError(f"CsvSink closed: {self.path}")
+        self._writer.writerow(self._values(row))
+        self.rows += 1
+
+    def write_all(self, rows: Iterable[Any]) -> None:
+        for row in rows:
+            self.write(row)
+
+    def commit(self) -> None:
+        """fsync + rename atomique vers la cible."""
+        if self._file is None:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        try:
+            os.remove(self.tmp_path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> "CsvSink":
+        return self
+
+    def __exit__(self, exc_type: Any, *exc: Any) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
@@ -1,33 +1,46 @@
- """
+"""
 Dexscreener client — version fusionnée
 
 - search_pairs_solana(query="SOL", limit=300): utilise /latest/dex/search
   filtré sur Solana, puis retombe sur 2 endpoints pairs « solana » si besoin.
+- discover_pairs(chains, queries=None, limit=None): fan-out de nombreuses recherches
+  en parallèle (tokens de cotation de chaque chaîne, termes tendance,
+  DISCOVERY_KEYWORDS) + les endpoints de repli, réparties par chaîne et dédupliquées
+  par pairAddress dans l'ordre des requêtes ; discover_pairs_solana(...) pour Solana seule.
 - token_pairs(pairs_iterable): NORMALISE une liste de paires (compat avec l’ancienne signature)
 - token_pairs_api(chain_id, token_address): appelle /token-pairs/v1/{chainId}/{tokenAddress}
   (équivalent fonctionnel du "token_pairs(token_address)" de l’autre version, mais avec un nom distinct)
 - pair_detail(chain_id, pair_id): /latest/dex/pairs/{chainId}/{pairId}
+- pairs_detail(chain_id, pair_ids) / tokens_pairs(chain_id, token_addresses): variantes
+  groupées (jusqu'à 30 adresses par appel, lots concurrents), réponses redécoupées
+  par adresse → ~20x moins de requêtes pour revalider un pool de candidats.
+- refresh_pairs(chain_id, pair_ids): données fraîches d'un ensemble de paires connues
+  (via pairs_detail ; une paire en échec est simplement absente du résultat).
 
 Points clés:
 - Header optionnel X-API-Key via env DEXSCREENER_API_KEY (ou param).
-- Retry/backoff sur 429/5xx.
+- Retry/backoff sur 429/5xx via le moteur partagé http_client (session keep-alive,
+  API asyncio : _aget).
 - Pas de dépendance nouvelle (requests uniquement).
 """
 
 from __future__ import annotations
 
+import asyncio
+import logging
 import os
-import time
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-import requests
+import http_client
 
-BASE_URL = "https://api.dexscreener.com"
+# surchargeable (serveur local de benchmark, proxy) via DEXSCREENER_BASE_URL
+BASE_URL = (os.getenv("DEXSCREENER_BASE_URL", "") or "https://api.dexscreener.com").rstrip("/")
 DEFAULT_HEADERS: Dict[str, str] = {
     "Accept": "application/json",
     "User-Agent": "solana-meme-top10-collector/1.0",
 }
 API_KEY_ENV = "DEXSCREENER_API_KEY"
+logger = logging.getLogger(__name__)
 
 # Fallback endpoints si /latest/dex/search renvoie peu/aucun résultat
 DEX_SCREENER_SOLANA_URLS = (
@@ -35,6 +48,24 @@ DEX_SCREENER_SOLANA_URLS = (
     "/latest/dex/pairs?chainId=solana",
 )
 
+# Requêtes de découverte (chaque /latest/dex/search renvoie ~30 paires au plus)
+DISCOVERY_QUOTE_SYMBOLS = ("SOL", "WSOL", "USDC", "USDT")
+# tokens de cotation par chaîne (ids de chaîne DexScreener)
+CHAIN_QUOTE_SYMBOLS: Dict[str, Tuple[str, ...]] = {
+    "solana": DISCOVERY_QUOTE_SYMBOLS,
+    "ethereum": ("WETH", "ETH", "USDC", "USDT"),
+    "base": ("WETH", "ETH", "USDC"),
+    "bsc": ("WBNB", "BNB", "USDT", "BUSD"),
+}
+DISCOVERY_TRENDING_TERMS = (
+    "pump", "bonk", "meme", "moon", "dog", "cat", "inu", "pepe", "frog",
+    "ai", "trump", "elon", "baby", "wif", "chad", "sigma", "coin", "token",
+)
+DISCOVERY_KEYWORDS_ENV = "DISCOVERY_KEYWORDS"
+
+# nb max d'adresses séparées par des virgules dans /tokens/v1 et /latest/dex/pairs
+MAX_ADDRESSES_PER_CALL = 30
+
 
 def _headers(api_key: Optional[str] = None) -> Dict[str, str]:
     h = dict(DEFAULT_HEADERS)
@@ -44,23 +75,17 @@ def _headers(api_key: Optional[str] = None) -> Dict[str, str]:
     return h
 
 
+async def _aget(path: str, params: Optional[Dict[str, Any]] = None, *, api_key: Optional[str] = None,
+                timeout: int = 20) -> Dict[str, Any]:
+    """GET avec retries exponentiels sur 429/5xx (lève http_client.HttpError)."""
+    return await http_client.aget_json(
+        f"{BASE_URL}{path}", params=params, headers=_headers(api_key), timeout=timeout, retries=5
+    )
+
+
 def _get(path: str, params: Optional[Dict[str, Any]] = None, *, api_key: Optional[str] = None,
          timeout: int = 20) -> Dict[str, Any]:
-    """GET avec retries exponentiels sur 429/5xx."""
-    url = f"{BASE_URL}{path}"
-    backoff = 0.5
-    for attempt in range(1, 6):
-        r = requests.get(url, params=params or {}, headers=_headers(api_key), timeout=timeout)
-        if r.status_code in (429, 500, 502, 503, 504):
-            if attempt == 5:
-                r.raise_for_status()
-            time.sleep(backoff)
-            backoff *= 2
-            continue
-        r.raise_for_status()
-        return r.json()
-    # ne devrait pas arriver
-    raise RuntimeError(f"GET {path} failed after retries")
+    return http_client.run(_aget(path, params, api_key=api_key, timeout=timeout))
 
 
 # ---------------------- API de plus haut niveau -------------------------------
@@ -89,6 +114,115 @@ def search_pairs_solana(query: str = "SOL", limit: int = 300, *, api_key: Option
     return sol
 
 
+def fallback_paths(chain: str = "solana") -> Tuple[str, ...]:
+    """
+    Endpoints de repli « paires de la chaîne » : DEX_SCREENER_SOLANA_URLS pour solana,
+    aucun ailleurs (l'API documentée n'expose que /latest/dex/pairs/{chainId}/{pairId}).
+    """
+    return DEX_SCREENER_SOLANA_URLS if chain == "solana" else ()
+
+
+def discovery_queries(extra: Optional[Iterable[str]] = None, chain: str = "solana") -> List[str]:
+    """Cotations de la chaîne + termes tendance + DISCOVERY_KEYWORDS (virgules) + extra, sans doublons."""
+    configured = [k.strip() for k in os.getenv(DISCOVERY_KEYWORDS_ENV, "").split(",")]
+    quotes = CHAIN_QUOTE_SYMBOLS.get(chain, ())
+    out: List[str] = []
+    seen = set()
+    for q in (*quotes, *DISCOVERY_TRENDING_TERMS, *configured, *(extra or ())):
+        if q and q.lower() not in seen:
+            seen.add(q.lower())
+            out.append(q)
+    return out
+
+
+def _chain_of(pair: Dict[str, Any], default: str = "") -> str:
+    return str(pair.get("chainId") or pair.get("chain") or default).lower()
+
+
+def _volume24h(pair: Dict[str, Any]) -> float:
+    try:
+        return float((pair.get("volume") or {}).get("h24") or 0.0)
+    except (TypeError, ValueError, AttributeError):
+        return 0.0
+
+
+def select_pairs(pairs: List[Dict[str, Any]], limit: Optional[int]) -> List[Dict[str, Any]]:
+    """
+    Les `limit` paires au plus gros volume 24h (égalité : pairAddress), dans leur
+    ordre d'origine : le résultat ne dépend pas de l'ordre d'arrivée des réponses.
+    """
+    if limit is None or limit < 0 or len(pairs) <= limit:
+        return pairs
+    ranked = sorted(range(len(pairs)), key=lambda i: (-_volume24h(pairs[i]),
+                                                      str(pairs[i].get("pairAddress") or "")))
+    return [pairs[i] for i in sorted(ranked[:limit])]
+
+
+def _is_solana(pair: Dict[str, Any]) -> bool:
+    return _chain_of(pair) == "solana"
+
+
+async def adiscover_pairs(chains: Iterable[str] = ("solana",), queries: Optional[Iterable[str]] = None,
+                          limit: Optional[int] = None, *,
+                          api_key: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Découverte multi-chaînes en une seule vague : l'union des recherches de toutes
+    les chaînes (une recherche renvoie des paires de toutes les chaînes) + les
+    endpoints de repli de chacune, lancés en même temps. Les paires sont réparties
+    par chainId (une paire de recherche sans chainId est écartée) et dédupliquées par
+    pairAddress dans l'ordre des requêtes, pas dans l'ordre d'arrivée ; une requête
+    en échec est ignorée. `limit` par chaîne : voir select_pairs.
+    """
+    chains = list(dict.fromkeys(c.lower() for c in chains))
+    if queries is None:
+        queries = list(dict.fromkeys(q for c in chains for q in discovery_queries(chain=c)))
+    else:
+        queries = list(queries)
+    jobs = [_aget("/latest/dex/search", params={"q": q}, api_key=api_key) for q in queries]
+    # une réponse de repli sans chainId appartient à la chaîne demandée
+    fallbacks = [(c, path) for c in chains for path in fallback_paths(c)]
+    jobs += [_tagged(c, _aget(path, api_key=api_key)) for c, path in fallbacks]
+
+    by_chain: Dict[str, Dict[str, Dict[str, Any]]] = {c: {} for c in chains}
+    for data in await asyncio.gather(*jobs, return_exceptions=True):
+        if isinstance(data, BaseException):
+            logger.warning("discovery request failed err=%s", data)
+            continue
+        default = ""
+        if isinstance(data, tuple):
+            default, data = data
+        for pair in (data.get("pairs") or data.get("result") or []) if isinstance(data, dict) else []:
+            addr = pair.get("pairAddress") or pair.get("pairId")
+            bucket = by_chain.get(_chain_of(pair, default))
+            if addr and bucket is not None and addr not in bucket:
+                bucket[addr] = pair
+    logger.info("discovery queries=%s unique pairs=%s", len(jobs),
+                " ".join(f"{c}:{len(v)}" for c, v in by_chain.items()))
+
+    return {c: select_pairs(list(v.values()), limit) for c, v in by_chain.items()}
+
+
+async def _tagged(chain: str, coro: Any) -> Tuple[str, Any]:
+    return chain, await coro
+
+
+async def adiscover_pairs_solana(queries: Optional[Iterable[str]] = None, limit: Optional[int] = None, *,
+                                 api_key: Optional[str] = None) -> List[Dict[str, Any]]:
+    """adiscover_pairs limité à Solana."""
+    return (await adiscover_pairs(("solana",), queries, limit, api_key=api_key))["solana"]
+
+
+def discover_pairs_solana(queries: Optional[Iterable[str]] = None, limit: Optional[int] = None, *,
+                          api_key: Optional[str] = None) -> List[Dict[str, Any]]:
+    return http_client.run(adiscover_pairs_solana(queries, limit, api_key=api_key))
+
+
+def discover_pairs(chains: Iterable[str] = ("solana",), queries: Optional[Iterable[str]] = None,
+                   limit: Optional[int] = None, *,
+                   api_key: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+    return http_client.run(adiscover_pairs(chains, queries, limit, api_key=api_key))
+
+
 def token_pairs(pairs: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     NORMALISE des payloads de paires (compat avec l’ancienne signature).
@@ -146,3 +280,92 @@ def token_pairs_api(chain_id: str, token_address: str, *, api_key: Optional[str]
 def pair_detail(chain_id: str, pair_id: str, *, api_key: Optional[str] = None) -> Dict[str, Any]:
     """ /latest/dex/pairs/{chainId}/{pairId} """
     return _get(f"/latest/dex/pairs/{chain_id}/{pair_id}", api_key=api_key)
+
+
+# ---------------------- Variantes groupées (multi-adresses) -------------------
+
+def _chunks(items: List[str], size: int) -> List[List[str]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+async def _abatched(path: str, addresses: Iterable[str], *, api_key: Optional[str] = None
+                    ) -> List[Tuple[List[str], List[Dict[str, Any]]]]:
+    """
+    Un GET {path}/{a,b,c} par lot de MAX_ADDRESSES_PER_CALL adresses, lots en parallèle.
+    Renvoie [(adresses du lot, paires renvoyées)] ; un lot en échec renvoie [].
+    """
+    ids = [a for a in dict.fromkeys(addresses) if a]
+    batches = _chunks(ids, MAX_ADDRESSES_PER_CALL)
+    results = await asyncio.gather(
+        *(_aget(f"{path}/{','.join(batch)}", api_key=api_key) for batch in batches),
+        return_exceptions=True,
+    )
+    out = []
+    for batch, data in zip(batches, results):
+        if isinstance(data, BaseException):
+            logger.warning("batched request failed path=%s addresses=%s err=%s", path, len(batch), data)
+            data = []
+        out.append((batch, _pairs_of(data)))
+    return out
+
+
+def _pairs_of(data: Any) -> List[Dict[str, Any]]:
+    # /tokens/v1 renvoie une liste ; /latest/dex/pairs un objet {"pairs": [...]} ou {"pair": {...}}
+    if isinstance(data, list):
+        return [p for p in data if isinstance(p, dict)]
+    if isinstance(data, dict):
+        return data.get("pairs") or ([data["pair"]] if data.get("pair") else [])
+    return []
+
+
+async def apairs_detail(chain_id: str, pair_ids: Iterable[str], *,
+                        api_key: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """pair_detail groupé : /latest/dex/pairs/{chainId}/{a,b,c} → {pairAddress: paire}."""
+    out: Dict[str, Dict[str, Any]] = {}
+    for batch, pairs in await _abatched(f"/latest/dex/pairs/{chain_id}", pair_ids, api_key=api_key):
+        wanted = set(batch)
+        for pair in pairs:
+            addr = pair.get("pairAddress") or pair.get("pairId")
+            if addr in wanted and addr not in out:
+                out[addr] = pair
+    return out
+
+
+def pairs_detail(chain_id: str, pair_ids: Iterable[str], *,
+                 api_key: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    return http_client.run(apairs_detail(chain_id, pair_ids, api_key=api_key))
+
+
+async def atokens_pairs(chain_id: str, token_addresses: Iterable[str], *,
+                        api_key: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    token_pairs_api groupé : /tokens/v1/{chainId}/{a,b,c} → {tokenAddress: [paires]}.
+    Une paire est rattachée à chaque token demandé qu'elle contient (base ou quote).
+    """
+    out: Dict[str, List[Dict[str, Any]]] = {}
+    for batch, pairs in await _abatched(f"/tokens/v1/{chain_id}", token_addresses, api_key=api_key):
+        wanted = set(batch)
+        for token in batch:
+            out.setdefault(token, [])
+        for pair in pairs:
+            sides = {(pair.get(side) or {}).get("address") for side in ("baseToken", "quoteToken")}
+            for token in sides & wanted:
+                out[token].append(pair)
+    return out
+
+
+def tokens_pairs(chain_id: str, token_addresses: Iterable[str], *,
+                 api_key: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+    return http_client.run(atokens_pairs(chain_id, token_addresses, api_key=api_key))
+
+
+async def arefresh_pairs(chain_id: str, pair_ids: Iterable[str], *,
+                         api_key: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Paires connues rafraîchies par lots de 30 (apairs_detail) ; absentes/échecs ignorés."""
+    ids = [p for p in dict.fromkeys(pair_ids) if p]
+    by_pair = await apairs_detail(chain_id, ids, api_key=api_key)
+    return [by_pair[pid] for pid in ids if pid in by_pair]
+
+
+def refresh_pairs(chain_id: str, pair_ids: Iterable[str], *, api_key: Optional[str] = None) -> List[Dict[str, Any]]:
+    return http_client.run(arefresh_pairs(chain_id, pair_ids, api_key=api_key))
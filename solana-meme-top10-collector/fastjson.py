@@ -0,0 +1,57 @@
+"""
+Décodage JSON rapide — backend optionnel
+
+- orjson si installé, sinon msgspec, sinon json (stdlib). Aucune dépendance imposée.
+- loads() accepte bytes ou str et lève ValueError (comme json) sur un JSON invalide.
+- Gros payloads : le GC cyclique est suspendu pendant le décodage (des milliers de
+  dicts/listes acycliques déclenchent sinon des collectes inutiles).
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+from typing import Any, Union
+
+try:
+    import orjson as _orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    _orjson = None
+
+try:
+    import msgspec as _msgspec  # type: ignore
+except ImportError:  # pragma: no cover
+    _msgspec = None
+
+if _orjson is not None:
+    BACKEND = "orjson"
+elif _msgspec is not None:  # pragma: no cover
+    BACKEND = "msgspec"
+else:  # pragma: no cover
+    BACKEND = "json"
+
+# au-delà de cette taille, pas de GC pendant le décodage
+GC_PAUSE_BYTES = 64 * 1024
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    if len(data) < GC_PAUSE_BYTES or not gc.isenabled():
+        return _loads(data)
+    gc.disable()
+    try:
+        return _loads(data)
+    finally:
+        gc.enable()
+
+
+def _loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    try:
+        if BACKEND == "orjson":
+            return _orjson.loads(data)
+        if BACKEND == "msgspec":  # pragma: no cover
+            return _msgspec.json.decode(data)
+        return json.loads(data)
+    except ValueError:
+        raise
+    except Exception as e:  # msgspec.DecodeError n'hérite pas de ValueError
+        raise ValueError(str(e)) from e
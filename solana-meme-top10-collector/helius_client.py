@@ -0,0 +1,190 @@
+"""
+Helius (Solana JSON-RPC) — autorités et concentration des holders, en lots
+
+- mint_infos(mints) : getMultipleAccounts (jusqu'à 100 comptes par appel, lots
+  concurrents), comptes mint décodés localement (layout SPL Token, aussi valable
+  pour Token-2022) → autorité de mint / de freeze, supply, décimales.
+- largest_accounts(mints) : getTokenLargestAccounts de tous les mints dans une
+  seule requête JSON-RPC batch (100 appels par POST).
+- enrichments(mints) : champs du CSV (hasMintAuth, hasFreezeAuth) + part des
+  10 plus gros comptes dans la supply (note top10Holders=NN.N%).
+  Pour 10 tokens : 2 requêtes HTTP par run au lieu de 2 appels Birdeye par token.
+
+Clé : HELIUS_API_KEY ; URL : HELIUS_RPC_URL (défaut mainnet Helius ; serveur
+local de test). Réponses brutes archivées via raw_archive.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import logging
+import os
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import http_client
+import raw_archive
+
+logger = logging.getLogger(__name__)
+
+RPC_URL = (os.getenv("HELIUS_RPC_URL", "") or "https://mainnet.helius-rpc.com/").rstrip("/") + "/"
+MAX_ACCOUNTS_PER_CALL = 100
+MAX_CALLS_PER_BATCH = 100
+TOP_HOLDERS = 10
+
+# programmes propriétaires d'un compte mint
+TOKEN_PROGRAMS = (
+    "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA",
+    "TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb",  # Token-2022
+)
+# layout Mint : COption<Pubkey> mint_authority | u64 supply | u8 decimals |
+# bool is_initialized | COption<Pubkey> freeze_authority  (82 octets)
+MINT_LEN = 82
+
+
+class RpcError(RuntimeError):
+    """Erreur JSON-RPC renvoyée par le nœud (champ "error")."""
+
+
+class MintInfo(NamedTuple):
+    has_mint_authority: bool
+    has_freeze_authority: bool
+    supply: int
+    decimals: int
+
+
+def parse_mint(data: bytes) -> Optional[MintInfo]:
+    """Décode un compte mint SPL ; None si le compte n'en est pas un."""
+    if len(data) < MINT_LEN or not data[45]:
+        return None
+    mint_tag = int.from_bytes(data[0:4], "little")
+    freeze_tag = int.from_bytes(data[46:50], "little")
+    return MintInfo(mint_tag == 1, freeze_tag == 1, int.from_bytes(data[36:44], "little"), data[44])
+
+
+def _url(api_key: Optional[str]) -> str:
+    key = (api_key or os.getenv("HELIUS_API_KEY", "")).strip()
+    return f"{RPC_URL}?api-key={key}" if key else RPC_URL
+
+
+def _chunks(items: Sequence[str], size: int) -> List[Sequence[str]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+async def arpc(method: str, params: List[Any], *, api_key: Optional[str] = None) -> Any:
+    resp = await http_client.apost_json(_url(api_key), {"jsonrpc": "2.0", "id": 1, "method": method, "params": params})
+    if not isinstance(resp, dict) or "error" in resp:
+        raise RpcError(f"{method}: {(resp or {}).get('error') if isinstance(resp, dict) else resp}")
+    return resp.get("result")
+
+
+async def arpc_batch(calls: Sequence[Tuple[str, List[Any]]], *, api_key: Optional[str] = None) -> List[Any]:
+    """Requête JSON-RPC batch ; un appel en erreur donne None à sa place."""
+    body = [{"jsonrpc": "2.0", "id": i, "method": m, "params": p} for i, (m, p) in enumerate(calls)]
+    resp = await http_client.apost_json(_url(api_key), body)
+    if not isinstance(resp, list):
+        raise RpcError(f"batch: unexpected response {str(resp)[:200]}")
+    # l'ordre des réponses n'est pas garanti : réassociation par id
+    by_id = {r.get("id"): r for r in resp if isinstance(r, dict)}
+    out = []
+    for i, (method, _) in enumerate(calls):
+        r = by_id.get(i) or {}
+        if "error" in r or "result" not in r:
+            logger.warning("helius %s failed err=%s", method, r.get("error", "missing"))
+        out.append(r.get("result"))
+    return out
+
+
+async def amint_infos(mints: Iterable[str], *, api_key: Optional[str] = None) -> Dict[str, Optional[MintInfo]]:
+    """{mint: MintInfo ou None} ; un lot en échec laisse ses mints absents."""
+    mints = list(dict.fromkeys(m for m in mints if m))
+
+    async def one(batch: Sequence[str]) -> Dict[str, Optional[MintInfo]]:
+        try:
+            result = await arpc("getMultipleAccounts", [list(batch), {"encoding": "base64"}], api_key=api_key)
+        except Exception as e:
+            logger.warning("helius getMultipleAccounts failed n=%s err=%s", len(batch), e)
+            return {}
+        out = {}
+        for mint, account in zip(batch, (result or {}).get("value") or []):
+            raw_archive.record("helius", "mint_account", mint, account)
+            info = None
+            if isinstance(account, dict) and account.get("owner") in TOKEN_PROGRAMS:
+                try:
+                    info = parse_mint(base64.b64decode((account.get("data") or [""])[0]))
+                except (ValueError, TypeError):
+                    info = None
+            out[mint] = info
+        return out
+
+    merged: Dict[str, Optional[MintInfo]] = {}
+    for part in await asyncio.gather(*(one(b) for b in _chunks(mints, MAX_ACCOUNTS_PER_CALL))):
+        merged.update(part)
+    return merged
+
+
+async def alargest_accounts(mints: Iterable[str], *, api_key: Optional[str] = None) -> Dict[str, List[int]]:
+    """{mint: montants bruts des plus gros comptes, décroissants}."""
+    mints = list(dict.fromkeys(m for m in mints if m))
+
+    async def one(batch: Sequence[str]) -> Dict[str, List[int]]:
+        try:
+            results = await arpc_batch([("getTokenLargestAccounts", [m]) for m in batch], api_key=api_key)
+        except Exception as e:
+            logger.warning("helius getTokenLargestAccounts failed n=%s err=%s", len(batch), e)
+            return {}
+        out = {}
+        for mint, result in zip(batch, results):
+            if result is None:
+                continue
+            raw_archive.record("helius", "largest_accounts", mint, result)
+            amounts = []
+            for acc in (result or {}).get("value") or []:
+                try:
+                    amounts.append(int(acc.get("amount")))
+                except (TypeError, ValueError):
+                    pass
+            out[mint] = sorted(amounts, reverse=True)
+        return out
+
+    merged: Dict[str, List[int]] = {}
+    for part in await asyncio.gather(*(one(b) for b in _chunks(mints, MAX_CALLS_PER_BATCH))):
+        merged.update(part)
+    return merged
+
+
+def top_holders_pct(amounts: Sequence[int], supply: int, top: int = TOP_HOLDERS) -> Optional[float]:
+    if not supply or not amounts:
+        return None
+    return round(100.0 * sum(amounts[:top]) / supply, 1)
+
+
+async def aenrichments(mints: Sequence[str], *, api_key: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    {mint: champs d'enrichissement} ; mints inconnus ou en échec → champs None.
+    Lève RpcError si aucun lot getMultipleAccounts n'a répondu (nœud injoignable,
+    clé refusée…) : l'appelant peut alors se replier sur Birdeye.
+    """
+    infos, largest = await asyncio.gather(amint_infos(mints, api_key=api_key),
+                                          alargest_accounts(mints, api_key=api_key))
+    if any(mints) and not infos:
+        if http_client.deadline_passed():
+            raise http_client.DeadlineExceeded(RPC_URL, "POST")
+        raise RpcError(f"getMultipleAccounts: no batch answered for {len(mints)} mints")
+    out = {}
+    for mint in mints:
+        info = infos.get(mint)
+        enrich: Dict[str, Any] = {"holders": None, "exitLiquidity": None,
+                                  "hasMintAuth": info.has_mint_authority if info else None,
+                                  "hasFreezeAuth": info.has_freeze_authority if info else None}
+        pct = top_holders_pct(largest.get(mint) or [], info.supply) if info else None
+        if pct is not None:
+            enrich["notes"] = f"top{TOP_HOLDERS}Holders={pct}%"
+        elif mint not in infos and http_client.deadline_passed():
+            enrich["notes"] = "deadline_skipped=hasMintAuth,hasFreezeAuth"
+        out[mint] = enrich
+    return out
+
+
+def enrichments(mints: Sequence[str], *, api_key: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    return http_client.run(aenrichments(mints, api_key=api_key))
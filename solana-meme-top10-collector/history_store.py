@@ -0,0 +1,219 @@
+"""
+Historique compacté des top10 quotidiens (SQLite indexé)
+
+- compact : ajoute au store les CSV data/top10_*.csv et archive/**/*.csv pas encore
+  ingérés. Incrémental : chaque fichier est identifié par son chemin relatif à la
+  racine du collecteur + son hash de contenu ; un fichier modifié remplace ses
+  anciennes lignes, un fichier déjà vu est ignoré. Un fichier déplacé par archive.yml
+  (même nom, même contenu, ancien chemin disparu) est renommé sans ré-ingestion ; deux
+  fichiers homonymes de contenus différents (data/ et archive/) restent deux sources.
+- Index sur tokenAddress et date : « combien de jours le token X a-t-il été dans
+  le top10 » devient une seule lecture indexée, sans re-parser des centaines de CSV.
+
+Usage :
+    python history_store.py compact [--db archive/history.sqlite] [CSV ...]
+    python history_store.py days <tokenAddress> [--db ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import glob
+import hashlib
+import logging
+import os
+import sqlite3
+import subprocess
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from normalize import to_float
+from records import FIELDS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB = os.path.join("archive", "history.sqlite")
+DEFAULT_CHAIN = "solana"  # CSV d'avant la colonne chain renseignée
+DEFAULT_GLOBS = (os.path.join("data", "top10_*.csv"), os.path.join("archive", "**", "*.csv"))
+
+COLUMNS = list(FIELDS)
+REAL_COLUMNS = {"priceUsd", "liquidityUsd", "volume24hUsd", "priceChange24h",
+                "earlyReturnMultiple", "exitLiquidity"}
+INT_COLUMNS = {"txns24h", "createdAt", "holders"}
+BOOL_COLUMNS = {"hasMintAuth", "hasFreezeAuth"}
+
+_SQL_TYPES = {**{c: "REAL" for c in REAL_COLUMNS}, **{c: "INTEGER" for c in INT_COLUMNS | BOOL_COLUMNS}}
+
+
+def _convert(column: str, value: Any) -> Any:
+    if value is None or value == "":
+        return None
+    if column in REAL_COLUMNS:
+        return to_float(value)
+    if column in INT_COLUMNS:
+        num = to_float(value)
+        return int(num) if num is not None else None
+    if column in BOOL_COLUMNS:
+        text = str(value).strip().lower()
+        return 1 if text in ("true", "1") else 0 if text in ("false", "0") else None
+    return value
+
+
+def connect(db_path: str = DEFAULT_DB) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    db = sqlite3.connect(db_path)
+    cols = ", ".join(f'"{c}" {_SQL_TYPES.get(c, "TEXT")}' for c in COLUMNS)
+    db.executescript(
+        f"CREATE TABLE IF NOT EXISTS top10 ({cols}, source TEXT NOT NULL);"
+        "CREATE INDEX IF NOT EXISTS top10_token_date ON top10 (tokenAddress, date);"
+        "CREATE INDEX IF NOT EXISTS top10_date ON top10 (date);"
+        "CREATE INDEX IF NOT EXISTS top10_source ON top10 (source);"
+        "CREATE TABLE IF NOT EXISTS ingested (source TEXT PRIMARY KEY, sha256 TEXT NOT NULL,"
+        " rows INTEGER NOT NULL, path TEXT NOT NULL);"
+    )
+    _migrate_sources(db)
+    return db
+
+
+def source_key(path: str) -> str:
+    """Chemin relatif à la racine du collecteur (répertoire courant), séparateurs « / »."""
+    return os.path.relpath(path).replace(os.sep, "/")
+
+
+def _migrate_sources(db: sqlite3.Connection) -> None:
+    # anciens stores : source = nom de fichier seul → chemin relatif enregistré
+    legacy = db.execute("SELECT source, path FROM ingested WHERE source NOT LIKE '%/%'").fetchall()
+    with db:
+        for source, path in legacy:
+            new = source_key(path)
+            if new != source:
+                db.execute("UPDATE top10 SET source = ? WHERE source = ?", (new, source))
+                db.execute("UPDATE ingested SET source = ? WHERE source = ?", (new, source))
+
+
+def _rename(db: sqlite3.Connection, old: str, new: str, path: str) -> None:
+    with db:
+        db.execute("UPDATE top10 SET source = ? WHERE source = ?", (new, old))
+        db.execute("UPDATE ingested SET source = ?, path = ? WHERE source = ?", (new, path, old))
+
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def git_blob_ids(pathspecs: Iterable[str] = ("data", "archive")) -> Dict[str, str]:
+    """
+    {source_key : id de blob git} des fichiers suivis et non modifiés, sans lire leur
+    contenu (l'index git le connaît déjà) ; {} hors dépôt git ou sans git.
+    """
+    specs = ["--", *pathspecs]
+    try:
+        staged = subprocess.run(["git", "ls-files", "-s", "-z", *specs], capture_output=True, check=True).stdout
+        modified = subprocess.run(["git", "ls-files", "-m", "-z", *specs], capture_output=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return {}
+    dirty = set(modified.decode("utf-8", "replace").split("\0"))
+    out = {}
+    for entry in staged.decode("utf-8", "replace").split("\0"):
+        meta, _, path = entry.partition("\t")
+        if path and path not in dirty:
+            out[path] = meta.split()[1]
+    return out
+
+
+def content_id(path: str, blobs: Optional[Dict[str, str]] = None) -> str:
+    """Identifiant de contenu : blob git si le fichier est suivi et propre, sinon SHA-256."""
+    blob = (blobs or {}).get(source_key(path))
+    return f"git:{blob}" if blob else file_sha256(path)
+
+
+def _rows(path: str, source: str) -> Iterable[Tuple[Any, ...]]:
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            yield tuple(_convert(c, row.get(c)) for c in COLUMNS) + (source,)
+
+
+def find_csvs(patterns: Iterable[str] = DEFAULT_GLOBS) -> List[str]:
+    paths = set()
+    for pattern in patterns:
+        paths.update(glob.glob(pattern, recursive=True))
+    return sorted(p for p in paths if os.path.basename(p).startswith("top10_"))
+
+
+def compact(paths: Optional[Iterable[str]] = None, db_path: str = DEFAULT_DB) -> Dict[str, int]:
+    """Ingère les CSV nouveaux ou modifiés. Renvoie {"files": n, "rows": n, "skipped": n}."""
+    stats = {"files": 0, "rows": 0, "skipped": 0}
+    placeholders = ", ".join("?" for _ in range(len(COLUMNS) + 1))
+    quoted = ", ".join(f'"{c}"' for c in COLUMNS)
+    db = connect(db_path)
+    try:
+        for path in find_csvs() if paths is None else sorted(paths):
+            source, digest = source_key(path), file_sha256(path)
+            known = db.execute("SELECT sha256 FROM ingested WHERE source = ?", (source,)).fetchone()
+            if known is not None and known[0] == digest:
+                stats["skipped"] += 1
+                continue
+            if known is None:
+                # même contenu déjà ingéré sous un homonyme : déplacé → renommé, copie → ignorée
+                twins = [s for (s,) in db.execute("SELECT source FROM ingested WHERE sha256 = ?", (digest,))
+                         if s.rsplit("/", 1)[-1] == os.path.basename(path)]
+                if twins:
+                    gone = [s for s in twins if not os.path.exists(s)]
+                    if gone:
+                        _rename(db, gone[0], source, path)
+                    stats["skipped"] += 1
+                    continue
+            with db:
+                db.execute("DELETE FROM top10 WHERE source = ?", (source,))
+                cur = db.executemany(f"INSERT INTO top10 ({quoted}, source) VALUES ({placeholders})", _rows(path, source))
+                db.execute(
+                    "INSERT OR REPLACE INTO ingested (source, sha256, rows, path) VALUES (?, ?, ?, ?)",
+                    (source, digest, cur.rowcount, path),
+                )
+            stats["files"] += 1
+            stats["rows"] += max(cur.rowcount, 0)
+    finally:
+        db.close()
+    logger.info("history compact files=%s rows=%s skipped=%s", stats["files"], stats["rows"], stats["skipped"])
+    return stats
+
+
+def days_in_top10(token_address: str, db_path: str = DEFAULT_DB, chain: str = DEFAULT_CHAIN) -> int:
+    """Jours distincts dans le top10 de `chain` (une adresse EVM peut exister sur plusieurs chaînes)."""
+    db = connect(db_path)
+    try:
+        # lignes d'avant la colonne chain renseignée : Solana
+        (n,) = db.execute(
+            "SELECT COUNT(DISTINCT date) FROM top10 WHERE tokenAddress = ? AND COALESCE(NULLIF(chain, ''), ?) = ?",
+            (token_address, DEFAULT_CHAIN, chain or DEFAULT_CHAIN),
+        ).fetchone()
+        return n
+    finally:
+        db.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="Historique compacté des top10 quotidiens")
+    ap.add_argument("--db", default=DEFAULT_DB)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p_compact = sub.add_parser("compact", help="ingérer les CSV nouveaux ou modifiés")
+    p_compact.add_argument("paths", nargs="*", help="CSV à ingérer (défaut : data/ + archive/)")
+    p_days = sub.add_parser("days", help="nombre de jours où un token était dans le top10")
+    p_days.add_argument("token")
+    p_days.add_argument("--chain", default=DEFAULT_CHAIN)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "compact":
+        stats = compact(args.paths or None, db_path=args.db)
+        print(f"compacted files={stats['files']} rows={stats['rows']} skipped={stats['skipped']}")
+    else:
+        print(days_in_top10(args.token, db_path=args.db, chain=args.chain.strip().lower()))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
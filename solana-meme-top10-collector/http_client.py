@@ -0,0 +1,290 @@
+"""
+Moteur HTTP partagé — utilisé par collector, dexscreener_client et utils
+
+- Une seule requests.Session : connexions keep-alive réutilisées (pool HTTPAdapter),
+  plus de handshake TCP+TLS à chaque appel.
+- API asyncio : `await aget_json(url, ...)` / `await apost_json(url, body)` (JSON-RPC).
+  Les coroutines tournent sur une boucle
+  d'événements de fond partagée ; le code synchrone passe par `get_json(...)` /
+  `run(coro)`, ce qui permet aux appels DexScreener et Birdeye de se chevaucher.
+- Limite de requêtes simultanées par hôte (HTTP_MAX_PER_HOST) et débit lissé par
+  hôte (rate_limit : token bucket DexScreener/Birdeye).
+- Décodage JSON via fastjson (orjson/msgspec si installés, sinon json).
+- Retry/backoff unique : 429/5xx + erreurs réseau, attente 1s, 2s, 4s, 8s…
+  sauf si le serveur donne Retry-After / X-RateLimit-Reset, qui priment.
+- Chaque tentative est comptée par hôte dans metrics (requêtes, retries, 429, octets).
+- La query string (clé d'API Helius : ?api-key=…) n'apparaît jamais dans les logs
+  ni dans les messages d'HttpError (redact).
+- Échéance globale du run (set_deadline) : timeout de chaque tentative, attentes de
+  backoff / rate limit et pont synchrone bornés par le temps restant ; une requête
+  qui déborderait lève DeadlineExceeded au lieu d'attendre.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import functools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Coroutine, Dict, Optional, TypeVar
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import fastjson
+import metrics
+import rate_limit
+
+logger = logging.getLogger(__name__)
+T = TypeVar("T")
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+BACKOFF_BASE = 1.0
+DEFAULT_RETRIES = 4
+MAX_PER_HOST = max(1, int(os.getenv("HTTP_MAX_PER_HOST", "4") or 4))
+POOL_SIZE = max(MAX_PER_HOST, int(os.getenv("HTTP_POOL_SIZE", "16") or 16))
+
+
+def redact(url: str) -> str:
+    """URL sans query string (qui peut porter une clé d'API)."""
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, "", "")) if parts.query else url
+
+
+def _scrub(text: str, url: str) -> str:
+    """Retire la query string de `url` d'un message (les erreurs requests la recopient)."""
+    query = urlsplit(url).query
+    return text.replace(query, "<redacted>") if query else text
+
+
+class HttpError(RuntimeError):
+    """Échec définitif d'une requête (après retries, ou statut non rejouable)."""
+
+    def __init__(self, url: str, message: str, status: Optional[int] = None, method: str = "GET"):
+        super().__init__(f"{method} {redact(url)} failed: {_scrub(message, url)}")
+        self.url = redact(url)
+        self.status = status
+
+
+class DeadlineExceeded(HttpError):
+    """L'échéance du run est atteinte (ou le serait avant la fin de la requête)."""
+
+    def __init__(self, url: str, method: str = "GET"):
+        super().__init__(url, "run deadline exceeded", None, method)
+
+
+# --- Échéance du run (une seule par process, comme metrics.RUN) -------------------
+_deadline: Optional[float] = None
+# délai minimal pour qu'une tentative vaille la peine d'être lancée
+MIN_ATTEMPT_S = 0.05
+
+
+def set_deadline(seconds: Optional[float]) -> None:
+    """Échéance dans `seconds` secondes (None : aucune)."""
+    global _deadline
+    _deadline = None if seconds is None else time.monotonic() + max(0.0, seconds)
+
+
+def remaining() -> Optional[float]:
+    """Secondes avant l'échéance (peut être négatif) ; None sans échéance."""
+    deadline = _deadline
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def deadline_passed() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+# --- État partagé (session, boucle de fond, sémaphores par hôte) ---------------
+_lock = threading.Lock()
+_session_obj: Optional[requests.Session] = None
+_loop_obj: Optional[asyncio.AbstractEventLoop] = None
+_executor: Optional[ThreadPoolExecutor] = None
+_host_slots: Dict[str, asyncio.Semaphore] = {}
+
+
+def _session() -> requests.Session:
+    global _session_obj
+    with _lock:
+        if _session_obj is None:
+            s = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            _session_obj = s
+    return _session_obj
+
+
+def _loop() -> asyncio.AbstractEventLoop:
+    global _loop_obj, _executor
+    with _lock:
+        if _loop_obj is None:
+            loop = asyncio.new_event_loop()
+            _executor = ThreadPoolExecutor(max_workers=POOL_SIZE, thread_name_prefix="http")
+            loop.set_default_executor(_executor)
+            threading.Thread(target=loop.run_forever, name="http-loop", daemon=True).start()
+            _loop_obj = loop
+    return _loop_obj
+
+
+def _reset_after_fork() -> None:
+    # la boucle de fond ne survit pas à un fork : le process enfant repart de zéro
+    global _session_obj, _loop_obj, _executor, _lock
+    _lock = threading.Lock()
+    _session_obj = None
+    _loop_obj = None
+    _executor = None
+    _host_slots.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _host_slot(url: str) -> asyncio.Semaphore:
+    # appelé uniquement depuis la boucle de fond → pas de verrou nécessaire
+    host = urlsplit(url).netloc
+    slot = _host_slots.get(host)
+    if slot is None:
+        slot = _host_slots[host] = asyncio.Semaphore(MAX_PER_HOST)
+    return slot
+
+
+async def _sleep(seconds: float) -> None:
+    await asyncio.sleep(seconds)
+
+
+def backoff_delay(attempt: int) -> float:
+    """Délai avant la tentative `attempt + 1` (attempt commence à 0)."""
+    return BACKOFF_BASE * (2 ** attempt)
+
+
+def _budget(url: str, method: str, wait: float = 0.0) -> Optional[float]:
+    """Temps restant après `wait` secondes ; lève DeadlineExceeded s'il n'en reste pas assez."""
+    left = remaining()
+    if left is None:
+        return None
+    if left - wait < MIN_ATTEMPT_S:
+        metrics.incr("deadline_exceeded")
+        raise DeadlineExceeded(url, method)
+    return left - wait
+
+
+async def _pace(url: str, method: str = "GET") -> None:
+    # jeton du token bucket, puis attente d'une éventuelle pause Retry-After
+    wait = rate_limit.reserve(url)
+    while wait > 0:
+        _budget(url, method, wait)
+        await _sleep(wait)
+        wait = rate_limit.blocked_for(url)
+
+
+class AttemptTiming:
+    """
+    Chronométrage réseau d'une requête, hors attentes de rate limit et de slot :
+    `started` est levé quand la 1re tentative part, `seconds` vaut la durée de la
+    dernière tentative ayant obtenu une réponse (None sinon).
+    """
+
+    def __init__(self) -> None:
+        self.started = asyncio.Event()
+        self.seconds: Optional[float] = None
+
+
+# --- API asyncio -------------------------------------------------------------------
+async def aget_json(url: str, *, headers: Optional[Dict[str, str]] = None,
+                    params: Optional[Dict[str, Any]] = None, timeout: float = 20,
+                    retries: int = DEFAULT_RETRIES, timing: Optional[AttemptTiming] = None) -> Any:
+    """GET JSON avec retries sur 429/5xx et erreurs réseau. Lève HttpError."""
+    request = functools.partial(_session().get, url, headers=headers or {}, params=params or {})
+    return await _arequest_json("GET", url, request, timeout, retries, timing)
+
+
+async def apost_json(url: str, body: Any, *, headers: Optional[Dict[str, str]] = None,
+                     timeout: float = 20, retries: int = DEFAULT_RETRIES) -> Any:
+    """POST d'un corps JSON (JSON-RPC), mêmes retries / limites que aget_json."""
+    request = functools.partial(_session().post, url, json=body, headers=headers or {})
+    return await _arequest_json("POST", url, request, timeout, retries)
+
+
+async def _arequest_json(method: str, url: str, request: Any, timeout: float, retries: int,
+                         timing: Optional[AttemptTiming] = None) -> Any:
+    loop = asyncio.get_running_loop()
+    host = urlsplit(url).hostname or ""
+    last_err = "unknown"
+    last_status: Optional[int] = None
+    delay = 0.0
+    for attempt in range(max(1, retries)):
+        if attempt:
+            _budget(url, method, delay)
+            await _sleep(delay)
+        await _pace(url, method)
+        metrics.http(host, requests=1, retries=1 if attempt else 0)
+        try:
+            async with _host_slot(url):
+                left = _budget(url, method)  # après l'attente d'un slot
+                call = functools.partial(request, timeout=timeout if left is None else min(timeout, left))
+                if timing is not None:
+                    timing.started.set()
+                sent = time.monotonic()
+                r = await loop.run_in_executor(None, call)
+                if timing is not None:
+                    timing.seconds = time.monotonic() - sent
+        except DeadlineExceeded:
+            raise
+        except Exception as e:  # réseau, timeouts, etc.
+            last_err, last_status = _scrub(str(e), url), None
+            delay = backoff_delay(attempt)
+            metrics.http(host, errors=1)
+            logger.warning("http error attempt=%s url=%s err=%s", attempt, redact(url), last_err)
+            continue
+        metrics.http(host, bytes=len(getattr(r, "content", b"") or b""),
+                     status_429=1 if r.status_code == 429 else 0)
+        hint = rate_limit.observe(url, r.status_code, getattr(r, "headers", None))
+        if r.status_code in RETRY_STATUSES:
+            last_err, last_status = f"status {r.status_code}", r.status_code
+            delay = hint if hint is not None else backoff_delay(attempt)
+            logger.warning("http retry=%s status=%s url=%s", attempt, r.status_code, redact(url))
+            continue
+        if r.status_code >= 400:
+            raise HttpError(url, f"status {r.status_code}", r.status_code, method)
+        try:
+            # décodage hors de la boucle : un gros payload ne bloque pas les autres requêtes
+            return await loop.run_in_executor(None, fastjson.loads, r.content)
+        except ValueError as e:
+            raise HttpError(url, f"invalid JSON: {e}", r.status_code, method) from e
+    if deadline_passed():
+        raise DeadlineExceeded(url, method)
+    raise HttpError(url, f"after {retries} attempts: {last_err}", last_status, method)
+
+
+# --- Pont synchrone ----------------------------------------------------------------
+def run(coro: Coroutine[Any, Any, T]) -> T:
+    """Exécute une coroutine sur la boucle partagée et attend son résultat."""
+    loop = _loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        raise RuntimeError("http_client.run() appelé depuis la boucle HTTP : utiliser await")
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    left = remaining()
+    try:
+        # marge d'1 s : les requêtes sont déjà bornées, on n'attend pas au-delà
+        return future.result(timeout=None if left is None else max(0.0, left) + 1.0)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        metrics.incr("deadline_exceeded")
+        raise DeadlineExceeded("run()") from None
+
+
+def get_json(url: str, **kwargs: Any) -> Any:
+    """Version synchrone de aget_json (mêmes paramètres)."""
+    return run(aget_json(url, **kwargs))
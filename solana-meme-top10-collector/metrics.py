@@ -0,0 +1,125 @@
+"""
+Métriques d'un run — durées par étape, compteurs HTTP par hôte, cache
+
+- stage(name) : chronomètre une étape (fetch, normalise, rank, enrich, write…) ;
+  une étape répétée cumule ses durées.
+- http(host, …) : requêtes, retries, 429, erreurs réseau, octets téléchargés,
+  alimenté par http_client à chaque tentative.
+- incr(name) : compteurs libres (cache Birdeye : hits / misses / expirés / stale servis).
+- write_summary() → data/run_summary.json ; write_prometheus() → textfile
+  node_exporter si METRICS_PROM_FILE est défini.
+
+Thread-safe : la boucle HTTP de fond et les workers d'enrichissement écrivent ici.
+"""
+
+from __future__ import annotations
+
+import collections
+import contextlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+
+HTTP_FIELDS = ("requests", "retries", "status_429", "errors", "bytes")
+PROM_PREFIX = "top10"
+
+
+class RunMetrics:
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = self.clock()
+            self.stages: Dict[str, float] = {}
+            self.hosts: Dict[str, collections.Counter] = {}
+            self.counters: collections.Counter = collections.Counter()
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        t0 = self.clock()
+        try:
+            yield
+        finally:
+            self.add_time(name, self.clock() - t0)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def http(self, host: str, **deltas: int) -> None:
+        with self._lock:
+            counter = self.hosts.setdefault(host or "unknown", collections.Counter())
+            counter.update(deltas)
+
+    def incr(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.counters["cache_hits"]
+            lookups = hits + self.counters["cache_misses"] + self.counters["cache_expired"]
+            return {
+                "duration_s": round(self.clock() - self.started, 6),
+                "stages_s": {k: round(v, 6) for k, v in self.stages.items()},
+                "http": {h: {f: c[f] for f in HTTP_FIELDS} for h, c in sorted(self.hosts.items())},
+                "counters": dict(sorted(self.counters.items())),
+                "cache_hit_rate": round(hits / lookups, 4) if lookups else None,
+            }
+
+
+RUN = RunMetrics()
+
+# raccourcis sur les métriques du run courant
+reset = RUN.reset
+stage = RUN.stage
+http = RUN.http
+incr = RUN.incr
+snapshot = RUN.snapshot
+
+
+def _atomic_write(path: str, text: str) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def write_summary(path: str, metrics: Optional[RunMetrics] = None, **fields: Any) -> Dict[str, Any]:
+    """Écrit `fields` + le snapshot des métriques en JSON ; renvoie le dict écrit."""
+    summary = {**fields, **(metrics or RUN).snapshot()}
+    _atomic_write(path, json.dumps(summary, indent=2, default=str) + "\n")
+    return summary
+
+
+def _label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def prometheus_text(summary: Dict[str, Any]) -> str:
+    """Format texte Prometheus (collecteur textfile de node_exporter)."""
+    p = PROM_PREFIX
+    lines = [f"# TYPE {p}_run_duration_seconds gauge", f"{p}_run_duration_seconds {summary['duration_s']}"]
+    lines.append(f"# TYPE {p}_stage_duration_seconds gauge")
+    lines += [f'{p}_stage_duration_seconds{{stage="{_label(k)}"}} {v}' for k, v in summary["stages_s"].items()]
+    for field in HTTP_FIELDS:
+        lines.append(f"# TYPE {p}_http_{field}_total counter")
+        lines += [f'{p}_http_{field}_total{{host="{_label(h)}"}} {c[field]}' for h, c in summary["http"].items()]
+    for name, value in summary["counters"].items():
+        lines += [f"# TYPE {p}_{name}_total counter", f"{p}_{name}_total {value}"]
+    if summary.get("cache_hit_rate") is not None:
+        lines += [f"# TYPE {p}_cache_hit_ratio gauge", f"{p}_cache_hit_ratio {summary['cache_hit_rate']}"]
+    for name in ("pairs_fetched", "pairs_ranked"):
+        if isinstance(summary.get(name), (int, float)):
+            lines += [f"# TYPE {p}_{name} gauge", f"{p}_{name} {summary[name]}"]
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path: str, summary: Optional[Dict[str, Any]] = None) -> None:
+    _atomic_write(path, prometheus_text(summary or RUN.snapshot()))
@@ -0,0 +1,88 @@
+"""
+Normalisation DexScreener en une passe
+
+- pair_record(p) : un dict de paire brut → PairRecord, chaque sous-objet
+  (baseToken, liquidity, txns, volume, priceChange) lu une seule fois, conversions
+  numériques avec fast-path pour les float/int déjà décodés.
+- records_from_payload(raw) : bytes d'une réponse /latest/dex/search → PairRecord
+  (décodage fastjson, filtre de chaîne, normalisation) en un seul parcours.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, Optional, Union
+
+import fastjson
+from records import PairRecord
+
+_EMPTY: Dict[str, Any] = {}
+
+
+def to_float(value: Any) -> Optional[float]:
+    """float, ou None si absent/illisible."""
+    t = type(value)
+    if t is float:
+        return value
+    if t is int:
+        return float(value)
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def to_int(value: Any) -> int:
+    if type(value) is int:
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _h24(value: Any) -> Any:
+    return value.get("h24") if isinstance(value, dict) else value
+
+
+def pair_record(p: Dict[str, Any], chain: str = "solana") -> PairRecord:
+    get = p.get
+    base = get("baseToken") or _EMPTY
+    liq = get("liquidity")
+    vol = get("volume24hUsd")
+    if vol is None:
+        vol = _h24(get("volume"))
+    txns = _h24(get("txns"))
+    if isinstance(txns, dict):
+        txns24h = to_int(txns.get("buys")) + to_int(txns.get("sells"))
+    else:
+        txns24h = to_int(txns)
+    return PairRecord(
+        chain=get("chainId") or get("chain") or chain,
+        baseToken=base.get("name") or "",
+        baseSymbol=base.get("symbol") or "",
+        pairAddress=get("pairAddress") or get("pairId") or "",
+        tokenAddress=base.get("address") or "",
+        priceUsd=to_float(get("priceUsd")),
+        liquidityUsd=to_float(liq.get("usd") if isinstance(liq, dict) else liq),
+        volume24hUsd=to_float(vol),
+        txns24h=txns24h,
+        priceChange24h=to_float(_h24(get("priceChange"))),
+        createdAt=get("pairCreatedAt") or get("createdAt"),
+    )
+
+
+def pairs_of(data: Any) -> list:
+    if not isinstance(data, dict):
+        return []
+    return data.get("pairs") or data.get("result") or []
+
+
+def records_from_payload(raw: Union[bytes, str, Dict[str, Any]], chain: Optional[str] = "solana") -> Iterator[PairRecord]:
+    """Décode (si besoin) puis normalise les paires de `chain` (None : toutes)."""
+    data = fastjson.loads(raw) if isinstance(raw, (bytes, bytearray, memoryview, str)) else raw
+    for p in pairs_of(data):
+        pair_chain = p.get("chainId") or p.get("chain") or chain
+        if chain is None or str(pair_chain).lower() == chain:
+            yield pair_record(p, chain or "solana")
@@ -0,0 +1,144 @@
+"""
+Index des prix « first seen » par token → earlyReturnMultiple
+
+- Table SQLite clé primaire (chain, tokenAddress) : 1re apparition (prix, createdAt,
+  instant), lookup direct par clé, sans relire l'historique ni appeler d'API. Une
+  même adresse EVM sur deux chaînes a deux prix first-seen distincts.
+- Construit depuis data/top10_*.csv, archive/**/*.csv et data/intraday_*.csv, puis
+  mis à jour de façon incrémentale sans relire l'historique : un fichier de même
+  taille et même mtime qu'à son ingestion est ignoré sans être ouvert ; sinon son
+  identifiant de contenu (blob git s'il est suivi et propre — cas d'un checkout CI
+  frais, où les mtimes changent —, SHA-256 sinon) décide. Chaque run ajoute ses
+  propres lignes via observe().
+- earlyReturnMultiple = prix actuel / prix à la 1re apparition.
+
+Fichier : PRICE_INDEX_PATH (défaut .cache/price_index.sqlite) ; PRICE_INDEX=0 désactive.
+"""
+
+from __future__ import annotations
+
+import csv
+import glob
+import logging
+import os
+import sqlite3
+from typing import Any, Iterable, NamedTuple, Optional
+
+from history_store import DEFAULT_GLOBS, content_id, find_csvs, git_blob_ids, source_key
+from normalize import to_float
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.path.join(".cache", "price_index.sqlite")
+INTRADAY_GLOB = os.path.join("data", "intraday_*.csv")
+DEFAULT_CHAIN = "solana"  # CSV d'avant la colonne chain renseignée
+# backfill : plusieurs process écrivent dans le même index → attente du verrou SQLite
+BUSY_TIMEOUT_S = 30.0
+
+
+class FirstSeen(NamedTuple):
+    price: float
+    createdAt: Optional[int]
+    seenAt: str
+
+
+class PriceIndex:
+    def __init__(self, path: str = DEFAULT_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path, timeout=BUSY_TIMEOUT_S)
+        columns = {row[1] for row in self.db.execute("PRAGMA table_info(first_seen)")}
+        if columns and "chain" not in columns:
+            # index d'avant la clé par chaîne : reconstruit depuis les CSV
+            self.db.executescript("DROP TABLE first_seen; DROP TABLE IF EXISTS ingested;")
+        self.db.executescript(
+            "CREATE TABLE IF NOT EXISTS first_seen (chain TEXT NOT NULL, tokenAddress TEXT NOT NULL,"
+            " price REAL NOT NULL, createdAt INTEGER, seenAt TEXT NOT NULL, PRIMARY KEY (chain, tokenAddress));"
+            "CREATE TABLE IF NOT EXISTS ingested (source TEXT PRIMARY KEY, sha256 TEXT NOT NULL,"
+            " size INTEGER, mtime INTEGER);"
+        )
+        columns = {row[1] for row in self.db.execute("PRAGMA table_info(ingested)")}
+        for col in ("size", "mtime"):
+            if col not in columns:  # index créé avant le raccourci (taille, mtime)
+                self.db.execute(f"ALTER TABLE ingested ADD COLUMN {col} INTEGER")
+
+    def _upsert(self, chain: Any, token: Any, price: Any, created_at: Any, seen_at: str) -> None:
+        price = to_float(price)
+        if not token or price is None or price <= 0 or price != price:
+            return
+        created = to_float(created_at)
+        # on ne garde que l'apparition la plus ancienne
+        self.db.execute(
+            "INSERT INTO first_seen (chain, tokenAddress, price, createdAt, seenAt) VALUES (?, ?, ?, ?, ?)"
+            " ON CONFLICT(chain, tokenAddress) DO UPDATE SET price = excluded.price,"
+            " createdAt = excluded.createdAt, seenAt = excluded.seenAt"
+            " WHERE excluded.seenAt < first_seen.seenAt",
+            (chain or DEFAULT_CHAIN, token, price, int(created) if created is not None else None, seen_at),
+        )
+
+    def ingest(self, paths: Optional[Iterable[str]] = None) -> int:
+        """Ingère les CSV nouveaux ou modifiés (défaut : data/, archive/, intraday)."""
+        if paths is None:
+            paths = find_csvs(DEFAULT_GLOBS) + sorted(glob.glob(INTRADAY_GLOB))
+        done = 0
+        blobs: Optional[dict] = None  # ls-files seulement si un stat ne correspond pas
+        for path in paths:
+            source, st = source_key(path), os.stat(path)
+            known = self.db.execute("SELECT sha256, size, mtime FROM ingested WHERE source = ?", (source,)).fetchone()
+            if known is not None and (known[1], known[2]) == (st.st_size, st.st_mtime_ns):
+                continue
+            if blobs is None:
+                blobs = git_blob_ids()
+            digest = content_id(path, blobs)
+            record = (source, digest, st.st_size, st.st_mtime_ns)
+            if known is not None and known[0] == digest:
+                with self.db:
+                    self.db.execute("INSERT OR REPLACE INTO ingested (source, sha256, size, mtime) VALUES (?, ?, ?, ?)",
+                                    record)
+                continue
+            with self.db, open(path, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    seen_at = row.get("snapshotAt") or row.get("date") or ""
+                    if seen_at:
+                        self._upsert(row.get("chain"), row.get("tokenAddress"), row.get("priceUsd"),
+                                     row.get("createdAt"), seen_at)
+                self.db.execute("INSERT OR REPLACE INTO ingested (source, sha256, size, mtime) VALUES (?, ?, ?, ?)",
+                                record)
+            done += 1
+        if done:
+            logger.info("price index ingested files=%s", done)
+        return done
+
+    def observe(self, rows: Iterable[Any], seen_at: str) -> None:
+        """Ajoute les lignes du run courant (dicts ou PairRecord)."""
+        with self.db:
+            for row in rows:
+                self._upsert(row.get("chain"), row.get("tokenAddress"), row.get("priceUsd"),
+                             row.get("createdAt"), seen_at)
+
+    def first_seen(self, token_address: str, chain: str = DEFAULT_CHAIN) -> Optional[FirstSeen]:
+        row = self.db.execute(
+            "SELECT price, createdAt, seenAt FROM first_seen WHERE chain = ? AND tokenAddress = ?",
+            (chain or DEFAULT_CHAIN, token_address),
+        ).fetchone()
+        return FirstSeen(*row) if row else None
+
+    def early_return(self, token_address: str, price_usd: Any, chain: str = DEFAULT_CHAIN) -> Any:
+        """Prix actuel / prix first-seen sur la même chaîne, arrondi ; "" si inconnu."""
+        first = self.first_seen(token_address, chain) if token_address else None
+        price = to_float(price_usd)
+        if first is None or price is None or price != price:
+            return ""
+        return round(price / first.price, 6)
+
+    def close(self) -> None:
+        self.db.close()
+
+
+def open_default() -> Optional[PriceIndex]:
+    """Index du process, à jour des CSV présents ; None si PRICE_INDEX=0."""
+    if os.getenv("PRICE_INDEX", "1").strip().lower() in ("0", "false", "no", "off"):
+        return None
+    index = PriceIndex(os.getenv("PRICE_INDEX_PATH", "") or DEFAULT_PATH)
+    index.ingest()
+    return index
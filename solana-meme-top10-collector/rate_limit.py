@@ -0,0 +1,173 @@
+"""
+Limiteur de débit par hôte (token bucket) — consulté par http_client avant chaque requête
+
+- Un seau par hôte connu : api.dexscreener.com, public-api.birdeye.so et
+  mainnet.helius-rpc.com, débits configurables via DEXSCREENER_RPS / DEXSCREENER_BURST,
+  BIRDEYE_RPS / BIRDEYE_BURST et HELIUS_RPS / HELIUS_BURST.
+  Les hôtes inconnus ne sont pas limités.
+- Réservation sans verrou asynchrone : chaque requête prend un jeton (le solde peut
+  devenir négatif) et reçoit le délai à attendre → débit lissé même en concurrence.
+- Les réponses sont observées : Retry-After (secondes ou date HTTP) et
+  X-RateLimit-Remaining / X-RateLimit-Reset mettent le seau en pause pour tout l'hôte.
+"""
+
+from __future__ import annotations
+
+import email.utils
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Retry-After plafonné pour qu'un en-tête aberrant ne bloque pas le run
+MAX_PAUSE_S = 30.0
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+# hôte → (jetons/seconde, rafale)
+RATE_LIMITS: Dict[str, Tuple[float, float]] = {
+    # DexScreener : 300 req/min sur search/pairs
+    "api.dexscreener.com": (_env_float("DEXSCREENER_RPS", 5.0), _env_float("DEXSCREENER_BURST", 10.0)),
+    "public-api.birdeye.so": (_env_float("BIRDEYE_RPS", 10.0), _env_float("BIRDEYE_BURST", 10.0)),
+    # Helius (plan gratuit : 10 req/s RPC)
+    "mainnet.helius-rpc.com": (_env_float("HELIUS_RPS", 10.0), _env_float("HELIUS_BURST", 10.0)),
+}
+
+
+class TokenBucket:
+    """Seau à jetons : `rate` jetons/s, capacité `burst`, pausable (Retry-After)."""
+
+    def __init__(self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = max(rate, 1e-6)
+        self.capacity = max(burst, 1.0)
+        self.tokens = self.capacity
+        self.clock = clock
+        self.updated = clock()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def reserve(self) -> float:
+        """Prend un jeton et renvoie le délai (s) avant de pouvoir envoyer."""
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            self.tokens -= 1.0
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.blocked_until - now)
+
+    def blocked_for(self) -> float:
+        """Temps restant d'une pause imposée par le serveur (0 si aucune)."""
+        with self._lock:
+            return max(0.0, self.blocked_until - self.clock())
+
+    def pause(self, seconds: float) -> None:
+        """Suspend l'hôte `seconds` secondes et vide la rafale disponible."""
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            self.blocked_until = max(self.blocked_until, now + min(seconds, MAX_PAUSE_S))
+            self.tokens = min(self.tokens, 0.0)
+
+
+_lock = threading.Lock()
+_buckets: Dict[str, TokenBucket] = {}
+
+
+def bucket_for(url: str) -> Optional[TokenBucket]:
+    host = urlsplit(url).hostname or ""
+    limits = RATE_LIMITS.get(host)
+    if limits is None:
+        return None
+    with _lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            bucket = _buckets[host] = TokenBucket(*limits)
+    return bucket
+
+
+def reserve(url: str) -> float:
+    bucket = bucket_for(url)
+    return bucket.reserve() if bucket is not None else 0.0
+
+
+def blocked_for(url: str) -> float:
+    bucket = bucket_for(url)
+    return bucket.blocked_for() if bucket is not None else 0.0
+
+
+def _header(headers: Mapping[str, Any], *names: str) -> Optional[str]:
+    lowered = {str(k).lower(): v for k, v in headers.items()}
+    for name in names:
+        value = lowered.get(name)
+        if value not in (None, ""):
+            return str(value)
+    return None
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Retry-After : nombre de secondes ou date HTTP → secondes (None si illisible)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - (time.time() if now is None else now))
+
+
+def _parse_reset(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    # X-RateLimit-Reset : délai en secondes, ou timestamp epoch (s ou ms)
+    if not value:
+        return None
+    try:
+        reset = float(value)
+    except ValueError:
+        return None
+    if reset > 1e12:
+        reset /= 1000.0
+    if reset > 1e9:
+        reset -= time.time() if now is None else now
+    return max(0.0, reset)
+
+
+def observe(url: str, status: int, headers: Optional[Mapping[str, Any]]) -> Optional[float]:
+    """
+    Lit les en-têtes de quota d'une réponse. Met l'hôte en pause si nécessaire et
+    renvoie le délai conseillé avant de réessayer (None si le serveur n'en donne pas).
+    """
+    headers = headers or {}
+    delay = None
+    if status == 429 or status == 503:
+        delay = parse_retry_after(_header(headers, "retry-after"))
+    remaining = _header(headers, "x-ratelimit-remaining", "ratelimit-remaining")
+    if delay is None and remaining is not None:
+        try:
+            exhausted = float(remaining) <= 0
+        except ValueError:
+            exhausted = False
+        if exhausted or status == 429:
+            delay = _parse_reset(_header(headers, "x-ratelimit-reset", "ratelimit-reset"))
+    if delay is not None:
+        delay = min(delay, MAX_PAUSE_S)
+        bucket = bucket_for(url)
+        if bucket is not None and delay > 0:
+            bucket.pause(delay)
+    return delay
@@ -0,0 +1,320 @@
+"""
+Archive brute des réponses API — NDJSON compressé, append-only, un fichier par jour
+
+- Chaque réponse brute (paire DexScreener, réponse Birdeye token_holders /
+  token_security) devient une ligne NDJSON {ts, source, kind, chain, key, data}.
+  Les lignes sont compressées par blocs de RAW_ARCHIVE_BLOCK_RECORDS (défaut 256 :
+  un membre gzip, ou une frame zstd si `zstandard` est installé) ajoutés en fin de
+  <dir>/<date>.ndjson.gz|.zst : un crash ne corrompt jamais les blocs déjà écrits
+  (seul le bloc en cours, encore en mémoire, est perdu).
+- Index <date>.idx (TSV : offset du bloc, longueur, n° de ligne, source, kind,
+  chain, key) : lookup() décompresse uniquement les blocs d'un token.
+- iter_day() relit tout le jour en streaming (sans index), filtrable par source,
+  kind ou chaîne : replays, re-classements et backfill sans réseau.
+- record() ne bloque pas l'appelant (boucle asyncio) : sérialisation, compression
+  et écriture se font dans un thread dédié ; flush() les termine (fin de run).
+
+Dossier : RAW_ARCHIVE_DIR (défaut archive/raw, commité avec les CSV par collect.yml
+pour que le backfill puisse remonter des mois en arrière) ; RAW_ARCHIVE=0 désactive ;
+RAW_ARCHIVE_CODEC=gzip|zstd force le codec ; RAW_ARCHIVE_KEEP_DAYS (défaut 0 :
+tout garder ; 180 dans collect.yml, comme les CSV) purge les jours plus anciens à
+l'ouverture.
+"""
+
+from __future__ import annotations
+
+import atexit
+import datetime
+import glob
+import gzip
+import io
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import fastjson
+
+try:
+    import zstandard as _zstd  # type: ignore
+except ImportError:  # pragma: no cover
+    _zstd = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIR = os.path.join("archive", "raw")
+EXTENSIONS = {"gzip": ".ndjson.gz", "zstd": ".ndjson.zst"}
+INDEX_EXT = ".idx"
+DEFAULT_KEEP_DAYS = 0
+DEFAULT_BLOCK_RECORDS = 256
+
+
+class IndexEntry(NamedTuple):
+    offset: int
+    length: int
+    line: int  # position de l'enregistrement dans son bloc
+    source: str
+    kind: str
+    chain: str
+    key: str
+
+
+def default_codec() -> str:
+    codec = os.getenv("RAW_ARCHIVE_CODEC", "").strip().lower()
+    if codec == "zstd" and _zstd is None:
+        logger.warning("RAW_ARCHIVE_CODEC=zstd but zstandard is not installed; using gzip")
+        return "gzip"
+    if codec in EXTENSIONS:
+        return codec
+    return "zstd" if _zstd is not None else "gzip"
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return _zstd.ZstdCompressor(level=6).compress(data)
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def _decompress(blob: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return _zstd.ZstdDecompressor().decompress(blob)
+    return gzip.decompress(blob)
+
+
+def _field(value: Any) -> str:
+    # TSV : pas de tabulation ni de retour à la ligne dans une clé
+    return str(value or "").replace("\t", " ").replace("\n", " ")
+
+
+def today() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).astimezone().date().isoformat()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+class RawArchive:
+    """Écrivain thread-safe : un fichier de données + un index par jour, écrits par blocs."""
+
+    def __init__(self, directory: str = DEFAULT_DIR, codec: Optional[str] = None,
+                 clock: Any = time.time, block_records: Optional[int] = None):
+        self.directory = directory
+        self.codec = codec or default_codec()
+        self.clock = clock
+        self.block_records = max(1, block_records or _env_int("RAW_ARCHIVE_BLOCK_RECORDS", DEFAULT_BLOCK_RECORDS))
+        self._lock = threading.Lock()
+        self._pending: Dict[str, List[Tuple[str, str]]] = {}  # jour → [(ligne, champs d'index)]
+        os.makedirs(directory, exist_ok=True)
+
+    def data_path(self, date_str: str) -> tuple:
+        """(chemin, codec) : un jour déjà commencé garde son codec."""
+        return find_day(date_str, self.directory) or (
+            os.path.join(self.directory, date_str + EXTENSIONS[self.codec]), self.codec)
+
+    def append(self, source: str, kind: str, key: Any, data: Any, *, chain: str = "solana",
+               date_str: Optional[str] = None, ts: Optional[float] = None) -> None:
+        """Ajoute un enregistrement au bloc en cours ; le bloc est écrit une fois plein."""
+        date_str = date_str or today()
+        line = json.dumps({"ts": round(self.clock() if ts is None else ts, 3), "source": source, "kind": kind,
+                           "chain": chain, "key": key, "data": data}, separators=(",", ":"), default=str) + "\n"
+        entry = "\t".join(_field(v) for v in (source, kind, chain, key))
+        with self._lock:
+            pending = self._pending.setdefault(date_str, [])
+            pending.append((line, entry))
+            if len(pending) >= self.block_records:
+                self._write_block(date_str)
+
+    def flush(self) -> None:
+        """Écrit les blocs incomplets de tous les jours."""
+        with self._lock:
+            for date_str in list(self._pending):
+                self._write_block(date_str)
+
+    def _write_block(self, date_str: str) -> None:
+        pending = self._pending.pop(date_str, None)
+        if not pending:
+            return
+        path, codec = self.data_path(date_str)
+        blob = _compress("".join(line for line, _ in pending).encode("utf-8"), codec)
+        # données d'abord : une entrée d'index pointe toujours vers des octets écrits
+        with open(path, "ab") as f:
+            offset = f.tell()
+            f.write(blob)
+        with open(os.path.join(self.directory, date_str + INDEX_EXT), "a", encoding="utf-8") as f:
+            f.write("".join(f"{offset}\t{len(blob)}\t{i}\t{entry}\n" for i, (_, entry) in enumerate(pending)))
+
+    def prune(self, keep_days: int, *, now: Optional[datetime.date] = None) -> int:
+        """Supprime les jours (données + index) de plus de `keep_days` jours."""
+        cutoff = ((now or datetime.date.today()) - datetime.timedelta(days=keep_days)).isoformat()
+        removed = 0
+        with self._lock:
+            for path in glob.glob(os.path.join(self.directory, "*")):
+                day = os.path.basename(path).split(".", 1)[0]
+                if len(day) == 10 and day < cutoff:
+                    os.remove(path)
+                    removed += 1
+        return removed
+
+
+# --- lecture ---
+
+def find_day(date_str: str, directory: str = DEFAULT_DIR) -> Optional[tuple]:
+    """(chemin, codec) du fichier de données du jour, ou None."""
+    for codec, ext in EXTENSIONS.items():
+        path = os.path.join(directory, date_str + ext)
+        if os.path.exists(path):
+            return path, codec
+    return None
+
+
+def read_index(date_str: str, directory: str = DEFAULT_DIR) -> List[IndexEntry]:
+    try:
+        with open(os.path.join(directory, date_str + INDEX_EXT), encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return []
+    entries = []
+    for line in lines:
+        parts = line.split("\t")
+        if len(parts) == 7:  # dernière ligne tronquée par un crash → ignorée
+            entries.append(IndexEntry(int(parts[0]), int(parts[1]), int(parts[2]), *parts[3:]))
+        elif len(parts) == 6:  # ancien format : un membre par enregistrement
+            entries.append(IndexEntry(int(parts[0]), int(parts[1]), 0, *parts[2:]))
+    return entries
+
+
+def _stream(path: str, codec: str) -> Iterator[bytes]:
+    if codec == "zstd":
+        with open(path, "rb") as raw:
+            reader = _zstd.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+            yield from io.BufferedReader(reader)
+    else:
+        with gzip.open(path, "rb") as f:
+            yield from f
+
+
+def iter_day(date_str: str, directory: str = DEFAULT_DIR, *, source: Optional[str] = None,
+             kind: Optional[str] = None, chain: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Enregistrements du jour dans l'ordre d'écriture, décompressés au fil de l'eau."""
+    found = find_day(date_str, directory)
+    if found is None:
+        return
+    try:
+        for line in _stream(*found):
+            if not line.strip():
+                continue
+            rec = fastjson.loads(line)
+            if ((source is None or rec.get("source") == source) and (kind is None or rec.get("kind") == kind)
+                    and (chain is None or rec.get("chain") == chain)):
+                yield rec
+    except (EOFError, gzip.BadGzipFile) as e:  # dernier membre tronqué par un crash
+        logger.warning("raw archive truncated path=%s err=%s", found[0], e)
+
+
+def lookup(date_str: str, key: str, directory: str = DEFAULT_DIR, *, kind: Optional[str] = None,
+           index: Optional[List[IndexEntry]] = None) -> List[Dict[str, Any]]:
+    """
+    Enregistrements d'une clé (adresse de token) via l'index : seek + décompression
+    des seuls blocs concernés (chacun une fois).
+    `index` : read_index() déjà chargé, pour enchaîner les lookups d'un même jour.
+    """
+    found = find_day(date_str, directory)
+    if found is None:
+        return []
+    path, codec = found
+    if index is None:
+        index = read_index(date_str, directory)
+    entries = [e for e in index if e.key == key and (kind is None or e.kind == kind)]
+    out = []
+    blocks: Dict[int, List[bytes]] = {}
+    with open(path, "rb") as f:
+        for e in entries:
+            lines = blocks.get(e.offset)
+            if lines is None:
+                f.seek(e.offset)
+                lines = blocks[e.offset] = _decompress(f.read(e.length), codec).splitlines()
+            out.append(fastjson.loads(lines[e.line]))
+    return out
+
+
+# --- archive du process ---
+
+_lock = threading.Lock()
+_archives: Dict[str, RawArchive] = {}
+_queue: "queue.Queue[tuple]" = queue.Queue()
+_writer: Optional[threading.Thread] = None
+
+
+def archive_dir() -> str:
+    return os.path.abspath(os.getenv("RAW_ARCHIVE_DIR", "") or DEFAULT_DIR)
+
+
+def default_archive() -> Optional[RawArchive]:
+    """Archive partagée du process, ou None si RAW_ARCHIVE=0."""
+    if os.getenv("RAW_ARCHIVE", "1").strip().lower() in ("0", "false", "no", "off"):
+        return None
+    directory = archive_dir()
+    with _lock:
+        archive = _archives.get(directory)
+        if archive is None:
+            archive = _archives[directory] = RawArchive(directory)
+            keep = _env_int("RAW_ARCHIVE_KEEP_DAYS", DEFAULT_KEEP_DAYS)
+            if keep > 0:
+                archive.prune(keep)
+    return archive
+
+
+def _write_loop() -> None:
+    while True:
+        archive, args, kwargs = _queue.get()
+        try:
+            archive.append(*args, **kwargs)
+        except Exception as e:
+            logger.warning("raw archive write failed kind=%s err=%s", args[1], e)
+        finally:
+            _queue.task_done()
+
+
+def _start_writer() -> None:
+    global _writer
+    with _lock:
+        if _writer is None:
+            _writer = threading.Thread(target=_write_loop, name="raw-archive", daemon=True)
+            _writer.start()
+            atexit.register(flush)
+
+
+def record(source: str, kind: str, key: Any, data: Any, *, chain: str = "solana") -> None:
+    """
+    Archive une réponse brute, sans bloquer : mise en file pour le thread d'écriture
+    (`data` ne doit plus être modifiée ensuite). Une erreur disque ne fait jamais
+    échouer le run.
+    """
+    try:
+        archive = default_archive()
+        if archive is not None:
+            _start_writer()
+            _queue.put((archive, (source, kind, key, data),
+                        {"chain": chain, "date_str": today(), "ts": archive.clock()}))
+    except Exception as e:
+        logger.warning("raw archive write failed kind=%s err=%s", kind, e)
+
+
+def flush() -> None:
+    """Attend les enregistrements en file puis écrit les blocs en cours (fin de run)."""
+    if _writer is not None:
+        _queue.join()
+    with _lock:
+        archives = list(_archives.values())
+    for archive in archives:
+        try:
+            archive.flush()
+        except Exception as e:
+            logger.warning("raw archive flush failed dir=%s err=%s", archive.directory, e)
@@ -0,0 +1,79 @@
+"""
+PairRecord — représentation compacte d'une paire, de la normalisation jusqu'au CSV
+
+- dataclass à __slots__ : pas de __dict__ par instance, ~3x plus léger qu'un dict.
+- Les champs suivent EXACTEMENT l'ordre des en-têtes CSV (FIELDS == collector.HEADERS) :
+  la normalisation remplit les champs marché, l'enrichissement complète les
+  champs Birdeye en place, puis csv_values() alimente directement csv.writer.
+- get() / to_dict() gardent la compatibilité avec le code qui manipule des dicts.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Mapping, Optional
+
+
+@dataclass(slots=True)
+class PairRecord:
+    date: str = ""
+    chain: str = "solana"
+    baseToken: str = ""
+    baseSymbol: str = ""
+    pairAddress: str = ""
+    tokenAddress: str = ""
+    priceUsd: Optional[float] = None
+    liquidityUsd: Optional[float] = None
+    volume24hUsd: Optional[float] = None
+    txns24h: int = 0
+    priceChange24h: Optional[float] = None
+    createdAt: Any = None
+    earlyReturnMultiple: Any = ""
+    holders: Any = None
+    exitLiquidity: Any = None
+    hasMintAuth: Any = None
+    hasFreezeAuth: Any = None
+    notes: str = ""
+
+    @classmethod
+    def from_mapping(cls, row: Mapping[str, Any]) -> "PairRecord":
+        """Depuis un dict plat (clés = en-têtes CSV) ; les clés inconnues sont ignorées."""
+        rec = cls(**{name: row[name] for name in FIELDS if name in row})
+        for name, default in _TEXT_DEFAULTS.items():
+            if not getattr(rec, name):
+                setattr(rec, name, default)
+        return rec
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return getattr(self, name, default)
+
+    def csv_values(self) -> List[Any]:
+        return [getattr(self, name) for name in FIELDS]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in FIELDS}
+
+    def apply_enrichment(self, enrich: Mapping[str, Any]) -> None:
+        for name in ENRICHMENT_FIELDS:
+            setattr(self, name, enrich.get(name))
+        if enrich.get("notes"):
+            self.add_note(enrich["notes"])
+
+    def add_note(self, note: str) -> None:
+        """Ajoute une note (séparateur "; "), sans doublon."""
+        notes = [n for n in (self.notes or "").split("; ") if n]
+        if note not in notes:
+            self.notes = "; ".join(notes + [note])
+
+
+FIELDS = tuple(f.name for f in fields(PairRecord))
+ENRICHMENT_FIELDS = ("holders", "exitLiquidity", "hasMintAuth", "hasFreezeAuth")
+_TEXT_DEFAULTS = {"chain": "solana", "baseToken": "", "baseSymbol": "", "pairAddress": "", "tokenAddress": ""}
+
+
+def as_record(row: Any) -> PairRecord:
+    return row if isinstance(row, PairRecord) else PairRecord.from_mapping(row)
+
+
+def as_dict(row: Any) -> Dict[str, Any]:
+    return row.to_dict() if isinstance(row, PairRecord) else dict(row)
@@ -0,0 +1,212 @@
+"""
+Résilience des appels d'enrichissement — requêtes « hedgées » et disjoncteur par endpoint
+
+- LatencyTracker : latences récentes d'un endpoint (fenêtre glissante) → percentile.
+- ahedged(call) : lance l'appel ; s'il n'a pas répondu après le percentile
+  HEDGE_PERCENTILE (défaut p95) des latences observées, lance un doublon et garde
+  la 1re réponse valide (l'autre est abandonnée). Pas de doublon tant que
+  l'historique est trop court (HEDGE_MIN_SAMPLES), ni quand `hold()` est vrai
+  (hôte en pause Retry-After). Latences et délai ne comptent que le temps réseau
+  (http_client.AttemptTiming) : une file d'attente du rate limit ou des slots de
+  l'hôte ne déclenche pas de doublon.
+- CircuitBreaker : au-delà de BREAKER_ERROR_RATE d'échecs sur les BREAKER_WINDOW
+  derniers appels (au moins BREAKER_MIN_CALLS), le circuit s'ouvre : les appels
+  échouent immédiatement pendant BREAKER_OPEN_S secondes, puis un seul appel de
+  sonde (half-open) décide de la fermeture ou d'une nouvelle ouverture.
+
+Un endpoint dégradé coûte donc au plus quelques secondes au run au lieu d'un
+timeout complet par token.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import http_client
+import metrics
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+HEDGE_PERCENTILE = _env_float("HEDGE_PERCENTILE", 95.0)  # 0 : pas de hedging
+HEDGE_MIN_SAMPLES = int(_env_float("HEDGE_MIN_SAMPLES", 5))
+HEDGE_MIN_DELAY_S = _env_float("HEDGE_MIN_DELAY_S", 0.05)
+LATENCY_WINDOW = 200
+
+BREAKER_ERROR_RATE = _env_float("BREAKER_ERROR_RATE", 0.5)
+BREAKER_MIN_CALLS = int(_env_float("BREAKER_MIN_CALLS", 10))
+BREAKER_WINDOW = int(_env_float("BREAKER_WINDOW", 20))
+BREAKER_OPEN_S = _env_float("BREAKER_OPEN_S", 30.0)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class LatencyTracker:
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._samples: collections.deque = collections.deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, p: float, min_samples: int = HEDGE_MIN_SAMPLES) -> Optional[float]:
+        """Percentile `p` (0–100) des latences récentes ; None si trop peu d'échantillons."""
+        with self._lock:
+            if len(self._samples) < max(1, min_samples):
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100.0))]
+
+
+class CircuitBreaker:
+    """Disjoncteur à fenêtre glissante : closed → open → half_open → closed | open."""
+
+    def __init__(self, name: str = "", *, error_rate: float = BREAKER_ERROR_RATE,
+                 min_calls: int = BREAKER_MIN_CALLS, window: int = BREAKER_WINDOW,
+                 open_s: float = BREAKER_OPEN_S, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.error_rate = error_rate
+        self.min_calls = max(1, min_calls)
+        self.open_s = open_s
+        self.clock = clock
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self._outcomes: collections.deque = collections.deque(maxlen=max(window, self.min_calls))
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Vrai si l'appel peut partir (en half-open : une seule sonde à la fois)."""
+        with self._lock:
+            if self.state == OPEN and self.clock() - self.opened_at >= self.open_s:
+                self.state = HALF_OPEN
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record(self, ok: bool) -> None:
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probing = False
+                if ok:
+                    self.state = CLOSED
+                    self._outcomes.clear()
+                else:
+                    self._trip()
+                return
+            self._outcomes.append(ok)
+            failures = self._outcomes.count(False)
+            if (self.state == CLOSED and len(self._outcomes) >= self.min_calls
+                    and failures / len(self._outcomes) >= self.error_rate):
+                self._trip()
+
+    def release(self) -> None:
+        """Appel sans verdict (coupé par l'échéance du run) : libère la sonde half-open."""
+        with self._lock:
+            self._probing = False
+
+    def _trip(self) -> None:
+        self.state = OPEN
+        self.opened_at = self.clock()
+        self._outcomes.clear()
+        metrics.incr("breaker_trips")
+
+
+def _observe(latency: LatencyTracker, timing: http_client.AttemptTiming, result: Any,
+             ok: Callable[[Any], bool]) -> None:
+    if ok(result) and timing.seconds is not None:
+        latency.observe(timing.seconds)
+
+
+async def ahedged(call: Callable[[http_client.AttemptTiming], Awaitable[Any]], latency: LatencyTracker, *,
+                  ok: Callable[[Any], bool] = lambda r: True,
+                  percentile: float = HEDGE_PERCENTILE,
+                  hold: Callable[[], bool] = lambda: False) -> Any:
+    """
+    Appel avec doublon différé : 1re réponse valide (`ok`) gagnante ; si les deux
+    échouent, renvoie la réponse de l'appel principal. `call(timing)` transmet
+    `timing` à http_client, qui le renseigne.
+    """
+    delay = latency.percentile(percentile) if percentile > 0 else None
+    timing = http_client.AttemptTiming()
+    primary = asyncio.ensure_future(call(timing))
+    if delay is None:
+        result = await primary
+        _observe(latency, timing, result, ok)
+        return result
+
+    # le délai court à partir de l'envoi réel, pas de la mise en file
+    started = asyncio.ensure_future(timing.started.wait())
+    try:
+        await asyncio.wait({primary, started}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        started.cancel()
+    done, _ = await asyncio.wait({primary}, timeout=max(delay, HEDGE_MIN_DELAY_S))
+    if done or hold():
+        result = await primary
+        _observe(latency, timing, result, ok)
+        return result
+
+    metrics.incr("hedges_sent")
+    hedge_timing = http_client.AttemptTiming()
+    hedge = asyncio.ensure_future(call(hedge_timing))
+    timings = {primary: timing, hedge: hedge_timing}
+    pending = {primary, hedge}
+    first_result: Dict[asyncio.Future, Any] = {}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                result = task.result()
+                first_result[task] = result
+                if ok(result):
+                    _observe(latency, timings[task], result, ok)
+                    if task is hedge:
+                        metrics.incr("hedges_won")
+                    return result
+    finally:
+        for task in pending:
+            task.cancel()
+    return first_result.get(primary)
+
+
+# --- registre par endpoint (un disjoncteur + un historique de latence chacun) ---
+_lock = threading.Lock()
+_breakers: Dict[str, CircuitBreaker] = {}
+_latencies: Dict[str, LatencyTracker] = {}
+
+
+def breaker(name: str) -> CircuitBreaker:
+    with _lock:
+        found = _breakers.get(name)
+        if found is None:
+            found = _breakers[name] = CircuitBreaker(name)
+    return found
+
+
+def latency(name: str) -> LatencyTracker:
+    with _lock:
+        found = _latencies.get(name)
+        if found is None:
+            found = _latencies[name] = LatencyTracker()
+    return found
+
+
+def reset() -> None:
+    with _lock:
+        _breakers.clear()
+        _latencies.clear()
@@ -0,0 +1,156 @@
+"""
+Cache disque des réponses Birdeye (token_security, token_holders)
+
+- SQLite, un seul fichier (RESPONSE_CACHE_PATH, défaut .cache/responses.sqlite ;
+  RESPONSE_CACHE=0 pour désactiver). Clé : (endpoint, adresse du token).
+- TTL par endpoint : les flags de sécurité bougent peu (24h), les holders un peu
+  plus (6h). Surchargeable via CACHE_TTL_TOKEN_SECURITY / CACHE_TTL_TOKEN_HOLDERS.
+- Éviction LRU au-delà de RESPONSE_CACHE_MAX_ENTRIES lignes : nombre de lignes
+  tenu en mémoire (pas de COUNT(*) par écriture), éviction par paquets (10 % de
+  marge). Les dates d'accès d'une lecture sont gardées en mémoire et écrites avec
+  la prochaine écriture (une transaction), pas une écriture WAL par hit.
+- Appelé depuis la boucle asyncio via run_in_executor (utils.abirdeye_get) :
+  les accès disque ne bloquent pas les requêtes en vol.
+- Stale-while-error : une entrée expirée reste lisible (fresh=False) pour servir
+  de repli quand l'API échoue.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+DEFAULT_PATH = os.path.join(".cache", "responses.sqlite")
+DEFAULT_TTL_S = 6 * 3600
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+TTLS: Dict[str, int] = {
+    "token_security": _env_int("CACHE_TTL_TOKEN_SECURITY", 24 * 3600),
+    "token_holders": _env_int("CACHE_TTL_TOKEN_HOLDERS", 6 * 3600),
+}
+MAX_ENTRIES = _env_int("RESPONSE_CACHE_MAX_ENTRIES", 50_000)
+
+
+class Cached(NamedTuple):
+    payload: Any
+    fresh: bool
+
+
+class ResponseCache:
+    def __init__(self, path: str = DEFAULT_PATH, max_entries: int = MAX_ENTRIES,
+                 ttls: Optional[Dict[str, int]] = None, clock: Callable[[], float] = time.time):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.max_entries = max(1, max_entries)
+        self.ttls = dict(TTLS if ttls is None else ttls)
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " endpoint TEXT NOT NULL, key TEXT NOT NULL, payload TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL, accessed_at REAL NOT NULL,"
+            " PRIMARY KEY (endpoint, key))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (accessed_at)")
+        (self._count,) = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()
+        self._touched: Dict[Tuple[str, str], float] = {}  # (endpoint, key) → accessed_at en attente
+
+    def ttl(self, endpoint: str) -> int:
+        return self.ttls.get(endpoint, DEFAULT_TTL_S)
+
+    def get(self, endpoint: str, key: str) -> Optional[Cached]:
+        """Entrée en cache (fraîche ou périmée), ou None si absente."""
+        now = self.clock()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT payload, fetched_at FROM responses WHERE endpoint = ? AND key = ?",
+                (endpoint, key),
+            ).fetchone()
+            if row is None:
+                return None
+            self._touched[(endpoint, key)] = now
+        return Cached(json.loads(row[0]), now - row[1] < self.ttl(endpoint))
+
+    def put(self, endpoint: str, key: str, payload: Any) -> None:
+        now = self.clock()
+        body = json.dumps(payload, separators=(",", ":"))
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._flush_touched()
+                known = self._db.execute(
+                    "SELECT 1 FROM responses WHERE endpoint = ? AND key = ?", (endpoint, key)
+                ).fetchone()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (endpoint, key, payload, fetched_at, accessed_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (endpoint, key, body, now, now),
+                )
+                if known is None:
+                    self._count += 1
+                if self._count > self.max_entries:
+                    self._evict()
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def _flush_touched(self) -> None:
+        if self._touched:
+            self._db.executemany(
+                "UPDATE responses SET accessed_at = ? WHERE endpoint = ? AND key = ?",
+                [(at, endpoint, key) for (endpoint, key), at in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _evict(self) -> None:
+        # recompte exact (un autre process peut partager le fichier), puis marge de 10 %
+        (self._count,) = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()
+        excess = self._count - self.max_entries
+        if excess > 0:
+            cur = self._db.execute(
+                "DELETE FROM responses WHERE rowid IN"
+                " (SELECT rowid FROM responses ORDER BY accessed_at LIMIT ?)",
+                (excess + self.max_entries // 10,),
+            )
+            self._count -= max(cur.rowcount, 0)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_touched()
+            self._db.close()
+
+
+_lock = threading.Lock()
+_default: Optional[ResponseCache] = None
+
+
+def default_cache() -> Optional[ResponseCache]:
+    """Cache partagé du process, ou None si RESPONSE_CACHE=0."""
+    global _default
+    if os.getenv("RESPONSE_CACHE", "1").strip().lower() in ("0", "false", "no", "off"):
+        return None
+    with _lock:
+        if _default is None:
+            _default = ResponseCache(os.getenv("RESPONSE_CACHE_PATH", "") or DEFAULT_PATH)
+            atexit.register(_default.close)  # dates d'accès encore en mémoire
+    return _default
@@ -0,0 +1,173 @@
+"""
+Mode snapshot intraday — collecte incrémentale toutes les N minutes
+
+À chaque tick :
+  1. découverte DexScreener (nouvelles paires) ET rafraîchissement des paires déjà
+     suivies, en parallèle ; rien d'autre n'est re-téléchargé ;
+  2. classement top10 (collector.rank_records) sur ce pool ;
+  3. enrichissement Birdeye uniquement des tokens qui ENTRENT dans le top10
+     (les autres réutilisent l'enrichissement déjà obtenu dans la journée) ;
+  4. ajout (append-only, rename atomique via csv_sink) des lignes dans
+     data/intraday_<date>.csv, à côté du CSV quotidien : même schéma + colonne snapshotAt.
+
+L'état (paires suivies, enrichissements du jour) est conservé dans
+.cache/snapshot_state.json, ce qui permet aussi un cron toutes les 5 min (--once).
+
+Usage :
+    python snapshot.py --once
+    python snapshot.py --interval 300 [--ticks N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+import collector
+import dexscreener_client
+import http_client
+from csv_sink import CsvSink
+from normalize import pair_record
+from records import PairRecord
+
+logger = logging.getLogger(__name__)
+
+STATE_PATH = os.path.join(".cache", "snapshot_state.json")
+SNAPSHOT_HEADERS = list(collector.HEADERS) + ["snapshotAt"]
+# nb max de paires suivies entre deux ticks (les meilleures en volume)
+TRACK_LIMIT = max(1, int(os.getenv("SNAPSHOT_TRACK", "30") or 30))
+DEFAULT_INTERVAL_S = 300
+
+
+@dataclass
+class SnapshotState:
+    date: str = ""
+    # pairAddress → volume24hUsd au dernier tick (pour borner le suivi)
+    known: Dict[str, float] = field(default_factory=dict)
+    # tokenAddress → enrichissement Birdeye obtenu aujourd'hui
+    enriched: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: str = STATE_PATH) -> "SnapshotState":
+        try:
+            with open(path, encoding="utf-8") as f:
+                raw = json.load(f)
+            return cls(raw.get("date", ""), dict(raw.get("known") or {}), dict(raw.get("enriched") or {}))
+        except (OSError, ValueError):
+            return cls()
+
+    def save(self, path: str = STATE_PATH) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"date": self.date, "known": self.known, "enriched": self.enriched}, f)
+        os.replace(tmp, path)
+
+    def roll(self, date_str: str) -> None:
+        # nouveau jour : on garde les paires suivies, on ré-enrichit les tokens
+        if self.date != date_str:
+            self.date = date_str
+            self.enriched = {}
+
+
+def intraday_path(date_str: str) -> str:
+    return os.path.join("data", f"intraday_{date_str}.csv")
+
+
+async def _afetch_pool(known: Iterable[str], api_key: Optional[str]) -> Dict[str, PairRecord]:
+    discovered, refreshed = await asyncio.gather(
+        dexscreener_client.adiscover_pairs_solana(api_key=api_key),
+        dexscreener_client.arefresh_pairs("solana", list(known), api_key=api_key),
+    )
+    pool: Dict[str, PairRecord] = {}
+    # le rafraîchissement ciblé passe après la découverte : données les plus fraîches
+    for p in [*discovered, *refreshed]:
+        rec = pair_record(p)
+        if rec.pairAddress:
+            pool[rec.pairAddress] = rec
+    return pool
+
+
+def _volume(rec: PairRecord) -> float:
+    vol = rec.volume24hUsd
+    return vol if vol is not None and vol == vol else 0.0
+
+
+def _append(rows: List[PairRecord], path: str, snapshot_at: str) -> None:
+    with CsvSink(path, SNAPSHOT_HEADERS, append=True) as sink:
+        for rec in rows:
+            sink.write(rec.csv_values() + [snapshot_at])
+
+
+def tick(state: SnapshotState, *, api_key: Optional[str] = None, birdeye_key: Optional[str] = None,
+         now: Optional[datetime.datetime] = None) -> List[PairRecord]:
+    """Un snapshot : fetch incrémental, classement, enrichissement des entrants, append."""
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    date_str = now.date().isoformat()
+    state.roll(date_str)
+
+    pool = http_client.run(_afetch_pool(state.known, api_key))
+    top = collector.rank_records(pool.values())
+
+    entering = [rec for rec in top if rec.tokenAddress not in state.enriched]
+    fresh = dict(zip((rec.tokenAddress for rec in entering), collector.enrich_rows(entering, birdeye_key)))
+    for token, enrich in fresh.items():
+        # échec / échéance (tous les champs None) : pas mis en cache, retenté au tick suivant
+        if any(enrich.get(f) is not None for f in collector.EMPTY_ENRICHMENT):
+            state.enriched[token] = dict(enrich)
+    for rec in top:
+        rec.date = date_str
+        rec.apply_enrichment(state.enriched.get(rec.tokenAddress) or fresh.get(rec.tokenAddress) or {})
+
+    # suivi borné : le top10 + les meilleures paires en volume
+    tracked = {rec.pairAddress for rec in top}
+    by_volume = sorted(pool.values(), key=_volume, reverse=True)
+    for rec in by_volume:
+        if len(tracked) >= TRACK_LIMIT:
+            break
+        tracked.add(rec.pairAddress)
+    state.known = {a: _volume(pool[a]) for a in tracked if a in pool}
+
+    _append(top, intraday_path(date_str), now.isoformat(timespec="seconds"))
+    logger.info("snapshot pool=%s top=%s enriched_new=%s tracked=%s",
+                len(pool), len(top), len(entering), len(state.known))
+    return top
+
+
+def run(interval_s: float = DEFAULT_INTERVAL_S, ticks: Optional[int] = None,
+        state_path: str = STATE_PATH) -> None:
+    done = 0
+    while ticks is None or done < ticks:
+        started = time.monotonic()
+        state = SnapshotState.load(state_path)
+        try:
+            tick(state, api_key=collector.DEX_KEY or None, birdeye_key=collector.BIRDEYE_KEY)
+            state.save(state_path)
+        except Exception:
+            logger.exception("snapshot tick failed")
+        done += 1
+        if ticks is not None and done >= ticks:
+            break
+        time.sleep(max(0.0, interval_s - (time.monotonic() - started)))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="Snapshots intraday du top10")
+    ap.add_argument("--interval", type=float, default=DEFAULT_INTERVAL_S, help="secondes entre deux ticks")
+    ap.add_argument("--ticks", type=int, default=None, help="nombre de ticks (défaut : infini)")
+    ap.add_argument("--once", action="store_true", help="un seul tick (mode cron)")
+    ap.add_argument("--state", default=STATE_PATH)
+    args = ap.parse_args(argv)
+    run(args.interval, 1 if args.once else args.ticks, args.state)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,101 @@
+import csv
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+import backfill  # noqa: E402
+import collector  # noqa: E402
+import raw_archive  # noqa: E402
+
+
+def _write_day(path, date, rows):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=collector.HEADERS)
+        writer.writeheader()
+        for i, (liq, chg) in enumerate(rows):
+            writer.writerow({"date": date, "chain": "solana", "baseSymbol": f"T{i}", "pairAddress": f"p{i}",
+                             "tokenAddress": f"tok{i}", "liquidityUsd": liq, "volume24hUsd": 100 + i,
+                             "priceChange24h": chg, "holders": 42, "notes": "from archive"})
+
+
+def _read(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def test_backfill_reranks_days_idempotently(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    rows = [(1000, 90), (50000, 10), (8000, 50), (30000, 20)]
+    _write_day(tmp_path / "archive" / "2025-09" / "top10_2025-09-01.csv", "2025-09-01", rows)
+    _write_day(tmp_path / "data" / "top10_2025-09-03.csv", "2025-09-03", rows)
+
+    results = backfill.backfill("2025-09-01", "2025-09-03", workers=2, min_liquidity=1000, k=2)
+
+    assert [(r.date, r.source, r.ranked, r.error) for r in results] == [
+        ("2025-09-01", "csv", 2, None), ("2025-09-02", None, 0, None), ("2025-09-03", "csv", 2, None)]
+    out = tmp_path / "backfill" / "top10_2025-09-01.csv"
+    ranked = _read(out)
+    assert [r["pairAddress"] for r in ranked] == ["p0", "p2"]  # K réduit, tri priceChange24h
+    assert ranked[0]["holders"] == "42" and ranked[0]["notes"] == "from archive"
+    assert not (tmp_path / "backfill" / "top10_2025-09-02.csv").exists()
+
+    before = out.read_bytes()
+    backfill.backfill("2025-09-01", "2025-09-03", workers=1, min_liquidity=1000, k=2)
+    assert out.read_bytes() == before
+    assert sorted(p.name for p in (tmp_path / "backfill").iterdir()) == [
+        "top10_2025-09-01.csv", "top10_2025-09-03.csv"]  # aucun temporaire laissé
+
+
+def test_csv_replay_refuses_rules_it_cannot_honour(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    _write_day(tmp_path / "data" / "top10_2025-09-01.csv", "2025-09-01",
+               [(1000, 90), (50000, 10), (8000, 50), (30000, 20)])
+    _write_day(tmp_path / "data" / "top10_2025-09-02.csv", "2025-09-02", [(9000, i) for i in range(10)])
+
+    stricter = backfill.replay_day("2025-09-01", min_liquidity=20000)
+    wider = backfill.replay_day("2025-09-02", min_liquidity=0, k=20)
+
+    assert stricter.output is None and "drops 2 of the 4" in stricter.error
+    assert wider.output is None and "k=20" in wider.error
+    assert not (tmp_path / "backfill").exists()
+    assert backfill.main(["--start", "2025-09-01", "--end", "2025-09-01", "--chains", "solana",
+                          "--min-liquidity", "20000"]) == 1
+    assert "refused=1" in capsys.readouterr().out
+
+
+def test_backfill_names_other_chains_like_main(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _write_day(tmp_path / "data" / "top10_base_2025-09-01.csv", "2025-09-01", [(9000, 5)])
+
+    result = backfill.replay_day("2025-09-01", "base", min_liquidity=0, out_dir="out")
+
+    assert result.output == str(pathlib.Path("out") / "top10_base_2025-09-01.csv")
+    assert [r["pairAddress"] for r in _read(tmp_path / result.output)] == ["p0"]
+
+
+def test_raw_replay_fills_early_return_multiple(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("RAW_ARCHIVE_DIR", str(tmp_path / "raw"))
+    monkeypatch.setenv("PRICE_INDEX_PATH", str(tmp_path / "index.sqlite"))
+    # 1re apparition de tok0 le 2025-08-01 à 0.5 $
+    (tmp_path / "data").mkdir()
+    with open(tmp_path / "data" / "top10_2025-08-01.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=collector.HEADERS)
+        writer.writeheader()
+        writer.writerow({"date": "2025-08-01", "chain": "solana", "tokenAddress": "tok0", "priceUsd": 0.5})
+    archive = raw_archive.RawArchive(str(tmp_path / "raw"), codec="gzip")
+    for i in range(3):
+        archive.append("dexscreener", "pair", f"tok{i}", {
+            "chainId": "solana", "pairAddress": f"p{i}", "baseToken": {"address": f"tok{i}", "symbol": f"T{i}"},
+            "liquidity": {"usd": 50000}, "priceChange": {"h24": 10 * i}, "volume": {"h24": 100}, "priceUsd": "1"},
+            date_str="2025-09-01")
+    archive.flush()
+
+    result = backfill.replay_day("2025-09-01", min_liquidity=0)
+
+    rows = {r["tokenAddress"]: r["earlyReturnMultiple"] for r in _read(result.output)}
+    assert result.source == "raw"
+    assert rows == {"tok0": "2.0", "tok1": "1.0", "tok2": "1.0"}  # tok1/tok2 vus pour la 1re fois ce jour-là
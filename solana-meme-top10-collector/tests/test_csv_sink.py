@@ -0,0 +1,72 @@
+import csv
+import pathlib
+import sys
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+import collector  # noqa: E402
+from csv_sink import CsvSink  # noqa: E402
+from records import PairRecord  # noqa: E402
+
+
+def _read(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_rows_are_published_only_on_commit(tmp_path):
+    out = tmp_path / "data" / "top10.csv"
+    sink = CsvSink(str(out), collector.HEADERS)
+    sink.write(PairRecord(tokenAddress="t1", priceUsd=1.5))
+    sink.write({"tokenAddress": "t2", "notes": "x"})
+    assert not out.exists()
+
+    sink.commit()
+    rows = _read(out)
+    assert rows[0] == collector.HEADERS
+    assert [r[5] for r in rows[1:]] == ["t1", "t2"]
+    assert list(tmp_path.joinpath("data").iterdir()) == [out]
+
+
+def test_failed_run_keeps_previous_file(tmp_path):
+    out = tmp_path / "top10.csv"
+    out.write_text("previous\n")
+    with pytest.raises(RuntimeError):
+        with CsvSink(str(out), ["a"]) as sink:
+            sink.write(["1"])
+            raise RuntimeError("crash")
+    assert out.read_text() == "previous\n"
+    assert list(tmp_path.iterdir()) == [out]
+
+
+def test_append_mode_adds_rows_without_repeating_header(tmp_path):
+    out = tmp_path / "intraday.csv"
+    for value in ("1", "2"):
+        with CsvSink(str(out), ["a", "b"], append=True) as sink:
+            sink.write([value, "x"])
+    assert _read(out) == [["a", "b"], ["1", "x"], ["2", "x"]]
+
+
+def test_main_crash_during_enrichment_leaves_published_csv(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PRICE_INDEX", "0")
+    published = tmp_path / "data" / "top10_2020-01-01.csv"
+    published.parent.mkdir()
+    published.write_text("complete earlier run\n")
+
+    monkeypatch.setattr(collector, "now_iso_date", lambda: "2020-01-01")
+    monkeypatch.setattr(collector, "fetch_new_pairs_dexscreener", lambda api_key, max_pairs=500: [
+        {"tokenAddress": f"t{i}", "liquidityUsd": 10000, "priceChange24h": i} for i in range(3)])
+
+    def boom(rows, key, workers=None):
+        yield {}
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(collector, "iter_enrichments", boom)
+    with pytest.raises(KeyboardInterrupt):
+        collector.main()
+    assert published.read_text() == "complete earlier run\n"
+    assert [p.name for p in published.parent.iterdir()] == [published.name]
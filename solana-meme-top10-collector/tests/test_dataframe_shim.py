@@ -0,0 +1,42 @@
+import importlib.util
+import pathlib
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+# le shim de la racine du dépôt, chargé par chemin (la vraie pandas peut être installée)
+_spec = importlib.util.spec_from_file_location("pandas_shim", ROOT.parent / "pandas.py")
+shim = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(shim)
+
+
+def _frame():
+    return shim.DataFrame({
+        "tok": ["a", "b", "c", "d", "e"],
+        "chg": [1.0, None, 3.0, 1.0, float("nan")],
+        "vol": [10, 20, 30, 40, 50],
+    })
+
+
+def test_mask_and_head_are_views_over_shared_columns():
+    df = _frame()
+    kept = df[df["vol"] >= 20].head(2)
+
+    assert list(kept["tok"]) == ["b", "c"]
+    assert kept._data is df._data  # pas de copie des colonnes
+    assert list(df[df["chg"] >= 1]["tok"]) == ["a", "c", "d"]  # None / NaN → False
+
+
+def test_multi_key_sort_puts_missing_last():
+    df = _frame().sort_values(["chg", "vol"], ascending=[False, True])
+
+    assert list(df["tok"]) == ["c", "a", "d", "b", "e"]
+    assert list(_frame().sort_values("chg")["tok"][:3]) == ["a", "d", "c"]
+
+
+def test_nlargest_and_records():
+    df = _frame()
+
+    top = df.nlargest(2, ["chg", "vol"])
+    assert top.to_dict("records") == [{"tok": "c", "chg": 3.0, "vol": 30},
+                                      {"tok": "d", "chg": 1.0, "vol": 40}]
+    assert shim.DataFrame([{"a": 1}, {"b": 2}]).to_dict("list") == {"a": [1, None], "b": [None, 2]}
@@ -0,0 +1,80 @@
+import csv
+import json
+import pathlib
+import sys
+import time
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "benchmarks"))
+
+import collector  # noqa: E402
+import http_client  # noqa: E402
+import metrics  # noqa: E402
+import utils  # noqa: E402
+from records import PairRecord  # noqa: E402
+from standin import StandIn  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _no_deadline():
+    yield
+    http_client.set_deadline(None)
+
+
+def test_request_is_cut_at_the_deadline():
+    metrics.reset()
+    with StandIn(latency_ms=2000) as server:
+        http_client.set_deadline(0.3)
+        t0 = time.perf_counter()
+        with pytest.raises(http_client.DeadlineExceeded):
+            http_client.get_json(f"{server.url}/defi/token_holders?address=x")
+        elapsed = time.perf_counter() - t0
+
+    assert elapsed < 1.0
+    assert metrics.snapshot()["counters"]["deadline_exceeded"] >= 1
+
+
+def test_expired_deadline_sends_nothing():
+    http_client.set_deadline(0)
+    with StandIn() as server:
+        with pytest.raises(http_client.DeadlineExceeded):
+            http_client.get_json(f"{server.url}/defi/token_holders?address=x")
+    assert server.counts["token_holders"] == 0
+
+
+def test_skipped_fields_are_named_in_notes():
+    out = utils.enrichment_from({"data": {"holders": 12}}, {"_error": "deadline", "_deadline": True})
+
+    assert out["holders"] == 12 and out["hasMintAuth"] is None
+    assert out["notes"] == "deadline_skipped=exitLiquidity,hasMintAuth,hasFreezeAuth"
+
+
+def test_main_publishes_partial_csv_within_budget(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("RESPONSE_CACHE", "0")
+    monkeypatch.setenv("PRICE_INDEX", "0")
+    monkeypatch.setenv("RAW_ARCHIVE", "0")
+    monkeypatch.setattr(collector, "now_iso_date", lambda: "2020-01-01")
+    monkeypatch.setattr(collector, "BIRDEYE_KEY", "k")
+    pairs = [PairRecord(tokenAddress=f"tok{i}", pairAddress=f"p{i}", liquidityUsd=10000, priceChange24h=i)
+             for i in range(12)]
+    monkeypatch.setattr(collector, "fetch_pairs_by_chain", lambda *a, **k: {"solana": pairs})
+
+    with StandIn(latency_ms=3000) as server:
+        monkeypatch.setattr(utils, "BIRDEYE_BASE", server.url)
+        t0 = time.perf_counter()
+        collector.main(deadline_s=0.4)
+        elapsed = time.perf_counter() - t0
+
+    assert elapsed < 2.5
+    with open(tmp_path / "data" / "top10_2020-01-01.csv", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 10
+    assert all(r["notes"].startswith("deadline_skipped=holders") for r in rows)
+    summary = json.loads((tmp_path / "data" / "run_summary.json").read_text())
+    assert summary["deadline_s"] == 0.4
+    assert summary["counters"]["deadline_exceeded"] > 0
+    assert http_client.remaining() is None  # échéance levée après le run
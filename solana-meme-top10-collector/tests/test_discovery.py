@@ -0,0 +1,98 @@
+import asyncio
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+import dexscreener_client  # noqa: E402
+
+
+def _pair(addr, chain="solana", volume=0):
+    return {"chainId": chain, "pairAddress": addr, "baseToken": {"address": f"tok-{addr}"},
+            "volume": {"h24": volume}}
+
+
+def test_discovery_queries_include_configured_keywords(monkeypatch):
+    monkeypatch.setenv("DISCOVERY_KEYWORDS", "goat, sol ,")
+    queries = dexscreener_client.discovery_queries(extra=["wen"])
+    assert queries[0] == "SOL"
+    assert "goat" in queries and "wen" in queries
+    assert [q.lower() for q in queries].count("sol") == 1
+
+
+def test_discover_pairs_fans_out_and_dedupes(monkeypatch):
+    payloads = {
+        "SOL": {"pairs": [_pair("p1"), _pair("p2"), _pair("e1", chain="ethereum")]},
+        "pump": {"pairs": [_pair("p2"), _pair("p3")]},
+    }
+    seen = []
+
+    async def fake_aget(path, params=None, *, api_key=None, timeout=20):
+        seen.append((path, (params or {}).get("q")))
+        if path != "/latest/dex/search":
+            return {"pairs": [_pair("p4")]}
+        if params["q"] == "broken":
+            raise RuntimeError("boom")
+        return payloads[params["q"]]
+
+    monkeypatch.setattr(dexscreener_client, "_aget", fake_aget)
+
+    pairs = dexscreener_client.discover_pairs_solana(queries=["SOL", "pump", "broken"])
+
+    assert sorted(p["pairAddress"] for p in pairs) == ["p1", "p2", "p3", "p4"]
+    assert len(seen) == 3 + len(dexscreener_client.DEX_SCREENER_SOLANA_URLS)
+    assert len(dexscreener_client.discover_pairs_solana(queries=["SOL"], limit=1)) == 1
+
+
+def test_discovery_limit_is_independent_of_arrival_order(monkeypatch):
+    payloads = {
+        "SOL": {"pairs": [_pair("p1", volume=10), _pair("p2", volume=500), {"pairAddress": "nochain"}]},
+        "pump": {"pairs": [_pair("p3", volume=300), _pair("p4", volume=500)]},
+    }
+
+    def run(delays):
+        async def fake_aget(path, params=None, *, api_key=None, timeout=20):
+            if path != "/latest/dex/search":
+                return {"pairs": []}
+            await asyncio.sleep(delays[params["q"]])
+            return payloads[params["q"]]
+
+        monkeypatch.setattr(dexscreener_client, "_aget", fake_aget)
+        pairs = dexscreener_client.discover_pairs_solana(queries=["SOL", "pump"], limit=3)
+        return [p["pairAddress"] for p in pairs]
+
+    # paire sans chainId écartée ; les 3 plus gros volumes, ordre des requêtes
+    assert run({"SOL": 0.05, "pump": 0}) == run({"SOL": 0, "pump": 0.05}) == ["p2", "p3", "p4"]
+
+
+def test_batched_pair_and_token_lookups_split_by_address(monkeypatch):
+    calls = []
+
+    async def fake_aget(path, params=None, *, api_key=None, timeout=20):
+        calls.append(path)
+        prefix, _, joined = path.rpartition("/")
+        addrs = joined.split(",")
+        if "x7" in addrs:
+            raise RuntimeError("boom")
+        if prefix == "/tokens/v1/solana":
+            return [{"pairAddress": f"p-{a}", "baseToken": {"address": a},
+                     "quoteToken": {"address": "So111"}} for a in addrs if a != "gone"]
+        return {"pairs": [_pair(a) for a in addrs if a != "gone"] + [_pair("unrelated")]}
+
+    monkeypatch.setattr(dexscreener_client, "_aget", fake_aget)
+    monkeypatch.setattr(dexscreener_client, "MAX_ADDRESSES_PER_CALL", 3)
+
+    ids = [f"x{i}" for i in range(8)] + ["gone", "x0"]
+    by_pair = dexscreener_client.pairs_detail("solana", ids)
+    assert len(calls) == 3  # 9 adresses uniques → 3 lots de 3
+    assert calls[0] == "/latest/dex/pairs/solana/x0,x1,x2"
+    assert sorted(by_pair) == ["x0", "x1", "x2", "x3", "x4", "x5"]  # lot de x7 en échec
+
+    refreshed = dexscreener_client.refresh_pairs("solana", ["x2", "x1", "gone"])
+    assert [p["pairAddress"] for p in refreshed] == ["x2", "x1"]
+
+    by_token = dexscreener_client.tokens_pairs("solana", ["a", "So111", "gone", "b"])
+    assert [p["pairAddress"] for p in by_token["a"]] == ["p-a"]
+    assert by_token["gone"] == []
+    assert len(by_token["So111"]) == 2
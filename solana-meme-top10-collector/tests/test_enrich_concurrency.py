@@ -0,0 +1,39 @@
+import pathlib
+import sys
+import threading
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+import collector  # noqa: E402
+
+
+def test_enrich_rows_concurrent_keeps_order_and_falls_back(monkeypatch):
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def fake_enrich_birdeye(token_address, birdeye_key):
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.pop()
+        if token_address == "bad":
+            raise RuntimeError("boom")
+        return {"holders": token_address, "exitLiquidity": 1, "hasMintAuth": False, "hasFreezeAuth": False}
+
+    monkeypatch.setattr(collector, "enrich_birdeye", fake_enrich_birdeye)
+    rows = [{"tokenAddress": t} for t in ["a", "b", "bad", "c", "d"]]
+
+    res = collector.enrich_rows(rows, "key", workers=5)
+
+    assert [r["holders"] for r in res] == ["a", "b", None, "c", "d"]
+    assert res[2] == collector.EMPTY_ENRICHMENT
+    assert max(peak) > 1
+
+
+def test_enrich_rows_empty():
+    assert collector.enrich_rows([], "key") == []
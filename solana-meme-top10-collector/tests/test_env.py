@@ -1,7 +1,11 @@
 import os
 import pathlib
+import shutil
+import subprocess
 import sys
 
+import pytest
+
 # ensure collector module is importable
 ROOT = pathlib.Path(__file__).resolve().parent.parent
 sys.path.append(str(ROOT))
@@ -57,3 +61,16 @@ def test_main_runs_without_env(monkeypatch, tmp_path):
     # Ensure output file created
     out_file = tmp_path / "data" / "top10_2020-01-01.csv"
     assert out_file.exists()
+
+
+def test_dotenv_found_from_another_working_directory(tmp_path):
+    pytest.importorskip("dotenv")
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    shutil.copy(ROOT / "collector.py", pkg / "collector.py")
+    (pkg / ".env").write_text("COLLECT_CHAINS=base\n")
+    env = {k: v for k, v in os.environ.items() if k != "COLLECT_CHAINS"}
+    out = subprocess.run([sys.executable, "-c", "import collector; print(collector.CHAINS)"],
+                         cwd=tmp_path, env=dict(env, PYTHONPATH=f"{pkg}{os.pathsep}{ROOT}"),
+                         capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "('base',)"
@@ -0,0 +1,88 @@
+import pathlib
+import random
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "benchmarks"))
+
+import collector  # noqa: E402
+import fixtures  # noqa: E402
+import helius_client  # noqa: E402
+import http_client  # noqa: E402
+from standin import StandIn  # noqa: E402
+
+
+def test_parse_mint_layout():
+    info = helius_client.parse_mint(fixtures.mint_data(mint_authority=True, freeze_authority=False,
+                                                       supply=123456789, decimals=9))
+
+    assert info == helius_client.MintInfo(True, False, 123456789, 9)
+    assert helius_client.parse_mint(b"\x00" * 10) is None  # pas un compte mint
+    assert helius_client.parse_mint(bytes(82)) is None  # non initialisé
+
+
+def test_enrichments_batch_all_mints_in_few_calls(monkeypatch, tmp_path):
+    monkeypatch.setenv("RAW_ARCHIVE", "0")
+    mints = [f"Mint{i:03d}" for i in range(150)]
+
+    with StandIn(seed=3) as server:
+        monkeypatch.setattr(helius_client, "RPC_URL", server.url + "/")
+        out = helius_client.enrichments(mints, api_key="k")
+
+    # 2 getMultipleAccounts (100 + 50) + 2 POST batch getTokenLargestAccounts
+    assert server.counts["rpc"] == 4
+    for mint in (mints[0], mints[149]):
+        rng = random.Random(f"3-sec-{mint}")
+        assert out[mint]["hasMintAuth"] is (rng.random() < 0.2)
+        assert out[mint]["hasFreezeAuth"] is (rng.random() < 0.1)
+        amounts = [int(a["amount"]) for a in fixtures.largest_accounts_payload(mint, 3)["value"]]
+        pct = round(100.0 * sum(amounts[:10]) / fixtures.MINT_SUPPLY, 1)
+        assert out[mint]["notes"] == f"top10Holders={pct}%"
+        assert out[mint]["holders"] is None
+
+
+def test_collector_uses_helius_backend_and_falls_back(monkeypatch):
+    monkeypatch.setenv("RAW_ARCHIVE", "0")
+    monkeypatch.setattr(collector, "ENRICH_BACKEND", "helius")
+    monkeypatch.setattr(collector, "HELIUS_KEY", "k")
+    birdeye_calls = []
+    monkeypatch.setattr(collector, "enrich_birdeye",
+                        lambda token, key: birdeye_calls.append(token) or {"holders": 1})
+    rows = [{"tokenAddress": "MintA"}, {"tokenAddress": "MintB"}]
+
+    with StandIn() as server:
+        monkeypatch.setattr(helius_client, "RPC_URL", server.url + "/")
+        enriched = collector.enrich_rows(rows, "birdeye-key")
+    assert birdeye_calls == []
+    assert all(e["hasMintAuth"] in (True, False) for e in enriched)
+
+
+def test_dead_node_falls_back_to_birdeye_without_leaking_key(monkeypatch, caplog):
+    monkeypatch.setenv("RAW_ARCHIVE", "0")
+    monkeypatch.setattr(collector, "ENRICH_BACKEND", "helius")
+    monkeypatch.setattr(collector, "HELIUS_KEY", "secret-helius-key")
+    monkeypatch.setattr(http_client, "_sleep", _no_sleep)
+    birdeye_calls = []
+    monkeypatch.setattr(collector, "enrich_birdeye",
+                        lambda token, key: birdeye_calls.append(token) or {"holders": 1})
+    rows = [{"tokenAddress": "MintA"}, {"tokenAddress": "MintB"}]
+
+    with StandIn() as server:
+        dead_url = server.url + "/"
+    monkeypatch.setattr(helius_client, "RPC_URL", dead_url)  # port fermé : connexions refusées
+
+    assert collector.enrich_rows(rows, "birdeye-key") == [{"holders": 1}, {"holders": 1}]
+    assert sorted(birdeye_calls) == ["MintA", "MintB"]
+    assert "helius enrichment failed" in caplog.text
+    assert "secret-helius-key" not in caplog.text
+
+
+def test_http_error_hides_query_string():
+    err = http_client.HttpError("https://rpc.example/?api-key=abc", "boom for url: /?api-key=abc", 500, "POST")
+
+    assert "abc" not in str(err) and err.url == "https://rpc.example/"
+
+
+async def _no_sleep(seconds):
+    return None
@@ -0,0 +1,100 @@
+import csv
+import pathlib
+import subprocess
+import sys
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+import history_store  # noqa: E402
+
+
+def _write(path, date, tokens, chain="solana"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=history_store.COLUMNS)
+        w.writeheader()
+        for t in tokens:
+            w.writerow({"date": date, "chain": chain, "tokenAddress": t, "pairAddress": f"p-{t}",
+                        "priceUsd": "0.5", "txns24h": "12", "hasMintAuth": "False"})
+
+
+def test_compact_is_incremental_and_survives_archiving(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _write(tmp_path / "data" / "top10_2025-09-01.csv", "2025-09-01", ["a", "b"])
+    _write(tmp_path / "data" / "top10_2025-09-02.csv", "2025-09-02", ["a"])
+
+    assert history_store.compact() == {"files": 2, "rows": 3, "skipped": 0}
+    assert history_store.days_in_top10("a") == 2
+    assert history_store.days_in_top10("b") == 1
+
+    # archive.yml déplace le fichier : même nom + même contenu → ignoré
+    (tmp_path / "archive" / "2025-09").mkdir(parents=True)
+    (tmp_path / "data" / "top10_2025-09-01.csv").rename(tmp_path / "archive" / "2025-09" / "top10_2025-09-01.csv")
+    assert history_store.compact() == {"files": 0, "rows": 0, "skipped": 2}
+
+    # fichier réécrit → ses lignes sont remplacées, pas dupliquées
+    _write(tmp_path / "data" / "top10_2025-09-02.csv", "2025-09-02", ["c"])
+    assert history_store.compact()["files"] == 1
+    assert history_store.days_in_top10("a") == 1
+    assert history_store.days_in_top10("c") == 1
+
+    # homonymes de contenus différents (mois ré-archivé) : deux sources stables
+    _write(tmp_path / "archive" / "2025-09" / "top10_2025-09-02.csv", "2025-09-02", ["d"])
+    assert history_store.compact()["files"] == 1
+    assert history_store.compact() == {"files": 0, "rows": 0, "skipped": 3}
+    db = history_store.connect()
+    sources = sorted(s for (s,) in db.execute("SELECT source FROM ingested"))
+    db.close()
+    assert sources == ["archive/2025-09/top10_2025-09-01.csv", "archive/2025-09/top10_2025-09-02.csv",
+                       "data/top10_2025-09-02.csv"]
+
+
+def test_values_are_typed(tmp_path):
+    src = tmp_path / "top10_2025-09-03.csv"
+    _write(src, "2025-09-03", ["x"])
+    db_path = str(tmp_path / "h.sqlite")
+    history_store.compact([str(src)], db_path=db_path)
+
+    db = history_store.connect(db_path)
+    row = db.execute("SELECT priceUsd, txns24h, hasMintAuth, holders FROM top10").fetchone()
+    plan = " ".join(r[-1] for r in db.execute(
+        "EXPLAIN QUERY PLAN SELECT COUNT(DISTINCT date) FROM top10 WHERE tokenAddress = 'x'"))
+    db.close()
+    assert row == (0.5, 12, 0, None)
+    assert "top10_token_date" in plan
+
+
+def test_content_id_uses_git_index_for_clean_tracked_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _write(tmp_path / "data" / "top10_2025-09-01.csv", "2025-09-01", ["a"])
+    _write(tmp_path / "data" / "top10_2025-09-02.csv", "2025-09-02", ["b"])
+    if subprocess.run(["git", "init", "-q"]).returncode != 0:
+        pytest.skip("git unavailable")
+    subprocess.run(["git", "add", "data"], check=True)
+    _write(tmp_path / "data" / "top10_2025-09-02.csv", "2025-09-02", ["c"])  # modifié après add
+
+    blobs = history_store.git_blob_ids()
+    clean = history_store.content_id("data/top10_2025-09-01.csv", blobs)
+    dirty = history_store.content_id("data/top10_2025-09-02.csv", blobs)
+    assert clean.startswith("git:") and len(clean) == 44
+    assert dirty == history_store.file_sha256("data/top10_2025-09-02.csv")
+
+
+def test_days_in_top10_is_per_chain(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    evm = "0xabc"
+    _write(tmp_path / "data" / "top10_base_2025-09-01.csv", "2025-09-01", [evm], chain="base")
+    _write(tmp_path / "data" / "top10_base_2025-09-02.csv", "2025-09-02", [evm], chain="base")
+    _write(tmp_path / "data" / "top10_bsc_2025-09-03.csv", "2025-09-03", [evm], chain="bsc")
+    _write(tmp_path / "data" / "top10_2025-09-04.csv", "2025-09-04", ["sol"], chain="")  # CSV sans chaîne
+    history_store.compact()
+
+    assert history_store.days_in_top10(evm, chain="base") == 2
+    assert history_store.days_in_top10(evm, chain="bsc") == 1
+    assert history_store.days_in_top10(evm) == 0
+    assert history_store.days_in_top10("sol") == 1
+    history_store.main(["days", evm, "--chain", "BSC"])
+    assert capsys.readouterr().out.strip() == "1"
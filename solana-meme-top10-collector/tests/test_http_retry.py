@@ -1,3 +1,4 @@
+import json
 import pathlib
 import sys
 
@@ -6,6 +7,7 @@ import requests
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 sys.path.append(str(ROOT))
 
+import http_client  # noqa: E402
 from utils import http_get  # noqa: E402
 
 
@@ -13,6 +15,7 @@ class DummyResponse:
     def __init__(self, status_code, data):
         self.status_code = status_code
         self._data = data
+        self.content = json.dumps(data).encode()
 
     def json(self):
         return self._data
@@ -32,11 +35,32 @@ def test_http_retry_429(monkeypatch):
         return DummyResponse(200, {"ok": True})
 
     sleeps = []
-    monkeypatch.setattr("requests.get", fake_get)
-    monkeypatch.setattr("time.sleep", lambda s: sleeps.append(s))
+
+    async def fake_sleep(s):
+        sleeps.append(s)
+
+    monkeypatch.setattr(http_client._session(), "get", fake_get)
+    monkeypatch.setattr(http_client, "_sleep", fake_sleep)
 
     data = http_get("https://api.example.com", retries=2)
 
     assert data == {"ok": True}
     assert calls == [1, 1]
     assert sleeps == [1]
+
+
+def test_http_get_returns_error_after_retries(monkeypatch):
+    async def fake_sleep(s):
+        pass
+
+    monkeypatch.setattr(http_client._session(), "get", lambda *a, **k: DummyResponse(503, {}))
+    monkeypatch.setattr(http_client, "_sleep", fake_sleep)
+
+    data = http_get("https://api.example.com", retries=3)
+
+    assert "_error" in data
+    assert "503" in data["_error"]
+
+
+def test_shared_session_is_reused():
+    assert http_client._session() is http_client._session()
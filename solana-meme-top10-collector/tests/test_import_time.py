@@ -0,0 +1,20 @@
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "benchmarks"))
+
+import bench_import  # noqa: E402
+
+
+def test_collector_import_skips_heavy_modules():
+    loaded = set(bench_import.loaded_modules("collector"))
+    assert "collector" in loaded
+    assert [m for m in bench_import.HEAVY_MODULES if m in loaded] == []
+
+
+def test_import_profile_parses_importtime_output():
+    rows = bench_import.import_profile("collector")
+    names = [name for name, _, _ in rows]
+    assert names[-1] == "collector"
+    assert all(cum >= own >= 0 for _, own, cum in rows)
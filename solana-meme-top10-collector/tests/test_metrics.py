@@ -0,0 +1,75 @@
+import json
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+import collector  # noqa: E402
+import http_client  # noqa: E402
+import metrics  # noqa: E402
+from test_http_retry import DummyResponse  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_stages_accumulate_and_cache_hit_rate():
+    clock = FakeClock()
+    run = metrics.RunMetrics(clock=clock)
+    for secs in (1.0, 0.5):
+        with run.stage("enrich"):
+            clock.now += secs
+    run.http("api.example.com", requests=2, retries=1, status_429=1, bytes=10)
+    for name in ("cache_hits", "cache_hits", "cache_hits", "cache_misses"):
+        run.incr(name)
+
+    snap = run.snapshot()
+    assert snap["stages_s"] == {"enrich": 1.5}
+    assert snap["duration_s"] == 1.5
+    assert snap["http"]["api.example.com"] == {"requests": 2, "retries": 1, "status_429": 1, "errors": 0, "bytes": 10}
+    assert snap["cache_hit_rate"] == 0.75
+
+    text = metrics.prometheus_text(snap)
+    assert 'top10_stage_duration_seconds{stage="enrich"} 1.5' in text
+    assert 'top10_http_status_429_total{host="api.example.com"} 1' in text
+    assert "top10_cache_hit_ratio 0.75" in text
+
+
+def test_http_client_counts_requests_retries_and_bytes(monkeypatch):
+    responses = [DummyResponse(429, {}), DummyResponse(200, {"ok": True})]
+
+    async def fake_sleep(s):
+        pass
+
+    monkeypatch.setattr(http_client._session(), "get", lambda *a, **k: responses.pop(0))
+    monkeypatch.setattr(http_client, "_sleep", fake_sleep)
+    metrics.reset()
+
+    assert http_client.get_json("https://metrics.example.com/x", retries=2) == {"ok": True}
+
+    host = metrics.snapshot()["http"]["metrics.example.com"]
+    assert host == {"requests": 2, "retries": 1, "status_429": 1, "errors": 0, "bytes": 2 + 12}
+
+
+def test_main_writes_run_summary_and_prometheus_file(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PRICE_INDEX", "0")
+    monkeypatch.setenv("METRICS_PROM_FILE", str(tmp_path / "prom" / "top10.prom"))
+    monkeypatch.setattr(collector, "fetch_new_pairs_dexscreener", lambda api_key, max_pairs=500: [
+        {"tokenAddress": "t1", "priceUsd": 1.0, "liquidityUsd": 10000, "volume24hUsd": 1}])
+    monkeypatch.setattr(collector, "enrich_birdeye", lambda t, k: {})
+    monkeypatch.setattr(collector, "now_iso_date", lambda: "2020-01-01")
+
+    collector.main()
+
+    summary = json.loads((tmp_path / "data" / "run_summary.json").read_text())
+    assert summary["date"] == "2020-01-01"
+    assert summary["pairs_fetched"] == 1 and summary["pairs_ranked"] == 1
+    assert {"rank", "enrich", "write"} <= set(summary["stages_s"])
+    assert "top10_pairs_ranked 1" in (tmp_path / "prom" / "top10.prom").read_text()
@@ -0,0 +1,74 @@
+import csv
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+import collector  # noqa: E402
+import dexscreener_client  # noqa: E402
+import utils  # noqa: E402
+import validate_csv  # noqa: E402
+
+
+def _pair(addr, chain, chg=1):
+    return {"chainId": chain, "pairAddress": addr, "baseToken": {"address": f"tok-{addr}", "symbol": addr},
+            "liquidity": {"usd": 10000}, "priceChange": {"h24": chg}, "priceUsd": "1"}
+
+
+def test_discovery_is_shared_and_split_by_chain(monkeypatch):
+    seen = []
+
+    async def fake_aget(path, params=None, *, api_key=None, timeout=20):
+        seen.append((path, (params or {}).get("q")))
+        if path == "/latest/dex/pairs/solana":
+            return {"pairs": [{"pairAddress": "s-fallback"}]}  # sans chainId → chaîne demandée
+        if path != "/latest/dex/search":
+            return {"pairs": []}
+        return {"pairs": [_pair("s1", "solana"), _pair("b1", "base"), _pair("e1", "ethereum")]}
+
+    monkeypatch.setattr(dexscreener_client, "_aget", fake_aget)
+
+    by_chain = dexscreener_client.discover_pairs(["solana", "base"])
+
+    assert sorted(p["pairAddress"] for p in by_chain["solana"]) == ["s-fallback", "s1"]
+    assert sorted(p["pairAddress"] for p in by_chain["base"]) == ["b1"]
+    searches = [q for path, q in seen if path == "/latest/dex/search"]
+    assert len(searches) == len(set(q.lower() for q in searches))  # "pump", "USDC"… une seule fois
+    assert {"SOL", "WETH"} <= set(searches)
+    # pas d'endpoint de repli documenté hors Solana : aucune requête
+    assert not [path for path, _ in seen if path.startswith("/latest/dex/pairs") and "solana" not in path]
+
+
+def test_main_writes_one_csv_per_chain(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PRICE_INDEX", "0")
+    monkeypatch.setattr(collector, "now_iso_date", lambda: "2020-01-01")
+    monkeypatch.setattr(collector, "BIRDEYE_KEY", "key")
+
+    async def fake_discover(chains, queries=None, limit=None, *, api_key=None):
+        return {c: [_pair(f"{c}{i}", c, chg=i) for i in range(12)] for c in chains}
+
+    enriched = []
+
+    def fake_enrich(token, key, chain="solana"):
+        enriched.append(chain)
+        return {"holders": 7}
+
+    monkeypatch.setattr(dexscreener_client, "adiscover_pairs", fake_discover)
+    monkeypatch.setattr(utils, "enrich_birdeye", fake_enrich)
+
+    collector.main(["solana", "base", "bsc"])
+
+    for chain, name in (("solana", "top10_2020-01-01.csv"), ("base", "top10_base_2020-01-01.csv"),
+                        ("bsc", "top10_bsc_2020-01-01.csv")):
+        with (tmp_path / "data" / name).open() as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 10
+        assert {r["chain"] for r in rows} == {chain}
+        assert rows[0]["pairAddress"] == f"{chain}11"
+        assert rows[0]["holders"] == "7"
+    assert sorted(set(enriched)) == ["base", "bsc", "solana"] and len(enriched) == 30
+    assert validate_csv.latest_daily(validate_csv.find_files()) == {
+        "base": "data/top10_base_2020-01-01.csv", "bsc": "data/top10_bsc_2020-01-01.csv",
+        "solana": "data/top10_2020-01-01.csv"}
@@ -0,0 +1,57 @@
+import json
+import pathlib
+import sys
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+import fastjson  # noqa: E402
+import normalize  # noqa: E402
+
+PAIR = {
+    "chainId": "solana",
+    "pairAddress": "pair1",
+    "baseToken": {"address": "tok1", "name": "Token One", "symbol": "ONE"},
+    "priceUsd": "0.0123",
+    "liquidity": {"usd": 12000.5},
+    "volume": {"h24": 3400},
+    "txns": {"h24": {"buys": 10, "sells": "5"}},
+    "priceChange": {"h24": -12.5},
+    "pairCreatedAt": 1700000000000,
+}
+
+
+def test_pair_record_single_pass_fields():
+    rec = normalize.pair_record(PAIR)
+    assert (rec.chain, rec.pairAddress, rec.tokenAddress, rec.baseSymbol, rec.baseToken) == (
+        "solana", "pair1", "tok1", "ONE", "Token One")
+    assert rec.priceUsd == 0.0123
+    assert rec.liquidityUsd == 12000.5
+    assert rec.volume24hUsd == 3400.0
+    assert rec.txns24h == 15
+    assert rec.priceChange24h == -12.5
+    assert rec.createdAt == 1700000000000
+
+
+def test_pair_record_tolerates_missing_and_flat_fields():
+    rec = normalize.pair_record({"pairId": "p", "volume24hUsd": "7", "liquidity": 50, "txns": {"h24": 3},
+                                 "priceUsd": "n/a"})
+    assert (rec.pairAddress, rec.volume24hUsd, rec.liquidityUsd, rec.txns24h) == ("p", 7.0, 50.0, 3)
+    assert rec.priceUsd is None
+    assert rec.priceChange24h is None
+
+
+def test_records_from_payload_decodes_and_filters_chain():
+    raw = json.dumps({"pairs": [PAIR, dict(PAIR, chainId="base", pairAddress="pair2")]}).encode()
+    assert [r.pairAddress for r in normalize.records_from_payload(raw)] == ["pair1"]
+    assert len(list(normalize.records_from_payload(raw, chain=None))) == 2
+
+
+def test_fastjson_large_payload_and_invalid_json():
+    big = json.dumps({"pairs": [PAIR] * 2000}).encode()
+    assert len(big) > fastjson.GC_PAUSE_BYTES
+    assert len(fastjson.loads(big)["pairs"]) == 2000
+    with pytest.raises(ValueError):
+        fastjson.loads(b"{not json")
@@ -0,0 +1,79 @@
+import csv
+import pathlib
+import sys
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+import collector  # noqa: E402
+import price_index  # noqa: E402
+
+
+def _write(path, rows, extra=()):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=list(collector.HEADERS) + list(extra))
+        w.writeheader()
+        w.writerows(rows)
+
+
+def test_first_seen_built_from_csvs_and_incremental(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _write(tmp_path / "archive" / "2025-08" / "top10_2025-08-30.csv",
+           [{"date": "2025-08-30", "tokenAddress": "a", "priceUsd": "0.5", "createdAt": "1700"}])
+    _write(tmp_path / "data" / "top10_2025-09-01.csv",
+           [{"date": "2025-09-01", "tokenAddress": "a", "priceUsd": "2"},
+            {"date": "2025-09-01", "tokenAddress": "b", "priceUsd": ""}])
+    _write(tmp_path / "data" / "intraday_2025-09-01.csv",
+           [{"date": "2025-09-01", "tokenAddress": "b", "priceUsd": "4", "snapshotAt": "2025-09-01T10:00:00"}],
+           extra=["snapshotAt"])
+
+    index = price_index.PriceIndex()
+    assert index.ingest() == 3
+    assert index.ingest() == 0
+    assert index.first_seen("a") == price_index.FirstSeen(0.5, 1700, "2025-08-30")
+    assert index.early_return("a", 1.5) == 3.0
+    assert index.early_return("b", 2) == 0.5
+    assert index.early_return("zzz", 1) == ""
+
+    # stat inchangé : aucun fichier n'est relu
+    monkeypatch.setattr(price_index, "content_id", lambda *a: pytest.fail("file re-hashed"))
+    assert index.ingest() == 0
+    monkeypatch.undo()
+    monkeypatch.chdir(tmp_path)
+
+    index.observe([{"tokenAddress": "a", "priceUsd": 9}, {"tokenAddress": "c", "priceUsd": 1}], "2025-09-02")
+    assert index.first_seen("a").price == 0.5
+    assert index.early_return("c", 3) == 3.0
+
+
+def test_first_seen_is_per_chain(tmp_path):
+    index = price_index.PriceIndex(str(tmp_path / "idx.sqlite"))
+    index.observe([{"chain": "base", "tokenAddress": "0xabc", "priceUsd": 1},
+                   {"chain": "bsc", "tokenAddress": "0xabc", "priceUsd": 4}], "2025-09-01")
+
+    assert index.early_return("0xabc", 2, "base") == 2.0
+    assert index.early_return("0xabc", 2, "bsc") == 0.5
+    assert index.early_return("0xabc", 2) == ""  # inconnu sur solana
+    index.close()
+
+
+def test_main_fills_early_return_multiple(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _write(tmp_path / "data" / "top10_2019-12-31.csv",
+           [{"date": "2019-12-31", "tokenAddress": "token1", "priceUsd": "0.25"}])
+
+    def fake_fetch(api_key, max_pairs=500):
+        return [{"tokenAddress": "token1", "priceUsd": 1.0, "liquidityUsd": 10000, "volume24hUsd": 1}]
+
+    monkeypatch.setattr(collector, "fetch_new_pairs_dexscreener", fake_fetch)
+    monkeypatch.setattr(collector, "enrich_birdeye", lambda t, k: {})
+    monkeypatch.setattr(collector, "now_iso_date", lambda: "2020-01-01")
+
+    collector.main()
+
+    with (tmp_path / "data" / "top10_2020-01-01.csv").open() as f:
+        row = next(csv.DictReader(f))
+    assert row["earlyReturnMultiple"] == "4.0"
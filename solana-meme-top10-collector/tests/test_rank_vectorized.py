@@ -0,0 +1,87 @@
+import pathlib
+import random
+import sys
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+import collector  # noqa: E402
+from records import PairRecord  # noqa: E402
+
+
+def _real_pandas():
+    """
+    pandas installé, même si le shim pandas.py de la racine du dépôt le masque
+    (pytest lancé depuis la racine) ; le module déjà chargé est remis en place.
+    """
+    shadow = sys.modules.pop("pandas", None)
+    repo = ROOT.parent.resolve()
+    saved_path = list(sys.path)
+    sys.path[:] = [p for p in sys.path if pathlib.Path(p or ".").resolve() != repo]
+    try:
+        import pandas as real
+    except ImportError:
+        real = None
+    finally:
+        sys.path[:] = saved_path
+        if shadow is not None:
+            sys.modules["pandas"] = shadow
+    return real if real is not None and hasattr(real, "to_numeric") else None
+
+
+pd = _real_pandas()
+if pd is None:
+    pytest.skip("real pandas required for the vectorized path", allow_module_level=True)
+
+
+@pytest.fixture(autouse=True)
+def _use_real_pandas(monkeypatch):
+    monkeypatch.setattr(collector, "_pandas", lambda: pd)
+
+
+def _frame(seed, n):
+    rng = random.Random(seed)
+    nan = float("nan")
+    rows = [
+        {
+            "tokenAddress": rng.choice([None, "", nan] + [f"t{j}" for j in range(30)]),
+            "liquidityUsd": rng.choice([None, "abc", nan, 4999, 5000, 9000, "7000"]),
+            "priceChange24h": rng.choice([None, nan, 0, 1, 2, "2"]),
+            "volume24hUsd": rng.choice([None, nan, 0, 10, 20, "30"]),
+            "i": i,
+        }
+        for i in range(n)
+    ]
+    return pd.DataFrame(rows, columns=["tokenAddress", "liquidityUsd", "priceChange24h", "volume24hUsd", "i"])
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_vectorized_matches_python_path_with_ties_and_nans(seed):
+    df = _frame(seed, 300)
+    vec = collector._rank_top10_pandas(df, 10, 5000)
+    ref = collector._rank_top10_python(df.to_dict("records"), 10, 5000)
+    assert list(vec["i"]) == [r["i"] for r in ref]
+
+
+def test_rank_top10_uses_vectorized_path_for_dataframes(monkeypatch):
+    calls = []
+    monkeypatch.setattr(collector, "_rank_top10_python", lambda *a: calls.append(a) or [])
+    df = _frame(0, 50)
+    res = collector.rank_top10(df)
+    assert calls == []
+    assert list(res.columns) == list(df.columns)
+
+
+def test_rank_records_vectorizes_large_pools(monkeypatch):
+    rng = random.Random(7)
+    pairs = [PairRecord(tokenAddress=f"t{rng.randrange(200)}", pairAddress=f"p{i}",
+                        liquidityUsd=rng.choice([None, 1000, 9000]), priceChange24h=rng.choice([None, 1, 2, 3]),
+                        volume24hUsd=rng.choice([None, 10, 20]))
+             for i in range(1000)]
+    expected = [r.pairAddress for r in collector.rank_records(pairs)]
+
+    monkeypatch.setattr(collector, "RANK_VECTORIZE_MIN_ROWS", 500)
+    monkeypatch.setattr(collector, "_rank_top10_python", lambda *a: pytest.fail("streaming path used"))
+    assert [r.pairAddress for r in collector.rank_records(pairs)] == expected
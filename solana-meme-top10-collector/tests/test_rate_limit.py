@@ -0,0 +1,83 @@
+import json
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+import http_client  # noqa: E402
+import rate_limit  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class DummyResponse:
+    def __init__(self, status_code, data, headers=None):
+        self.status_code = status_code
+        self._data = data
+        self.content = json.dumps(data).encode()
+        self.headers = headers or {}
+
+    def json(self):
+        return self._data
+
+
+def test_token_bucket_paces_after_burst():
+    clock = FakeClock()
+    bucket = rate_limit.TokenBucket(rate=2.0, burst=2, clock=clock)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.5
+    assert bucket.reserve() == 1.0
+
+    clock.now += 10
+    assert bucket.reserve() == 0.0
+
+
+def test_token_bucket_pause_blocks_host():
+    clock = FakeClock()
+    bucket = rate_limit.TokenBucket(rate=100.0, burst=10, clock=clock)
+    bucket.pause(3)
+
+    assert bucket.reserve() == 3.0
+    clock.now += 3
+    assert bucket.blocked_for() == 0.0
+
+
+def test_parse_retry_after_seconds_and_date():
+    assert rate_limit.parse_retry_after("7") == 7.0
+    assert rate_limit.parse_retry_after("Wed, 21 Oct 2015 07:28:05 GMT", now=1445412480.0) == 5.0
+    assert rate_limit.parse_retry_after("garbage") is None
+
+
+def test_observe_reads_ratelimit_reset_when_exhausted():
+    headers = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "4"}
+    assert rate_limit.observe("https://example.org/x", 200, headers) == 4.0
+    assert rate_limit.observe("https://example.org/x", 200, {"X-RateLimit-Remaining": "12"}) is None
+
+
+def test_http_client_honours_retry_after(monkeypatch):
+    responses = [DummyResponse(429, {}, {"Retry-After": "3"}), DummyResponse(200, {"ok": True})]
+    sleeps = []
+    clock = FakeClock()
+
+    async def fake_sleep(s):
+        sleeps.append(s)
+        clock.now += s
+
+    monkeypatch.setattr(http_client._session(), "get", lambda *a, **k: responses.pop(0))
+    monkeypatch.setattr(http_client, "_sleep", fake_sleep)
+    monkeypatch.setitem(rate_limit.RATE_LIMITS, "api.example.com", (1000.0, 10.0))
+    monkeypatch.setattr(rate_limit, "_buckets", {"api.example.com": rate_limit.TokenBucket(1000.0, 10, clock=clock)})
+
+    data = http_client.get_json("https://api.example.com/q", retries=2)
+
+    assert data == {"ok": True}
+    assert sleeps == [3.0]
@@ -0,0 +1,99 @@
+import asyncio
+import csv
+import datetime
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+import backfill  # noqa: E402
+import raw_archive  # noqa: E402
+import response_cache  # noqa: E402
+import utils  # noqa: E402
+
+
+def _pair(addr, token, liq, chg, chain="solana"):
+    return {"chainId": chain, "pairAddress": addr, "baseToken": {"address": token, "symbol": token.upper()},
+            "liquidity": {"usd": liq}, "priceChange": {"h24": chg}, "volume": {"h24": 100}, "priceUsd": "1"}
+
+
+def test_append_iterate_and_lookup(tmp_path):
+    archive = raw_archive.RawArchive(str(tmp_path), codec="gzip", clock=lambda: 1.0)
+    archive.append("dexscreener", "pair", "tokA", _pair("p1", "tokA", 1, 1), date_str="2025-09-01")
+    archive.append("birdeye", "token_holders", "tokA", {"data": {"holders": 5}}, date_str="2025-09-01")
+    archive.append("dexscreener", "pair", "tokB", _pair("p2", "tokB", 1, 1, "base"), chain="base",
+                   date_str="2025-09-01")
+    assert raw_archive.read_index("2025-09-01", str(tmp_path)) == []  # bloc encore en mémoire
+    archive.flush()
+
+    pairs = list(raw_archive.iter_day("2025-09-01", str(tmp_path), source="dexscreener"))
+    assert [r["data"]["pairAddress"] for r in pairs] == ["p1", "p2"]
+    assert [r["key"] for r in raw_archive.iter_day("2025-09-01", str(tmp_path), chain="base")] == ["tokB"]
+
+    found = raw_archive.lookup("2025-09-01", "tokA", str(tmp_path), kind="token_holders")
+    assert [r["data"] for r in found] == [{"data": {"holders": 5}}]
+    assert raw_archive.lookup("2025-09-02", "tokA", str(tmp_path)) == []
+
+
+def test_truncated_tail_keeps_earlier_records(tmp_path):
+    archive = raw_archive.RawArchive(str(tmp_path), codec="gzip", block_records=2)
+    for i in range(4):
+        archive.append("birdeye", "token_security", f"t{i}", {"i": i}, date_str="2025-09-01")
+    path, _ = archive.data_path("2025-09-01")
+    index = raw_archive.read_index("2025-09-01", str(tmp_path))
+    assert [(e.key, e.line) for e in index] == [("t0", 0), ("t1", 1), ("t2", 0), ("t3", 1)]
+    last = index[-1]
+    data = pathlib.Path(path).read_bytes()
+    pathlib.Path(path).write_bytes(data[:last.offset + last.length // 2])  # crash en plein milieu du dernier bloc
+
+    assert [r["key"] for r in raw_archive.iter_day("2025-09-01", str(tmp_path))] == ["t0", "t1"]
+    assert raw_archive.lookup("2025-09-01", "t1", str(tmp_path))[0]["data"] == {"i": 1}
+
+
+def test_prune_drops_old_days(tmp_path):
+    archive = raw_archive.RawArchive(str(tmp_path), codec="gzip")
+    archive.append("birdeye", "token_holders", "t", {}, date_str="2025-01-01")
+    archive.append("birdeye", "token_holders", "t", {}, date_str="2025-09-01")
+    archive.flush()
+
+    assert archive.prune(30, now=datetime.date(2025, 9, 10)) == 2
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["2025-09-01.idx", "2025-09-01.ndjson.gz"]
+
+
+def test_birdeye_responses_are_archived(monkeypatch, tmp_path):
+    monkeypatch.setenv("RAW_ARCHIVE_DIR", str(tmp_path / "raw"))
+    monkeypatch.setattr(response_cache, "default_cache", lambda: None)
+
+    async def fake_ahttp_get(url, headers=None, params=None, **kwargs):
+        if url.endswith("token_holders"):
+            return {"data": {"holders": 9}}
+        return {"_error": "timeout"}  # les erreurs ne sont pas archivées
+
+    monkeypatch.setattr(utils, "ahttp_get", fake_ahttp_get)
+    asyncio.run(utils.aenrich_birdeye("tokA", "key"))
+    raw_archive.flush()  # écriture faite hors de la boucle, par le thread dédié
+
+    records = list(raw_archive.iter_day(raw_archive.today(), str(tmp_path / "raw")))
+    assert [(r["source"], r["kind"], r["key"], r["data"]) for r in records] == [
+        ("birdeye", "token_holders", "tokA", {"data": {"holders": 9}})]
+
+
+def test_backfill_replays_raw_archive_offline(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("RAW_ARCHIVE_DIR", str(tmp_path / "raw"))
+    archive = raw_archive.RawArchive(str(tmp_path / "raw"), codec="gzip")
+    day = "2025-09-01"
+    for p in (_pair("p1", "tokA", 50000, 10), _pair("p2", "tokB", 1000, 90), _pair("p3", "tokC", 30000, 20)):
+        archive.append("dexscreener", "pair", p["baseToken"]["address"], p, date_str=day)
+    archive.append("birdeye", "token_holders", "tokA", {"data": {"holders": 321}}, date_str=day)
+    archive.append("birdeye", "token_security", "tokA", {"data": {"mint_authority_exists": False}}, date_str=day)
+    archive.flush()
+
+    result = backfill.replay_day(day, min_liquidity=20000)
+
+    assert result.source == "raw" and result.candidates == 3
+    with open(result.output, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [r["pairAddress"] for r in rows] == ["p3", "p1"]
+    assert rows[1]["holders"] == "321" and rows[1]["hasMintAuth"] == "False" and rows[1]["date"] == day
@@ -0,0 +1,52 @@
+import csv
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+import collector  # noqa: E402
+from records import FIELDS, PairRecord, as_record  # noqa: E402
+
+
+def test_fields_follow_csv_headers_and_use_slots():
+    assert FIELDS == tuple(collector.HEADERS)
+    rec = PairRecord(tokenAddress="tok")
+    assert not hasattr(rec, "__dict__")
+    assert rec.get("tokenAddress") == "tok"
+    assert rec.get("missing", 1) == 1
+
+
+def test_from_mapping_defaults_and_enrichment_in_place():
+    rec = as_record({"chain": None, "tokenAddress": "t", "priceUsd": 1.5, "extra": "ignored"})
+    assert rec.chain == "solana"
+    assert rec.baseSymbol == ""
+    rec.apply_enrichment({"holders": 3, "hasMintAuth": False})
+    assert (rec.holders, rec.hasMintAuth, rec.hasFreezeAuth) == (3, False, None)
+    assert as_record(rec) is rec
+
+
+def test_rank_records_and_csv_writer_take_records(tmp_path):
+    pairs = [
+        PairRecord(tokenAddress="a", liquidityUsd=9000, priceChange24h=1, volume24hUsd=5),
+        {"tokenAddress": "b", "liquidityUsd": 9000, "priceChange24h": 2, "volume24hUsd": 5},
+    ]
+    ranked = collector.rank_records(iter(pairs))
+    assert [r.tokenAddress for r in ranked] == ["b", "a"]
+    assert ranked[1] is pairs[0]
+
+    out = tmp_path / "data" / "out.csv"
+    collector._write_csv(ranked, str(out))
+    with out.open() as f:
+        rows = list(csv.DictReader(f))
+    assert [r["tokenAddress"] for r in rows] == ["b", "a"]
+    assert rows[0]["holders"] == ""
+
+
+def test_enrichment_notes_are_appended_once():
+    rec = PairRecord(notes="manual")
+    rec.apply_enrichment({"hasMintAuth": False, "notes": "top10Holders=42.0%"})
+    rec.apply_enrichment({"hasMintAuth": False, "notes": "top10Holders=42.0%"})
+
+    assert rec.hasMintAuth is False
+    assert rec.notes == "manual; top10Holders=42.0%"
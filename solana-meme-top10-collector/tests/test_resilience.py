@@ -0,0 +1,145 @@
+import asyncio
+import pathlib
+import sys
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+import metrics  # noqa: E402
+import resilience  # noqa: E402
+import response_cache  # noqa: E402
+import utils  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_breaker_opens_fails_fast_and_recovers_through_a_probe():
+    clock = FakeClock()
+    breaker = resilience.CircuitBreaker("x", error_rate=0.5, min_calls=4, window=10, open_s=30, clock=clock)
+    for ok in (True, False, False, True):
+        assert breaker.allow()
+        breaker.record(ok)
+    assert breaker.state == resilience.OPEN
+    assert not breaker.allow()
+
+    clock.now += 30
+    assert breaker.allow()  # sonde half-open
+    assert not breaker.allow()  # une seule à la fois
+    breaker.record(False)
+    assert breaker.state == resilience.OPEN
+
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record(True)
+    assert breaker.state == resilience.CLOSED and breaker.allow()
+
+
+def test_hedge_wins_when_primary_is_slow():
+    metrics.reset()
+    latency = resilience.LatencyTracker()
+    for _ in range(10):
+        latency.observe(0.02)
+    calls = []
+
+    async def call(timing):
+        calls.append(len(calls))
+        timing.started.set()
+        if len(calls) == 1:
+            await asyncio.sleep(2)
+            return "slow"
+        timing.seconds = 0.01
+        return "fast"
+
+    t0 = time.perf_counter()
+    assert asyncio.run(resilience.ahedged(call, latency)) == "fast"
+    assert time.perf_counter() - t0 < 0.5
+    assert metrics.snapshot()["counters"]["hedges_won"] == 1
+
+
+def test_queue_wait_and_host_pause_do_not_trigger_a_hedge():
+    metrics.reset()
+    latency = resilience.LatencyTracker()
+    for _ in range(10):
+        latency.observe(0.02)
+
+    async def queued(timing):
+        await asyncio.sleep(0.3)  # rate limit / slot de l'hôte : rien n'est encore parti
+        timing.started.set()
+        timing.seconds = 0.01
+        return "ok"
+
+    assert asyncio.run(resilience.ahedged(queued, latency)) == "ok"
+
+    async def slow(timing):
+        timing.started.set()
+        await asyncio.sleep(0.3)
+        timing.seconds = 0.3
+        return "ok"
+
+    assert asyncio.run(resilience.ahedged(slow, latency, hold=lambda: True)) == "ok"
+    assert "hedges_sent" not in metrics.snapshot()["counters"]
+
+
+def test_no_hedge_without_latency_history():
+    async def call(timing):
+        timing.started.set()
+        await asyncio.sleep(0.05)
+        timing.seconds = 0.05
+        return "only"
+
+    latency = resilience.LatencyTracker()
+    assert asyncio.run(resilience.ahedged(call, latency)) == "only"
+    assert latency.percentile(50, min_samples=1) is not None
+
+
+def test_birdeye_breaker_stops_calling_a_failing_endpoint(monkeypatch):
+    resilience.reset()
+    monkeypatch.setenv("RAW_ARCHIVE", "0")
+    monkeypatch.setattr(response_cache, "default_cache", lambda: None)
+    calls = []
+
+    async def fake_ahttp_get(url, headers=None, params=None, **kwargs):
+        calls.append(url)
+        return {"_error": "status 503", "_status": 503}
+
+    monkeypatch.setattr(utils, "ahttp_get", fake_ahttp_get)
+    for i in range(30):
+        out = asyncio.run(utils.aenrich_birdeye(f"tok{i}", "key"))
+        assert out["holders"] is None and out["hasMintAuth"] is None
+
+    # 10 échecs par endpoint ouvrent le circuit ; ensuite plus aucun appel réseau
+    assert len(calls) == 2 * resilience.BREAKER_MIN_CALLS
+    assert resilience.breaker("birdeye:solana:token_holders").state == resilience.OPEN
+    # breaker par chaîne : Base n'est pas coupée par la panne Solana
+    asyncio.run(utils.aenrich_birdeye("tok", "key", chain="base"))
+    assert len(calls) == 2 * resilience.BREAKER_MIN_CALLS + 2
+    resilience.reset()
+
+
+def test_birdeye_breaker_ignores_token_level_errors(monkeypatch):
+    resilience.reset()
+    monkeypatch.setenv("RAW_ARCHIVE", "0")
+    monkeypatch.setattr(response_cache, "default_cache", lambda: None)
+    calls = []
+
+    async def fake_ahttp_get(url, headers=None, params=None, **kwargs):
+        calls.append(url)
+        if url.endswith("token_holders"):
+            return {"_error": "GET ... failed: status 400", "_status": 400}
+        return {"success": False, "message": "unsupported token"}
+
+    monkeypatch.setattr(utils, "ahttp_get", fake_ahttp_get)
+    for i in range(30):
+        asyncio.run(utils.aenrich_birdeye(f"tok{i}", "key"))
+
+    assert len(calls) == 60
+    assert resilience.breaker("birdeye:solana:token_holders").state == resilience.CLOSED
+    assert resilience.breaker("birdeye:solana:token_security").state == resilience.CLOSED
+    resilience.reset()
@@ -0,0 +1,116 @@
+import asyncio
+import pathlib
+import sys
+import threading
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+import response_cache  # noqa: E402
+import utils  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_per_endpoint_and_stale_entries(tmp_path):
+    clock = FakeClock()
+    cache = response_cache.ResponseCache(
+        str(tmp_path / "c.sqlite"), ttls={"token_security": 100, "token_holders": 10}, clock=clock
+    )
+    cache.put("token_security", "tok", {"data": {"mint_authority_exists": False}})
+    cache.put("token_holders", "tok", {"data": {"holders": 42}})
+
+    clock.now += 50
+    assert cache.get("token_security", "tok").fresh is True
+    stale = cache.get("token_holders", "tok")
+    assert stale.fresh is False
+    assert stale.payload == {"data": {"holders": 42}}
+    assert cache.get("token_holders", "other") is None
+
+
+def test_lru_eviction(tmp_path):
+    clock = FakeClock()
+    cache = response_cache.ResponseCache(str(tmp_path / "c.sqlite"), max_entries=2, clock=clock)
+    cache.put("token_holders", "a", 1)
+    clock.now += 1
+    cache.put("token_holders", "b", 2)
+    clock.now += 1
+    cache.get("token_holders", "a")
+    clock.now += 1
+    cache.put("token_holders", "c", 3)
+
+    assert len(cache) == 2
+    assert cache.get("token_holders", "b") is None
+    assert cache.get("token_holders", "a").payload == 1
+
+
+def test_birdeye_get_uses_cache_and_stale_on_error(monkeypatch, tmp_path):
+    clock = FakeClock()
+    cache = response_cache.ResponseCache(str(tmp_path / "c.sqlite"), ttls={"token_holders": 10}, clock=clock)
+    monkeypatch.setattr(response_cache, "default_cache", lambda: cache)
+    monkeypatch.setenv("RAW_ARCHIVE", "0")
+    answers = [{"data": {"holders": 7}}, {"_error": "timeout"}]
+    calls = []
+
+    async def fake_ahttp_get(url, headers=None, params=None, **kwargs):
+        calls.append(url)
+        return answers.pop(0)
+
+    monkeypatch.setattr(utils, "ahttp_get", fake_ahttp_get)
+
+    first = asyncio.run(utils.abirdeye_get("token_holders", "tok", {}))
+    cached = asyncio.run(utils.abirdeye_get("token_holders", "tok", {}))
+    clock.now += 60
+    stale = asyncio.run(utils.abirdeye_get("token_holders", "tok", {}))
+
+    assert first == cached == stale == {"data": {"holders": 7}}
+    assert len(calls) == 2
+
+
+def test_hits_and_puts_do_not_scan_or_write_per_read(tmp_path):
+    clock = FakeClock()
+    cache = response_cache.ResponseCache(str(tmp_path / "c.sqlite"), max_entries=100, clock=clock)
+    for i in range(50):
+        cache.put("token_holders", f"t{i}", i)
+    statements = []
+    cache._db.set_trace_callback(statements.append)
+
+    for _ in range(20):
+        assert cache.get("token_holders", "t0").payload == 0
+    assert not [q for q in statements if q.startswith("UPDATE")]  # dates d'accès gardées en mémoire
+    cache.put("token_holders", "t50", 50)
+
+    assert not [q for q in statements if "COUNT(*)" in q]
+    assert sum(q.startswith("UPDATE") for q in statements) == 1  # écrites avec la prochaine écriture
+    cache.close()
+
+
+def test_birdeye_get_reads_and_writes_cache_off_the_loop(monkeypatch, tmp_path):
+    cache = response_cache.ResponseCache(str(tmp_path / "c.sqlite"))
+    threads = []
+    for name in ("get", "put"):
+        method = getattr(cache, name)
+        monkeypatch.setattr(cache, name, lambda *a, _m=method, _n=name: threads.append(
+            (_n, threading.current_thread().name)) or _m(*a))
+    monkeypatch.setattr(response_cache, "default_cache", lambda: cache)
+    monkeypatch.setenv("RAW_ARCHIVE", "0")
+
+    async def fake_ahttp_get(url, headers=None, params=None, **kwargs):
+        return {"data": {"holders": 7}}
+
+    async def run():
+        loop_thread = threading.current_thread().name
+        await utils.abirdeye_get("token_holders", "tok", {})
+        return loop_thread
+
+    monkeypatch.setattr(utils, "ahttp_get", fake_ahttp_get)
+    loop_thread = asyncio.run(run())
+
+    assert [n for n, _ in threads] == ["get", "put"]
+    assert all(t != loop_thread for _, t in threads)
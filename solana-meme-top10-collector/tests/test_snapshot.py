@@ -0,0 +1,89 @@
+import csv
+import datetime
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+import collector  # noqa: E402
+import dexscreener_client  # noqa: E402
+import snapshot  # noqa: E402
+
+
+def _pair(addr, token, vol, chg=1.0):
+    return {"chainId": "solana", "pairAddress": addr, "baseToken": {"address": token, "symbol": token.upper()},
+            "liquidity": {"usd": 10000}, "volume": {"h24": vol}, "priceChange": {"h24": chg}}
+
+
+def test_ticks_refresh_known_pairs_and_enrich_only_entrants(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    discoveries = [[_pair("p1", "a", 100)], [_pair("p2", "b", 50)]]
+    refreshed_with = []
+    enriched = []
+
+    async def fake_discover(queries=None, limit=None, *, api_key=None):
+        return discoveries.pop(0)
+
+    async def fake_refresh(chain_id, pair_ids, *, api_key=None):
+        refreshed_with.append(sorted(pair_ids))
+        return [_pair(p, "a", 999, chg=5.0) for p in pair_ids]
+
+    def fake_enrich(token_address, birdeye_key):
+        enriched.append(token_address)
+        return {"holders": 1, "exitLiquidity": 2, "hasMintAuth": False, "hasFreezeAuth": True}
+
+    monkeypatch.setattr(dexscreener_client, "adiscover_pairs_solana", fake_discover)
+    monkeypatch.setattr(dexscreener_client, "arefresh_pairs", fake_refresh)
+    monkeypatch.setattr(collector, "enrich_birdeye", fake_enrich)
+
+    now = datetime.datetime(2025, 9, 1, 12, 0, tzinfo=datetime.timezone.utc)
+    state = snapshot.SnapshotState()
+    snapshot.tick(state, now=now)
+    state.save()
+    state = snapshot.SnapshotState.load()
+    top = snapshot.tick(state, now=now + datetime.timedelta(minutes=5))
+
+    assert refreshed_with == [[], ["p1"]]
+    assert enriched == ["a", "b"]
+    assert [(r.pairAddress, r.volume24hUsd) for r in top] == [("p1", 999.0), ("p2", 50.0)]
+    assert top[0].hasFreezeAuth is True
+
+    with open(tmp_path / "data" / "intraday_2025-09-01.csv", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0].keys()) == snapshot.SNAPSHOT_HEADERS
+    assert [r["snapshotAt"][11:16] for r in rows] == ["12:00", "12:05", "12:05"]
+
+
+def test_state_rolls_enrichments_on_new_day():
+    state = snapshot.SnapshotState(date="2025-09-01", known={"p": 1.0}, enriched={"a": {}})
+    state.roll("2025-09-02")
+    assert state.enriched == {}
+    assert state.known == {"p": 1.0}
+
+
+def test_failed_enrichment_is_retried_on_next_tick(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    outcomes = [dict(collector.EMPTY_ENRICHMENT), {"holders": 7, "exitLiquidity": None,
+                                                   "hasMintAuth": False, "hasFreezeAuth": False}]
+    calls = []
+
+    async def fake_discover(queries=None, limit=None, *, api_key=None):
+        return [_pair("p1", "a", 100)]
+
+    async def fake_refresh(chain_id, pair_ids, *, api_key=None):
+        return []
+
+    monkeypatch.setattr(dexscreener_client, "adiscover_pairs_solana", fake_discover)
+    monkeypatch.setattr(dexscreener_client, "arefresh_pairs", fake_refresh)
+    monkeypatch.setattr(collector, "enrich_birdeye", lambda token, key: calls.append(token) or outcomes.pop(0))
+
+    now = datetime.datetime(2025, 9, 1, 12, 0, tzinfo=datetime.timezone.utc)
+    state = snapshot.SnapshotState()
+    snapshot.tick(state, now=now)
+    assert state.enriched == {}
+    top = snapshot.tick(state, now=now + datetime.timedelta(minutes=5))
+    snapshot.tick(state, now=now + datetime.timedelta(minutes=10))
+
+    assert calls == ["a", "a"]
+    assert top[0].holders == 7
@@ -0,0 +1,33 @@
+import csv
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "benchmarks"))
+
+import collector  # noqa: E402
+import dexscreener_client  # noqa: E402
+import utils  # noqa: E402
+from standin import StandIn  # noqa: E402
+
+
+def test_main_against_local_standin_with_429s(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("RESPONSE_CACHE", "0")
+    monkeypatch.setenv("PRICE_INDEX", "0")
+    monkeypatch.setattr(collector, "now_iso_date", lambda: "2020-01-01")
+    monkeypatch.setattr(collector, "BIRDEYE_KEY", "bench")
+
+    with StandIn(pairs=60, rate_429=0.2, retry_after_s=0) as server:
+        monkeypatch.setattr(dexscreener_client, "BASE_URL", server.url)
+        monkeypatch.setattr(utils, "BIRDEYE_BASE", server.url)
+        collector.main()
+
+    assert server.counts["search"] >= len(dexscreener_client.discovery_queries())
+    assert server.counts["token_holders"] >= 10
+    assert server.counts["429"] > 0
+    with (tmp_path / "data" / "top10_2020-01-01.csv").open() as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 10
+    assert sum(1 for r in rows if r["holders"]) >= 5
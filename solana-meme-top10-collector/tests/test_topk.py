@@ -0,0 +1,49 @@
+import pathlib
+import random
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+import collector  # noqa: E402
+from topk import TopK, top_k  # noqa: E402
+
+
+def test_bounded_heap_matches_stable_sort():
+    rng = random.Random(7)
+    items = [{"id": i, "v": rng.randint(0, 20)} for i in range(2000)]
+    ranker = TopK(10, key=lambda x: x["v"])
+    ranker.extend(iter(items))
+
+    expected = sorted(items, key=lambda x: x["v"], reverse=True)[:10]
+    assert ranker.result() == expected
+    assert len(ranker._heap) == 10
+    assert ranker.seen == 2000
+
+
+def test_dedupe_keeps_best_pair_per_token_and_filters_on_arrival():
+    pairs = [
+        {"token": "a", "vol": 10, "chg": 5, "liq": 9000},
+        {"token": "a", "vol": 30, "chg": 1, "liq": 9000},
+        {"token": "b", "vol": 99, "chg": 9, "liq": 100},
+        {"token": "c", "vol": 20, "chg": 3, "liq": 9000},
+    ]
+    res = top_k(
+        (p for p in pairs), 10, key=lambda p: p["chg"],
+        keep=lambda p: p["liq"] >= 5000, dedupe_by=lambda p: p["token"], best=lambda p: p["vol"],
+    )
+    assert [(p["token"], p["vol"]) for p in res] == [("c", 20), ("a", 30)]
+
+
+def test_rank_top10_streams_generator_and_dedupes_tokens():
+    rows = (
+        {"tokenAddress": f"t{i % 50}", "liquidityUsd": 6000 if i % 7 else 10,
+         "priceChange24h": i % 13, "volume24hUsd": i}
+        for i in range(1000)
+    )
+    res = collector._rows_from_dataframe(collector.rank_top10(rows))
+
+    assert len(res) == 10
+    assert len({r["tokenAddress"] for r in res}) == 10
+    keys = [(r["priceChange24h"], r["volume24hUsd"]) for r in res]
+    assert keys == sorted(keys, reverse=True)
@@ -0,0 +1,98 @@
+import csv
+import os
+import pathlib
+import subprocess
+import sys
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+import history_store  # noqa: E402
+import validate_csv  # noqa: E402
+
+SCHEMA = str(ROOT / "schemas" / "top10_schema.csv")
+
+
+def _write(path, rows, headers=None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=headers or validate_csv.EXPECTED)
+        w.writeheader()
+        w.writerows(rows)
+
+
+GOOD = {"date": "2025-09-01", "tokenAddress": "t", "priceUsd": "0.5", "txns24h": "12",
+        "createdAt": "1700000000000", "holders": "10.0", "hasMintAuth": "False", "hasFreezeAuth": ""}
+
+
+def test_schema_types_row_matches_expected_headers():
+    schema = validate_csv.load_schema(SCHEMA)
+    assert schema.headers == validate_csv.EXPECTED
+    assert dict(zip(schema.headers, schema.types))["txns24h"] == "int"
+
+
+def test_validates_whole_tree_in_parallel_and_reports_type_errors(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    for day in range(1, 6):
+        _write(tmp_path / "archive" / "2025-08" / f"top10_2025-08-0{day}.csv", [dict(GOOD, notes=str(day))])
+    _write(tmp_path / "data" / "top10_2025-09-01.csv",
+           [GOOD, dict(GOOD, priceUsd="abc", txns24h="1.5", hasMintAuth="maybe", date="2025-13-01")])
+    _write(tmp_path / "data" / "intraday_2025-09-01.csv", [dict(GOOD, snapshotAt="2025-09-01T10:00:00")],
+           headers=validate_csv.EXPECTED + ["snapshotAt"])
+
+    assert validate_csv.main(["--schema", SCHEMA, "--workers", "2"]) == 4
+    out = capsys.readouterr().out
+    for col in ("priceUsd", "txns24h", "hasMintAuth", "date"):
+        assert f"{col}=" in out
+    assert "7 checked, 0 unchanged, 1 invalid" in out
+
+
+def test_manifest_skips_unchanged_files(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    _write(tmp_path / "data" / "top10_2025-09-01.csv", [GOOD])
+    _write(tmp_path / "data" / "top10_2025-09-02.csv", [dict(GOOD, notes="x")])
+
+    assert validate_csv.main(["--schema", SCHEMA]) == 0
+    assert "2 checked, 0 unchanged" in capsys.readouterr().out
+
+    # archive.yml déplace le fichier : même contenu → toujours ignoré
+    src = tmp_path / "data" / "top10_2025-09-01.csv"
+    dest = tmp_path / "archive" / "2025-09" / src.name
+    dest.parent.mkdir(parents=True)
+    src.rename(dest)
+    _write(tmp_path / "data" / "top10_2025-09-03.csv", [])
+    assert validate_csv.main(["--schema", SCHEMA]) == 3
+    assert "1 checked, 2 unchanged" in capsys.readouterr().out
+
+
+def test_bad_headers_and_missing_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert validate_csv.main(["--schema", SCHEMA]) == 1
+    _write(tmp_path / "data" / "top10_2025-09-01.csv", [{"a": 1}], headers=["a"])
+    assert validate_csv.main(["--schema", SCHEMA, "--no-manifest"]) == 2
+
+
+def test_manifest_uses_git_blob_ids_without_hashing(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    for day in range(1, 4):
+        _write(tmp_path / "archive" / "2025-08" / f"top10_2025-08-0{day}.csv", [dict(GOOD, notes=str(day))])
+    _write(tmp_path / "data" / "top10_2025-09-01.csv", [GOOD])
+    if subprocess.run(["git", "init", "-q"]).returncode != 0:
+        pytest.skip("git unavailable")
+    subprocess.run(["git", "add", "archive"], check=True)
+
+    hashed = []
+    real_sha = history_store.file_sha256
+    monkeypatch.setattr(history_store, "file_sha256", lambda p: hashed.append(p) or real_sha(p))
+    monkeypatch.setattr(validate_csv, "file_sha256", lambda p: hashed.append(p) or real_sha(p))
+
+    assert validate_csv.main(["--schema", SCHEMA, "--workers", "1"]) == 0
+    assert "4 checked, 0 unchanged" in capsys.readouterr().out
+    assert hashed == [os.path.join("data", "top10_2025-09-01.csv")]  # seul le fichier non suivi
+
+    hashed.clear()
+    assert validate_csv.main(["--schema", SCHEMA, "--workers", "1"]) == 0
+    assert "0 checked, 4 unchanged" in capsys.readouterr().out
+    assert hashed == [os.path.join("data", "top10_2025-09-01.csv")]
@@ -0,0 +1,84 @@
+"""
+Classement top-K en streaming
+
+- Les éléments arrivent un par un (générateur) : filtre appliqué à l'entrée,
+  tas borné de taille K pour les éléments non dédupliqués.
+- Dédup par token à la volée : on ne garde que la meilleure paire par token
+  (critère `best`, ex. volume 24h) → mémoire O(K + tokens uniques), pas O(N).
+- Égalités : le premier vu l'emporte (même résultat qu'un tri stable décroissant).
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+from typing import Any, Callable, Dict, Generic, Hashable, Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class TopK(Generic[T]):
+    def __init__(self, k: int, key: Callable[[T], Any], *,
+                 keep: Optional[Callable[[T], bool]] = None,
+                 dedupe_by: Optional[Callable[[T], Optional[Hashable]]] = None,
+                 best: Optional[Callable[[T], Any]] = None):
+        """
+        k : taille du classement ; key : clé de tri (décroissante) ;
+        keep : filtre d'entrée ; dedupe_by : identifiant de token (None/"" → pas de dédup) ;
+        best : critère de la paire retenue par token (défaut : key).
+        """
+        self.k = max(0, k)
+        self.key = key
+        self.keep = keep
+        self.dedupe_by = dedupe_by
+        self.best = best or key
+        self.seen = 0
+        self._seq = itertools.count()
+        # (clé, -seq, élément) — min-heap : la racine est le plus faible retenu
+        self._heap: List[Tuple[Any, int, T]] = []
+        # token → (critère best, seq de 1re apparition, élément)
+        self._by_token: Dict[Hashable, Tuple[Any, int, T]] = {}
+
+    def push(self, item: T) -> None:
+        self.seen += 1
+        if self.keep is not None and not self.keep(item):
+            return
+        seq = next(self._seq)
+        token = self.dedupe_by(item) if self.dedupe_by is not None else None
+        if token not in (None, ""):
+            score = self.best(item)
+            cur = self._by_token.get(token)
+            if cur is None:
+                self._by_token[token] = (score, seq, item)
+            elif score > cur[0]:
+                self._by_token[token] = (score, cur[1], item)
+            return
+        if not self.k:
+            return
+        entry = (self.key(item), -seq, item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def extend(self, items: Iterable[T]) -> "TopK[T]":
+        for item in items:
+            self.push(item)
+        return self
+
+    @property
+    def unique_tokens(self) -> int:
+        return len(self._by_token)
+
+    def result(self) -> List[T]:
+        """Les K meilleurs, du meilleur au moins bon."""
+        candidates = itertools.chain(
+            ((key, neg_seq, item) for key, neg_seq, item in self._heap),
+            ((self.key(item), -seq, item) for _, seq, item in self._by_token.values()),
+        )
+        return [item for _, _, item in heapq.nlargest(self.k, candidates, key=lambda e: e[:2])]
+
+
+def top_k(items: Iterable[T], k: int, key: Callable[[T], Any], **kwargs: Any) -> List[T]:
+    """Raccourci : TopK(k, key, **kwargs).extend(items).result()."""
+    return TopK(k, key, **kwargs).extend(items).result()
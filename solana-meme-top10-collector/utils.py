@@ -1,12 +1,22 @@
-import time, requests, logging
+import asyncio, logging, os
 from datetime import datetime, timezone
 
+import dexscreener_client
+from normalize import pair_record
+import http_client
+import metrics
+import raw_archive
+import rate_limit
+import resilience
+import response_cache
+
 DEX_NEW_PAIRS_URLS = [
     "https://api.dexscreener.com/latest/dex/pairs/solana",
     "https://api.dexscreener.com/latest/dex/pairs?chainId=solana",
 ]
-BIRDEYE_BASE = "https://public-api.birdeye.so"
+BIRDEYE_BASE = (os.getenv("BIRDEYE_BASE_URL", "") or "https://public-api.birdeye.so").rstrip("/")
 DEFAULT_HEADERS = {"User-Agent": "top10-collector/1.0"}
+EMPTY_ENRICHMENT = {"holders": None, "exitLiquidity": None, "hasMintAuth": None, "hasFreezeAuth": None}
 logger = logging.getLogger(__name__)
 
 def now_iso_date():
@@ -18,23 +28,24 @@ def ts_ms_to_iso(ts_ms: int) -> str:
     except Exception:
         return ""
 
-def http_get(url, headers=None, params=None, timeout=15, retries=3):
+async def ahttp_get(url, headers=None, params=None, timeout=15, retries=3, timing=None):
+    """
+    GET via le moteur partagé ; renvoie {"_error": ..., "_status": code HTTP ou None}
+    au lieu de lever.
+    """
     headers = {**DEFAULT_HEADERS, **(headers or {})}
-    last_error = None
-    for attempt in range(retries):
-        try:
-            r = requests.get(url, headers=headers, params=params, timeout=timeout)
-            if r.status_code == 429 or r.status_code >= 500:
-                logger.warning("http_get retry=%s status=%s", attempt, r.status_code)
-                time.sleep(2 ** attempt)
-                continue
-            r.raise_for_status()
-            return r.json()
-        except Exception as e:
-            last_error = str(e)
-            logger.warning("http_get error attempt=%s err=%s", attempt, e)
-            time.sleep(2 ** attempt)
-    return {"_error": last_error or "unknown"}
+    try:
+        return await http_client.aget_json(url, headers=headers, params=params, timeout=timeout, retries=retries,
+                                           timing=timing)
+    except http_client.DeadlineExceeded as e:
+        logger.info("http_get skipped (run deadline) url=%s", url)
+        return {"_error": str(e), "_deadline": True}
+    except Exception as e:
+        logger.warning("http_get failed url=%s err=%s", url, e)
+        return {"_error": str(e) or "unknown", "_status": getattr(e, "status", None)}
+
+def http_get(url, headers=None, params=None, timeout=15, retries=3):
+    return http_client.run(ahttp_get(url, headers=headers, params=params, timeout=timeout, retries=retries))
 
 def safe_float(x):
     try: return float(x)
@@ -44,56 +55,136 @@ def safe_int(x):
     try: return int(x)
     except: return 0
 
-def fetch_new_pairs_dexscreener(api_key: str | None, max_pairs: int = 500):
+async def afetch_new_pairs_dexscreener(api_key: str | None, max_pairs: int = 500, chain: str = "solana"):
     """
-    Utilise /latest/dex/search?q=SOL puis filtre chainId=solana.
-    Normalise les champs attendus par le collector.
+    Découverte multi-requêtes (dexscreener_client.adiscover_pairs : q=SOL,
+    cotations, termes tendance, mots-clés configurés) dédupliquée par pairAddress.
+    Normalise en PairRecord en une passe (normalize.pair_record).
     """
-    headers = {"X-API-KEY": (api_key or "").strip()} if api_key else {}
-    data = http_get(
-        "https://api.dexscreener.com/latest/dex/search",
-        headers=headers,
-        params={"q": "SOL"},
-    )
-    pairs = (data.get("pairs") or data.get("result") or [])
-    pairs = [p for p in pairs if str(p.get("chainId") or p.get("chain") or "").lower() == "solana"]
-    out = []
-    for p in pairs[:max_pairs]:
-        base = (p.get("baseToken") or {})
-        txns_h24 = ((p.get("txns") or {}).get("h24") or {})
-        out.append({
-            "chain": p.get("chainId") or "solana",
-            "pairAddress": p.get("pairAddress") or p.get("pairId") or "",
-            "tokenAddress": base.get("address") or "",
-            "baseSymbol": base.get("symbol") or "",
-            "baseToken": base.get("name") or "",
-            "priceUsd": safe_float(p.get("priceUsd")),
-            "liquidityUsd": safe_float((p.get("liquidity") or {}).get("usd")),
-            "volume24hUsd": safe_float((p.get("volume24hUsd") or (p.get("volume") or {}).get("h24"))),
-            "txns24h": safe_int(txns_h24.get("buys")) + safe_int(txns_h24.get("sells")),
-            "priceChange24h": safe_float((p.get("priceChange") or {}).get("h24")),
-            "createdAt": p.get("pairCreatedAt") or p.get("createdAt"),
-        })
-    if not out:
-        logger.warning("Dexscreener /latest/dex/search returned no Solana pairs")
+    return (await afetch_pairs_by_chain(api_key, (chain,), max_pairs=max_pairs))[chain]
+
+def fetch_new_pairs_dexscreener(api_key: str | None, max_pairs: int = 500, chain: str = "solana"):
+    return http_client.run(afetch_new_pairs_dexscreener(api_key, max_pairs=max_pairs, chain=chain))
+
+async def afetch_pairs_by_chain(api_key: str | None, chains, max_pairs: int = 500):
+    """Une seule vague de découverte pour toutes les chaînes → {chaîne: [PairRecord]}."""
+    with metrics.stage("fetch"):
+        by_chain = await dexscreener_client.adiscover_pairs(chains, limit=max_pairs,
+                                                            api_key=(api_key or "").strip() or None)
+    with metrics.stage("archive"):
+        for chain, pairs in by_chain.items():
+            for p in pairs:
+                raw_archive.record("dexscreener", "pair", (p.get("baseToken") or {}).get("address"), p, chain=chain)
+    out = {}
+    with metrics.stage("normalise"):
+        for chain, pairs in by_chain.items():
+            out[chain] = [pair_record(p, chain) for p in pairs]
+            if not out[chain]:
+                logger.warning("Dexscreener discovery returned no %s pairs", chain)
     return out
 
-def enrich_birdeye(token_address: str, birdeye_key: str | None):
+def fetch_pairs_by_chain(api_key: str | None, chains, max_pairs: int = 500):
+    return http_client.run(afetch_pairs_by_chain(api_key, chains, max_pairs=max_pairs))
+
+def _cache_key(token_address: str, chain: str) -> str:
+    # clés Solana inchangées ; une adresse EVM peut exister sur plusieurs chaînes
+    return token_address if chain == "solana" else f"{chain}:{token_address}"
+
+def _birdeye_ok(resp):
+    return isinstance(resp, dict) and "_error" not in resp and resp.get("success") is not False
+
+def _birdeye_outage(resp):
+    """
+    Panne de l'endpoint (erreur réseau, 5xx, 429) : seul cas compté en échec par le
+    disjoncteur. Un 4xx ou success=false vise un token (adresse inconnue…), pas l'API.
+    """
+    if not isinstance(resp, dict) or "_error" not in resp:
+        return False
+    status = resp.get("_status")
+    return status is None or status == 429 or status >= 500
+
+async def _abirdeye_call(endpoint: str, token_address: str, headers, chain: str = "solana"):
+    """
+    Appel réseau Birdeye protégé (resilience) : disjoncteur ouvert → échec immédiat ;
+    sinon requête hedgée au-delà du p95 de latence de l'endpoint. Disjoncteur et
+    latences par chaîne : une chaîne en panne ne coupe pas les autres.
+    """
+    name = f"birdeye:{chain}:{endpoint}"
+    breaker = resilience.breaker(name)
+    if not breaker.allow():
+        metrics.incr("breaker_rejected")
+        return {"_error": "circuit open", "_breaker": True}
+    url = f"{BIRDEYE_BASE}/defi/{endpoint}"
+    resp = await resilience.ahedged(
+        lambda timing: ahttp_get(url, headers=headers, params={"address": token_address}, timing=timing),
+        resilience.latency(name), ok=_birdeye_ok, hold=lambda: rate_limit.blocked_for(url) > 0,
+    )
+    if isinstance(resp, dict) and resp.get("_deadline"):  # l'échéance du run n'est pas une panne
+        breaker.release()
+    else:
+        breaker.record(not _birdeye_outage(resp))
+    return resp
+
+async def abirdeye_get(endpoint: str, token_address: str, headers, chain: str = "solana"):
+    """
+    GET /defi/{endpoint} via le cache disque : entrée fraîche → aucun appel ;
+    sinon appel API, et l'entrée périmée sert de repli si l'API échoue.
+    """
+    cache = response_cache.default_cache()
+    key = _cache_key(token_address, chain)
+    loop = asyncio.get_running_loop()
+    # SQLite hors de la boucle : une lecture / écriture disque ne bloque pas les requêtes en vol
+    cached = await loop.run_in_executor(None, cache.get, endpoint, key) if cache is not None else None
+    if cached is not None and cached.fresh:
+        metrics.incr("cache_hits")
+        raw_archive.record("birdeye", endpoint, token_address, cached.payload, chain=chain)
+        return cached.payload
+    if cache is not None:
+        metrics.incr("cache_misses" if cached is None else "cache_expired")
+    resp = await _abirdeye_call(endpoint, token_address, headers, chain)
+    ok = _birdeye_ok(resp)
+    if ok and cache is not None:
+        await loop.run_in_executor(None, cache.put, endpoint, key, resp)
+    elif not ok and cached is not None:
+        logger.info("birdeye %s stale cache used token=%s", endpoint, token_address)
+        metrics.incr("cache_stale_served")
+        resp, ok = cached.payload, True
+    if ok:
+        raw_archive.record("birdeye", endpoint, token_address, resp, chain=chain)
+    return resp
+
+async def aenrich_birdeye(token_address: str, birdeye_key: str | None, chain: str = "solana"):
     if not birdeye_key or not token_address:
-        return {"holders": None, "exitLiquidity": None, "hasMintAuth": None, "hasFreezeAuth": None}
-    headers = {"X-API-KEY": birdeye_key, "accept": "application/json"}
+        return dict(EMPTY_ENRICHMENT)
+    headers = {"X-API-KEY": birdeye_key, "accept": "application/json", "x-chain": chain}
+    # holders + security partent ensemble (plafond par hôte dans http_client)
+    resp, sec = await asyncio.gather(
+        abirdeye_get("token_holders", token_address, headers, chain),
+        abirdeye_get("token_security", token_address, headers, chain),
+    )
+    return enrichment_from(resp, sec)
+
+def enrichment_from(resp, sec):
+    """Champs Birdeye du CSV depuis les réponses brutes token_holders / token_security."""
     holders = None
     try:
-        resp = http_get(f"{BIRDEYE_BASE}/defi/token_holders", headers=headers, params={"address": token_address})
         holders = resp.get("data", {}).get("holders") if isinstance(resp, dict) else None
     except: pass
-    sec = {}
-    try:
-        sec = http_get(f"{BIRDEYE_BASE}/defi/token_security", headers=headers, params={"address": token_address})
-    except: sec = {}
-    return {
+    out = {
         "holders": holders,
         "exitLiquidity": (sec.get("data") or {}).get("exit_liquidity") if isinstance(sec, dict) else None,
         "hasMintAuth": (sec.get("data") or {}).get("mint_authority_exists") if isinstance(sec, dict) else None,
         "hasFreezeAuth": (sec.get("data") or {}).get("freeze_authority_exists") if isinstance(sec, dict) else None,
     }
+    # champs abandonnés à l'échéance du run : signalés dans notes
+    skipped = (["holders"] if isinstance(resp, dict) and resp.get("_deadline") else []) + (
+        ["exitLiquidity", "hasMintAuth", "hasFreezeAuth"] if isinstance(sec, dict) and sec.get("_deadline") else [])
+    if skipped:
+        out["notes"] = deadline_note(skipped)
+    return out
+
+def deadline_note(fields):
+    return "deadline_skipped=" + ",".join(fields)
+
+def enrich_birdeye(token_address: str, birdeye_key: str | None, chain: str = "solana"):
+    return http_client.run(aenrich_birdeye(token_address, birdeye_key, chain))
@@ -1,20 +1,272 @@
-import sys, csv, glob
+"""
+Validation des CSV top10 — tout data/ et archive/**, en parallèle et incrémentale
+
+- Schéma : schemas/top10_schema.csv (1re ligne : en-têtes, 2e ligne : types
+  date / str / int / float / bool ; une cellule vide est toujours acceptée).
+  data/intraday_*.csv : même schéma + colonne snapshotAt.
+- Chaque fichier est vérifié (en-têtes exacts + type de chaque cellule) dans un
+  process worker (VALIDATE_WORKERS, défaut : nb de CPU).
+- Manifeste .cache/validated.json : identifiant de contenu des fichiers déjà valides
+  pour ce schéma → ignorés aux runs suivants (un fichier déplacé par archive.yml
+  garde son identifiant). Pour un fichier suivi par git et non modifié, c'est l'id de
+  blob lu dans l'index (aucune lecture du fichier) ; seuls les fichiers nouveaux ou
+  modifiés sont hashés (SHA-256), une seule fois. Le temps de CI ne grandit pas avec
+  l'archive.
+- Le plus récent data/top10_*.csv de chaque chaîne doit contenir au moins une ligne.
+
+Codes de sortie : 0 OK, 1 aucun CSV, 2 en-têtes invalides, 3 dernier CSV vide,
+4 types invalides.
+
+Usage :
+    python validate_csv.py [--no-manifest] [--workers N] [CSV ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import datetime
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from history_store import content_id, file_sha256, git_blob_ids
+
+SCHEMA_PATH = os.path.join("schemas", "top10_schema.csv")
+MANIFEST_PATH = os.path.join(".cache", "validated.json")
+PATTERNS = (os.path.join("data", "*.csv"), os.path.join("archive", "**", "*.csv"))
+DAILY_PATTERN = os.path.join("data", "top10_*.csv")
+# top10_<date>.csv (Solana) ou top10_<chain>_<date>.csv
+DAILY_NAME = re.compile(r"^top10_(?:(?P<chain>[a-z0-9]+)_)?(?P<date>\d{4}-\d{2}-\d{2})\.csv$")
+INTRADAY_EXTRA = (("snapshotAt", "str"),)
+MAX_ERRORS_PER_FILE = 20
+# en dessous, pas de pool de process (le coût de démarrage dépasse le gain)
+MIN_FILES_FOR_POOL = 4
+
 EXPECTED = [
     "date","chain","baseToken","baseSymbol","pairAddress","tokenAddress",
     "priceUsd","liquidityUsd","volume24hUsd","txns24h","priceChange24h",
     "createdAt","earlyReturnMultiple","holders","exitLiquidity",
     "hasMintAuth","hasFreezeAuth","notes"
 ]
-files = sorted(glob.glob("data/top10_*.csv"))
-if not files:
-    print("No CSV found in data/"); sys.exit(1)
-path = files[-1]
-with open(path, newline="", encoding="utf-8") as f:
-    reader = csv.DictReader(f)
-    if list(reader.fieldnames) != EXPECTED:
-        print("Bad headers:", reader.fieldnames); sys.exit(2)
-    rows = list(reader)
-    if len(rows) == 0:
-        print("CSV has 0 data rows:", path)
-        sys.exit(3)
-print("CSV validated:", path)
+
+
+def _is_float(v: str) -> bool:
+    try:
+        float(v)
+    except ValueError:
+        return False
+    return True
+
+
+def _is_int(v: str) -> bool:
+    try:
+        int(v)
+    except ValueError:
+        # 12.0 (écrit via un float) reste un entier valide
+        try:
+            return float(v).is_integer()
+        except ValueError:
+            return False
+    return True
+
+
+def _is_date(v: str) -> bool:
+    try:
+        datetime.date.fromisoformat(v)
+    except ValueError:
+        return False
+    return True
+
+
+CHECKS: Dict[str, Callable[[str], bool]] = {
+    "str": lambda v: True,
+    "float": _is_float,
+    "int": _is_int,
+    "bool": lambda v: v.strip().lower() in ("true", "false", "1", "0"),
+    "date": _is_date,
+}
+
+
+class Schema(NamedTuple):
+    headers: List[str]
+    types: List[str]
+
+    def for_file(self, path: str) -> "Schema":
+        if os.path.basename(path).startswith("intraday_"):
+            return Schema(self.headers + [h for h, _ in INTRADAY_EXTRA], self.types + [t for _, t in INTRADAY_EXTRA])
+        return self
+
+    def digest(self) -> str:
+        return hashlib.sha256(json.dumps([self.headers, self.types]).encode()).hexdigest()
+
+
+class Result(NamedTuple):
+    path: str
+    digest: str
+    rows: int
+    header_error: Optional[str]
+    type_errors: List[str]
+
+    @property
+    def ok(self) -> bool:
+        return self.header_error is None and not self.type_errors
+
+
+def load_schema(path: str = SCHEMA_PATH) -> Schema:
+    with open(path, newline="", encoding="utf-8") as f:
+        lines = list(csv.reader(f))
+    headers = lines[0]
+    types = lines[1] if len(lines) > 1 else ["str"] * len(headers)
+    if len(types) != len(headers) or any(t not in CHECKS for t in types):
+        raise ValueError(f"invalid types row in {path}: {types}")
+    return Schema(headers, types)
+
+
+def validate_file(path: str, schema: Schema, digest: Optional[str] = None) -> Result:
+    """En-têtes exacts puis type de chaque cellule non vide (erreurs plafonnées)."""
+    schema = schema.for_file(path)
+    digest = digest or file_sha256(path)
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        headers = next(reader, [])
+        if headers != schema.headers:
+            return Result(path, digest, 0, f"bad headers: {headers}", [])
+        checks = [(name, CHECKS[t], t) for name, t in zip(schema.headers, schema.types) if t != "str"]
+        index = {name: i for i, name in enumerate(headers)}
+        errors: List[str] = []
+        rows = 0
+        for rows, row in enumerate(reader, start=1):
+            if len(row) != len(headers):
+                errors.append(f"line {rows + 1}: {len(row)} fields, expected {len(headers)}")
+            else:
+                for name, check, t in checks:
+                    value = row[index[name]]
+                    if value != "" and not check(value):
+                        errors.append(f"line {rows + 1}: {name}={value!r} is not {t}")
+            if len(errors) >= MAX_ERRORS_PER_FILE:
+                break
+    return Result(path, digest, rows, None, errors)
+
+
+def find_files(patterns: Sequence[str] = PATTERNS) -> List[str]:
+    paths = set()
+    for pattern in patterns:
+        paths.update(glob.glob(pattern, recursive=True))
+    return sorted(paths)
+
+
+def load_manifest(path: str, schema: Schema) -> Dict[str, str]:
+    """identifiant de contenu → nom des fichiers déjà valides (vide si le schéma a changé)."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if raw.get("schema") != schema.digest():
+        return {}
+    return dict(raw.get("validated") or {})
+
+
+def save_manifest(path: str, schema: Schema, validated: Dict[str, str]) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"schema": schema.digest(), "validated": validated}, f, indent=0, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def validate_all(paths: Sequence[str], schema: Schema, *, manifest: Optional[Dict[str, str]] = None,
+                 workers: Optional[int] = None) -> Tuple[List[Result], int]:
+    """Valide les fichiers absents du manifeste ; renvoie (résultats, nb ignorés)."""
+    todo: List[str] = []
+    digests: List[Optional[str]] = []
+    skipped = 0
+    blobs = git_blob_ids() if manifest is not None else {}
+    for path in paths:
+        digest = content_id(path, blobs) if manifest is not None else None
+        if digest is not None and digest in manifest:
+            skipped += 1
+        else:
+            todo.append(path)
+            digests.append(digest)
+    if len(todo) < MIN_FILES_FOR_POOL or workers == 1:
+        results = [validate_file(p, schema, d) for p, d in zip(todo, digests)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(validate_file, todo, [schema] * len(todo), digests, chunksize=8))
+    return results, skipped
+
+
+def _env_workers() -> Optional[int]:
+    try:
+        return max(1, int(os.getenv("VALIDATE_WORKERS", "")))
+    except ValueError:
+        return None
+
+
+def latest_daily(paths: Sequence[str]) -> Dict[str, str]:
+    """{chaîne: CSV quotidien le plus récent} parmi les top10_*.csv."""
+    latest: Dict[str, Tuple[str, str]] = {}
+    for path in paths:
+        m = DAILY_NAME.match(os.path.basename(path))
+        if m:
+            chain = m.group("chain") or "solana"
+            if chain not in latest or m.group("date") > latest[chain][0]:
+                latest[chain] = (m.group("date"), path)
+    return {chain: path for chain, (_, path) in sorted(latest.items())}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Validation des CSV top10 (data/ + archive/)")
+    ap.add_argument("paths", nargs="*", help="CSV à valider (défaut : data/*.csv + archive/**/*.csv)")
+    ap.add_argument("--schema", default=SCHEMA_PATH)
+    ap.add_argument("--manifest", default=MANIFEST_PATH)
+    ap.add_argument("--no-manifest", action="store_true", help="tout revalider")
+    ap.add_argument("--workers", type=int, default=_env_workers())
+    args = ap.parse_args(argv)
+
+    schema = load_schema(args.schema)
+    files = sorted(args.paths) if args.paths else find_files()
+    daily = sorted(glob.glob(DAILY_PATTERN))
+    if not files or (not args.paths and not daily):
+        print("No CSV found in data/")
+        return 1
+
+    manifest = None if args.no_manifest else load_manifest(args.manifest, schema)
+    results, skipped = validate_all(files, schema, manifest=manifest, workers=args.workers)
+
+    status = 0
+    for res in results:
+        if res.header_error:
+            print(f"Bad headers: {res.path}: {res.header_error}")
+            status = status or 2
+        for err in res.type_errors:
+            print(f"Bad value: {res.path}: {err}")
+        if res.type_errors:
+            status = status or 4
+
+    # le CSV du jour (le plus récent de chaque chaîne) doit contenir des lignes
+    if not args.paths and status == 0:
+        for latest in latest_daily(daily).values():
+            with open(latest, newline="", encoding="utf-8") as f:
+                if sum(1 for _ in csv.reader(f)) < 2:
+                    print("CSV has 0 data rows:", latest)
+                    status = 3
+
+    if manifest is not None:
+        manifest.update({res.digest: os.path.basename(res.path) for res in results if res.ok})
+        save_manifest(args.manifest, schema, manifest)
+
+    print(f"CSV validated: {len(results)} checked, {skipped} unchanged, "
+          f"{sum(1 for r in results if not r.ok)} invalid")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,83 +1,234 @@
+import heapq
+from array import array
+
+
+# Shim en colonnes : une liste (ou array) par colonne ; masques et head ne
+# copient pas les données, ils produisent une vue (positions retenues).
+
+def _missing(x):
+    return x is None or x != x  # None ou NaN
+
+
+def _positions(index, length):
+    return range(length) if index is None else index
+
+
 class Series:
-    def __init__(self, data=None):
-        self.data = list(data) if data is not None else []
+    def __init__(self, data=None, _index=None):
+        if data is None:
+            data = []
+        elif not isinstance(data, (list, array)):
+            data = list(data)
+        self._data = data
+        self._index = _index
+
+    @property
+    def data(self):
+        if self._index is None:
+            return self._data
+        return [self._data[i] for i in self._index]
+
+    def tolist(self):
+        return list(self)
+
+    to_list = tolist
 
     def fillna(self, value):
-        return Series([value if x is None else x for x in self.data])
+        return Series([value if _missing(x) else x for x in self])
+
+    def isna(self):
+        return Series([_missing(x) for x in self])
+
+    def _compare(self, other, op):
+        return Series([False if _missing(x) else op(x, other) for x in self])
 
     def __ge__(self, other):
-        return Series([x >= other for x in self.data])
+        return self._compare(other, lambda x, o: x >= o)
+
+    def __gt__(self, other):
+        return self._compare(other, lambda x, o: x > o)
+
+    def __le__(self, other):
+        return self._compare(other, lambda x, o: x <= o)
+
+    def __lt__(self, other):
+        return self._compare(other, lambda x, o: x < o)
+
+    def __eq__(self, other):
+        return Series([x == other for x in self])
+
+    def __ne__(self, other):
+        return Series([x != other for x in self])
+
+    def __and__(self, other):
+        return Series([bool(a and b) for a, b in zip(self, other)])
+
+    def __or__(self, other):
+        return Series([bool(a or b) for a, b in zip(self, other)])
+
+    def __invert__(self):
+        return Series([not x for x in self])
+
+    __hash__ = None
 
     def __iter__(self):
-        return iter(self.data)
+        if self._index is None:
+            return iter(self._data)
+        data = self._data
+        return (data[i] for i in self._index)
 
     def __len__(self):
-        return len(self.data)
+        return len(self._data) if self._index is None else len(self._index)
 
     def __getitem__(self, idx):
-        return self.data[idx]
+        if isinstance(idx, Series):
+            return Series(self._data, _mask(_positions(self._index, len(self._data)), idx))
+        if isinstance(idx, slice):
+            return Series(self._data, _positions(self._index, len(self._data))[idx])
+        return self._data[idx if self._index is None else self._index[idx]]
+
+
+def _mask(positions, flags):
+    return array("q", (p for p, flag in zip(positions, flags) if flag))
 
 
 class DataFrame:
-    def __init__(self, data=None, columns=None):
+    def __init__(self, data=None, columns=None, _index=None):
         if data is None:
             self.columns = list(columns) if columns is not None else []
-            self._rows = []
+            self._data = {c: [] for c in self.columns}
+            self._length = 0
         elif isinstance(data, dict):
             self.columns = list(columns) if columns is not None else list(data.keys())
-            length = len(next(iter(data.values()))) if data else 0
-            self._rows = []
-            for i in range(length):
-                row = {}
-                for col in self.columns:
-                    col_data = data.get(col, [None] * length)
-                    row[col] = col_data[i]
-                self._rows.append(row)
+            sized = [v for v in data.values() if hasattr(v, "__len__") and not isinstance(v, str)]
+            self._length = len(sized[0]) if sized else (1 if data else 0)
+            self._data = {}
+            for col in self.columns:
+                values = data.get(col)
+                if isinstance(values, Series):
+                    values = values.data
+                if isinstance(values, array):
+                    self._data[col] = values
+                elif hasattr(values, "__len__") and not isinstance(values, str):
+                    self._data[col] = list(values)
+                else:
+                    self._data[col] = [values] * self._length
         elif isinstance(data, list):
-            self._rows = [dict(r) for r in data]
             if columns is not None:
                 self.columns = list(columns)
-            elif data:
-                self.columns = list(data[0].keys())
             else:
-                self.columns = []
+                # union des clés, dans l'ordre de 1re apparition
+                self.columns = list(dict.fromkeys(k for row in data for k in row))
+            self._data = {c: [row.get(c) for row in data] for c in self.columns}
+            self._length = len(data)
         else:
             raise TypeError("Unsupported data type for DataFrame")
+        self._index = _index
+
+    def _view(self, index):
+        frame = DataFrame.__new__(DataFrame)
+        frame.columns = list(self.columns)
+        frame._data = self._data
+        frame._length = self._length
+        frame._index = index
+        return frame
+
+    def _positions(self):
+        return _positions(self._index, self._length)
 
     @property
     def empty(self):
-        return len(self._rows) == 0
+        return len(self) == 0
 
     def __len__(self):
-        return len(self._rows)
+        return self._length if self._index is None else len(self._index)
+
+    def __contains__(self, col):
+        return col in self._data
+
+    def __iter__(self):
+        return iter(self.columns)
 
     def __getitem__(self, key):
         if isinstance(key, str):
-            return Series([row.get(key) for row in self._rows])
+            if key not in self._data:
+                raise KeyError(key)
+            return Series(self._data[key], self._index)
         if isinstance(key, Series):
-            bools = list(key)
-            filtered = [row for row, flag in zip(self._rows, bools) if flag]
-            return DataFrame(filtered, columns=self.columns)
+            return self._view(_mask(self._positions(), key))
+        if isinstance(key, list):
+            missing = [c for c in key if c not in self._data]
+            if missing:
+                raise KeyError(missing)
+            frame = self._view(self._index)
+            frame.columns = list(key)
+            return frame
         raise KeyError(f"Unsupported key type: {type(key)!r}")
 
-    def head(self, n):
-        return DataFrame(self._rows[:n], columns=self.columns)
+    def __setitem__(self, col, values):
+        # les colonnes existantes sont partagées entre vues : on matérialise d'abord
+        if self._index is not None:
+            self._data = {c: [v[i] for i in self._index] for c, v in self._data.items()}
+            self._length = len(self._index)
+            self._index = None
+        else:
+            self._data = dict(self._data)
+        if isinstance(values, (Series, list, array, tuple, range)):
+            values = list(values)
+            if len(values) != self._length:
+                raise ValueError(f"Length of values ({len(values)}) does not match length of index ({self._length})")
+        else:
+            values = [values] * self._length
+        self._data[col] = values
+        if col not in self.columns:
+            self.columns.append(col)
+
+    def head(self, n=5):
+        return self._view(self._positions()[:n])
+
+    def _sort_positions(self, by, ascending):
+        # tri stable clé par clé (de la dernière à la première) ; valeurs
+        # manquantes en fin de tri quel que soit le sens, comme pandas
+        order = list(self._positions())
+        for col, asc in reversed(list(zip(by, ascending))):
+            values = self._data[col]
+            present = [i for i in order if not _missing(values[i])]
+            absent = [i for i in order if _missing(values[i])]
+            present.sort(key=values.__getitem__, reverse=not asc)
+            order = present + absent
+        return order
 
     def sort_values(self, by, ascending=True):
         if isinstance(by, str):
             by = [by]
         if isinstance(ascending, bool):
             ascending = [ascending] * len(by)
-
-        def sort_key(row):
-            values = []
-            for col, asc in zip(by, ascending):
-                val = row.get(col)
-                values.append(val if asc else (-val if isinstance(val, (int, float)) else val))
-            return tuple(values)
-
-        sorted_rows = sorted(self._rows, key=sort_key)
-        return DataFrame(sorted_rows, columns=self.columns)
+        if len(ascending) != len(by):
+            raise ValueError("Length of ascending != length of by")
+        for col in by:
+            if col not in self._data:
+                raise KeyError(col)
+        return self._view(array("q", self._sort_positions(by, ascending)))
+
+    def nlargest(self, n, columns):
+        if isinstance(columns, str):
+            columns = [columns]
+        cols = [self._data[c] for c in columns]
+        candidates = (i for i in self._positions() if not any(_missing(col[i]) for col in cols))
+        # heapq.nlargest garde l'ordre d'origine en cas d'égalité (keep="first")
+        top = heapq.nlargest(n, candidates, key=lambda i: tuple(col[i] for col in cols))
+        return self._view(array("q", top))
+
+    def to_dict(self, orient="dict"):
+        if orient == "records":
+            cols = [(c, self._data[c]) for c in self.columns]
+            return [{c: values[i] for c, values in cols} for i in self._positions()]
+        if orient == "list":
+            return {c: Series(self._data[c], self._index).data for c in self.columns}
+        if orient == "dict":
+            positions = list(self._positions())
+            return {c: {n: self._data[c][i] for n, i in enumerate(positions)} for c in self.columns}
+        raise ValueError(f"orient '{orient}' not understood")
 
 
 __all__ = ["DataFrame", "Series"]